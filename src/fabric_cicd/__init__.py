@@ -10,7 +10,13 @@ import fabric_cicd.constants as constants
 from fabric_cicd._common._check_utils import check_version
 from fabric_cicd._common._logging import configure_logger, exception_handler
 from fabric_cicd.fabric_workspace import FabricWorkspace
-from fabric_cicd.publish import publish_all_items, unpublish_all_orphan_items
+from fabric_cicd.publish import (
+    apply_plan,
+    plan_all_items,
+    publish_all_items,
+    publish_all_items_to_workspaces,
+    unpublish_all_orphan_items,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -57,7 +63,10 @@ check_version()
 __all__ = [
     "FabricWorkspace",
     "append_feature_flag",
+    "apply_plan",
     "change_log_level",
+    "plan_all_items",
     "publish_all_items",
+    "publish_all_items_to_workspaces",
     "unpublish_all_orphan_items",
 ]
@@ -0,0 +1,82 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""Serializes the JSON body of an item definition request a chunk at a time, as it is sent."""
+
+import json
+from collections.abc import Iterator
+from typing import Optional
+
+from fabric_cicd._common._file import File
+
+
+class DefinitionBody:
+    """
+    The JSON body of a create item or update item definition request, with the files of the item as definition parts.
+
+    The body is never held in memory as a whole: iterating it yields the serialized JSON a chunk at a time, each part
+    base64 encoded from the file contents or straight from disk. The JSON is the same as json.dumps(body,
+    sort_keys=True) of the equivalent dictionary, so hash_payload returns the same hash for both. The body can be
+    iterated again, e.g. when a throttled request is retried.
+    """
+
+    def __init__(self, parts: list[File], fields: Optional[dict] = None) -> None:
+        """
+        Initializes the body.
+
+        Args:
+            parts: The files sent as definition parts, in order.
+            fields: The other top level fields of the body, e.g. displayName and type. Defaults to None.
+        """
+        self.parts = parts
+        self.fields = fields or {}
+        self._length = None
+
+    def with_fields(self, **fields: any) -> "DefinitionBody":
+        """
+        Returns a body with the same parts and additional top level fields.
+
+        Args:
+            **fields: The fields to add, e.g. folderId.
+        """
+        return DefinitionBody(self.parts, {**self.fields, **fields})
+
+    def __iter__(self) -> Iterator[bytes]:
+        """Yields the serialized JSON body, a chunk at a time."""
+        for prefix, part in self._iter_pieces():
+            yield prefix
+            if part is not None:
+                yield from part.iter_base64_payload()
+
+    def __len__(self) -> int:
+        """Returns the length of the serialized JSON body in bytes, without serializing the parts."""
+        if self._length is None:
+            self._length = sum(
+                len(prefix) + (part.base64_payload_size if part is not None else 0)
+                for prefix, part in self._iter_pieces()
+            )
+        return self._length
+
+    def __repr__(self) -> str:
+        """Returns the fields and part paths of the body, used when logging the request."""
+        return f"DefinitionBody(fields={self.fields}, parts={[part.relative_path for part in self.parts]})"
+
+    def _iter_pieces(self) -> Iterator[tuple[bytes, Optional[File]]]:
+        """Yields the JSON written before each base64 payload with the file of the payload, then the closing JSON."""
+        keys = sorted([*self.fields, "definition"])
+        text = "{"
+        for position, key in enumerate(keys):
+            text += ", " if position else ""
+            if key != "definition":
+                text += f"{json.dumps(key)}: {json.dumps(self.fields[key], sort_keys=True)}"
+                continue
+
+            text += '"definition": {"parts": ['
+            for part_position, part in enumerate(self.parts):
+                text += ", " if part_position else ""
+                text += f'{{"path": {json.dumps(part.relative_path)}, "payload": "'
+                yield text.encode("utf-8"), part
+                text = '", "payloadType": "InlineBase64"}'
+            text += "]}"
+        text += "}"
+        yield text.encode("utf-8"), None
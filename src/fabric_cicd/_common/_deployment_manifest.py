@@ -0,0 +1,192 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""Records the payload hash of each deployed item so unchanged items can be skipped by later deployments."""
+
+import hashlib
+import json
+import logging
+import threading
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Union
+
+from fabric_cicd._common._exceptions import InputError
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_VERSION = 1
+
+
+def hash_payload(payload: Union[dict, Iterable[bytes]]) -> str:
+    """
+    Returns a stable hash of a request payload.
+
+    Args:
+        payload: The JSON payload sent to the Fabric API, or the chunks of the payload serialized with sorted keys
+            (e.g. a DefinitionBody), hashed a chunk at a time.
+    """
+    if isinstance(payload, dict):
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+    digest = hashlib.sha256()
+    for chunk in payload:
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+class DeploymentManifest:
+    """
+    A local JSON file recording, per target workspace and environment, the GUID and payload hash of every item
+    published by fabric-cicd.
+
+    Output should be like this:
+    {
+        "version": 1,
+        "targets": {
+            "<workspace_id>/<environment>": {
+                "Notebook": {"Hello World": {"guid": "<item_guid>", "hash": "<sha256>"}},
+                "Environment": {
+                    "Spark": {
+                        "guid": "<item_guid>",
+                        "hash": "<sha256>",
+                        "metadata": {"libraries": {"library.whl": "<sha256>"}}
+                    }
+                }
+            }
+        }
+    }
+
+    The metadata of an item records what was published besides its definition, e.g. the libraries of an
+    environment. It is kept until the item is deployed to another GUID.
+    """
+
+    def __init__(self, path: Path, workspace_id: str, environment: str) -> None:
+        """
+        Loads the manifest, a missing file is treated as an empty manifest.
+
+        Args:
+            path: Path of the manifest file.
+            workspace_id: The target workspace id.
+            environment: The target environment.
+        """
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._manifest = {"version": MANIFEST_VERSION, "targets": {}}
+
+        if self.path.is_file():
+            try:
+                self._manifest = json.loads(self.path.read_text(encoding="utf-8"))
+            except json.JSONDecodeError as e:
+                msg = f"The deployment manifest '{self.path}' is not valid JSON. {e}"
+                raise InputError(msg, logger) from e
+
+            if self._manifest.get("version") != MANIFEST_VERSION:
+                logger.warning(f"Ignoring deployment manifest '{self.path}' written by another version")
+                self._manifest = {"version": MANIFEST_VERSION, "targets": {}}
+
+        self._items = self._manifest["targets"].setdefault(f"{workspace_id}/{environment}", {})
+
+    def for_target(self, workspace_id: str, environment: str) -> "DeploymentManifest":
+        """
+        Returns the manifest of another target workspace and environment, sharing this manifest file.
+
+        Targets deployed at the same time must share the manifest this way, so each save keeps the others' records.
+
+        Args:
+            workspace_id: The target workspace id.
+            environment: The target environment.
+        """
+        manifest = DeploymentManifest.__new__(DeploymentManifest)
+        manifest.path = self.path
+        manifest._lock = self._lock
+        manifest._manifest = self._manifest
+        with self._lock:
+            manifest._items = self._manifest["targets"].setdefault(f"{workspace_id}/{environment}", {})
+        return manifest
+
+    def is_unchanged(self, item_type: str, item_name: str, guid: str, payload_hash: str) -> bool:
+        """
+        Checks if the item was last deployed to the same GUID with the same payload.
+
+        Args:
+            item_type: Type of the item.
+            item_name: Name of the item.
+            guid: GUID of the item deployed in the workspace.
+            payload_hash: Hash of the payload about to be published.
+        """
+        with self._lock:
+            entry = self._items.get(item_type, {}).get(item_name)
+        return entry is not None and entry["guid"] == guid and entry["hash"] == payload_hash
+
+    def record(self, item_type: str, item_name: str, guid: str, payload_hash: str) -> None:
+        """
+        Records a successful deployment of the item.
+
+        Args:
+            item_type: Type of the item.
+            item_name: Name of the item.
+            guid: GUID of the deployed item.
+            payload_hash: Hash of the published payload.
+        """
+        with self._lock:
+            entry = self._get_entry(item_type, item_name, guid)
+            entry["hash"] = payload_hash
+
+    def get_metadata(self, item_type: str, item_name: str, guid: str) -> dict:
+        """
+        Returns the metadata recorded for the item deployed to the same GUID, empty when none was recorded.
+
+        Args:
+            item_type: Type of the item.
+            item_name: Name of the item.
+            guid: GUID of the item deployed in the workspace.
+        """
+        with self._lock:
+            entry = self._items.get(item_type, {}).get(item_name)
+            if entry is None or entry["guid"] != guid:
+                return {}
+            return dict(entry.get("metadata", {}))
+
+    def record_metadata(self, item_type: str, item_name: str, guid: str, **metadata: any) -> None:
+        """
+        Records what was published for the item besides its definition.
+
+        Args:
+            item_type: Type of the item.
+            item_name: Name of the item.
+            guid: GUID of the deployed item.
+            **metadata: The values to record, e.g. the hashes of the libraries of an environment.
+        """
+        with self._lock:
+            entry = self._get_entry(item_type, item_name, guid)
+            entry.setdefault("metadata", {}).update(metadata)
+
+    def _get_entry(self, item_type: str, item_name: str, guid: str) -> dict:
+        """Returns the entry of the item, reset when the item was deployed to another GUID. The caller must hold the lock."""
+        entry = self._items.setdefault(item_type, {}).get(item_name)
+        if entry is None or entry["guid"] != guid:
+            entry = {"guid": guid, "hash": None}
+            self._items[item_type][item_name] = entry
+        return entry
+
+    def remove(self, item_type: str, item_name: str) -> None:
+        """
+        Forgets the item, for example once it has been unpublished.
+
+        Args:
+            item_type: Type of the item.
+            item_name: Name of the item.
+        """
+        with self._lock:
+            self._items.get(item_type, {}).pop(item_name, None)
+
+    def save(self) -> None:
+        """Writes the manifest to its file, replacing the previous version atomically."""
+        with self._lock:
+            content = json.dumps(self._manifest, indent=4, sort_keys=True)
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = self.path.with_name(f"{self.path.name}.tmp")
+            temp_path.write_text(content, encoding="utf-8")
+            temp_path.replace(self.path)
+        logger.debug(f"Deployment manifest saved to '{self.path}'")
@@ -0,0 +1,222 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""Records the changes a deployment would make to a workspace, so they can be applied later without scanning again."""
+
+import json
+import logging
+import threading
+from pathlib import Path
+from typing import Optional
+
+from fabric_cicd._common._exceptions import InputError
+
+logger = logging.getLogger(__name__)
+
+PLAN_VERSION = 1
+
+
+class DeploymentPlan:
+    """
+    A local JSON file recording the repository and workspace state found by plan_all_items, and the create, update,
+    move and delete of every item, for apply_plan to carry out.
+
+    Output should be like this:
+    {
+        "version": 1,
+        "workspace_id": "<workspace_id>",
+        "environment": "<environment>",
+        "item_type_in_scope": ["Notebook"],
+        "folders": {"/Notebooks": "<folder_id, empty if the folder is created by the plan>"},
+        "deployed_items": [{"type": "Notebook", "displayName": "Old Notebook", "id": "<item_guid>", "folderId": ""}],
+        "items": {
+            "Notebook": {
+                "Hello World": {
+                    "action": "update",
+                    "move": false,
+                    "hash": "<sha256>",
+                    "logical_id": "<logical_id>",
+                    "description": "",
+                    "path": "Notebooks/Hello World.Notebook",
+                    "folder": "/Notebooks",
+                    "files": [".platform", "notebook-content.py"]
+                }
+            }
+        },
+        "deletes": {"Notebook": ["Old Notebook"]}
+    }
+
+    The action of an item is create, update, unchanged (its definition matches the deployment manifest) or skip (it
+    is excluded from the deployment). The hash of the rendered definition is only recorded for items already deployed
+    that do not reference an item the plan creates, the definition is rendered again and checked against it when the
+    plan is applied.
+    """
+
+    def __init__(self, workspace_id: str, environment: str, item_type_in_scope: list[str]) -> None:
+        """
+        Initializes an empty plan for a target workspace and environment, recorded by plan_all_items.
+
+        Args:
+            workspace_id: The target workspace id.
+            environment: The target environment.
+            item_type_in_scope: The item types deployed by the plan.
+        """
+        self._lock = threading.Lock()
+        self.recording = True
+        self._plan = {
+            "version": PLAN_VERSION,
+            "workspace_id": workspace_id,
+            "environment": environment,
+            "item_type_in_scope": list(item_type_in_scope),
+            "folders": {},
+            "deployed_items": [],
+            "items": {},
+            "deletes": {},
+        }
+
+    @classmethod
+    def load(cls, path: Path) -> "DeploymentPlan":
+        """
+        Loads a plan written by plan_all_items, to be applied.
+
+        Args:
+            path: Path of the plan file.
+        """
+        path = Path(path)
+        if not path.is_file():
+            msg = f"The deployment plan '{path}' does not exist."
+            raise InputError(msg, logger)
+
+        try:
+            content = json.loads(path.read_text(encoding="utf-8"))
+        except json.JSONDecodeError as e:
+            msg = f"The deployment plan '{path}' is not valid JSON. {e}"
+            raise InputError(msg, logger) from e
+
+        if content.get("version") != PLAN_VERSION:
+            msg = f"The deployment plan '{path}' was written by another version of fabric-cicd, plan the deployment again."
+            raise InputError(msg, logger)
+
+        plan = cls(content["workspace_id"], content["environment"], content["item_type_in_scope"])
+        plan._plan = content
+        plan.recording = False
+        return plan
+
+    @property
+    def workspace_id(self) -> str:
+        """Return the target workspace id."""
+        return self._plan["workspace_id"]
+
+    @property
+    def environment(self) -> str:
+        """Return the target environment."""
+        return self._plan["environment"]
+
+    @property
+    def item_type_in_scope(self) -> list[str]:
+        """Return the item types deployed by the plan."""
+        return self._plan["item_type_in_scope"]
+
+    @property
+    def folders(self) -> dict[str, str]:
+        """Return the repository folders and the id of those already deployed."""
+        return self._plan["folders"]
+
+    @property
+    def deployed_items(self) -> list[dict]:
+        """Return the items deployed in the workspace when the plan was recorded, as listed by the items API."""
+        return self._plan["deployed_items"]
+
+    @property
+    def items(self) -> dict[str, dict[str, dict]]:
+        """Return the repository items and their planned action, by item type and name."""
+        return self._plan["items"]
+
+    @property
+    def deletes(self) -> dict[str, list[str]]:
+        """Return the names of the orphan items to unpublish by item type, in unpublish order."""
+        return self._plan["deletes"]
+
+    def set_state(self, folders: dict[str, str], deployed_items: list[dict], items: dict[str, dict[str, dict]]) -> None:
+        """
+        Records the repository and workspace state the plan is based on.
+
+        Args:
+            folders: The repository folders and the id of those already deployed.
+            deployed_items: The deployed items, as listed by the items API.
+            items: The repository items by item type and name, each planned to be skipped until recorded otherwise.
+        """
+        with self._lock:
+            self._plan["folders"] = folders
+            self._plan["deployed_items"] = deployed_items
+            self._plan["items"] = items
+
+    def record_item(self, item_type: str, item_name: str, action: str, payload_hash: Optional[str], move: bool) -> None:
+        """
+        Records the planned action of a repository item.
+
+        Args:
+            item_type: Type of the item.
+            item_name: Name of the item.
+            action: create, update or unchanged.
+            payload_hash: Hash of the rendered payload, None for items without definition.
+            move: Whether the item is moved to another folder.
+        """
+        with self._lock:
+            self._plan["items"][item_type][item_name].update({"action": action, "hash": payload_hash, "move": move})
+
+    def record_deletes(self, deletes: dict[str, list[str]]) -> None:
+        """
+        Records the orphan items to unpublish.
+
+        Args:
+            deletes: The names of the items to unpublish by item type, in unpublish order.
+        """
+        with self._lock:
+            self._plan["deletes"] = {item_type: names for item_type, names in deletes.items() if names}
+
+    def get_action(self, item_type: str, item_name: str) -> str:
+        """
+        Returns the planned action of a repository item, skip for an item unknown to the plan.
+
+        Args:
+            item_type: Type of the item.
+            item_name: Name of the item.
+        """
+        return self.items.get(item_type, {}).get(item_name, {}).get("action", "skip")
+
+    def get_hash(self, item_type: str, item_name: str) -> Optional[str]:
+        """
+        Returns the hash of the definition rendered when the plan was recorded, None if it could not be checked.
+
+        Args:
+            item_type: Type of the item.
+            item_name: Name of the item.
+        """
+        return self.items.get(item_type, {}).get(item_name, {}).get("hash")
+
+    def summary(self) -> dict[str, int]:
+        """Return the number of items per planned action, moves and deletes included."""
+        summary = {"create": 0, "update": 0, "unchanged": 0, "skip": 0, "move": 0, "delete": 0}
+        for item_type_items in self.items.values():
+            for entry in item_type_items.values():
+                summary[entry["action"]] += 1
+                summary["move"] += int(entry.get("move", False))
+        summary["delete"] = sum(len(names) for names in self.deletes.values())
+        return summary
+
+    def save(self, path: Path) -> None:
+        """
+        Writes the plan to a file, replacing a previous plan atomically.
+
+        Args:
+            path: Path of the plan file.
+        """
+        path = Path(path)
+        with self._lock:
+            content = json.dumps(self._plan, indent=4, sort_keys=True)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_name(f"{path.name}.tmp")
+        temp_path.write_text(content, encoding="utf-8")
+        temp_path.replace(path)
+        logger.debug(f"Deployment plan saved to '{path}'")
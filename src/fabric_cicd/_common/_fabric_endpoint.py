@@ -7,7 +7,10 @@ import base64
 import datetime
 import json
 import logging
+import threading
 import time
+from concurrent.futures import Future
+from email.utils import parsedate_to_datetime
 from typing import Optional
 
 import requests
@@ -15,9 +18,14 @@ from azure.core.credentials import TokenCredential
 from azure.core.exceptions import (
     ClientAuthenticationError,
 )
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
 
 import fabric_cicd.constants as constants
+from fabric_cicd._common._definition_body import DefinitionBody
 from fabric_cicd._common._exceptions import InvokeError, TokenError
+from fabric_cicd._common._operation_poller import OperationPoller
+from fabric_cicd._common._rate_limiter import RateLimiter
 
 logger = logging.getLogger(__name__)
 
@@ -25,21 +33,53 @@ logger = logging.getLogger(__name__)
 class FabricEndpoint:
     """Handles interactions with the Fabric API, including authentication and request management."""
 
-    def __init__(self, token_credential: TokenCredential, requests_module: requests = requests) -> None:
+    def __init__(
+        self,
+        token_credential: TokenCredential,
+        requests_module: requests = requests,
+        pool_connections: Optional[int] = None,
+        pool_maxsize: Optional[int] = None,
+    ) -> None:
         """
-        Initializes the FabricEndpoint instance, sets up the authentication token.
+        Initializes the FabricEndpoint instance, sets up the authentication token and the HTTP connection pool.
 
         Args:
             token_credential: The token credential.
             requests_module: The requests module.
+            pool_connections: Number of per-host connection pools to cache. Defaults to constants.HTTP_POOL_CONNECTIONS.
+            pool_maxsize: Maximum number of keep-alive connections to save per host. Defaults to constants.HTTP_POOL_MAXSIZE.
         """
         self.aad_token = None
         self.aad_token_expiration = None
         self.token_credential = token_credential
         self.requests = requests_module
+        self.connection_stats = _ConnectionStats()
+        self._token_lock = threading.Lock()
+        self.operation_poller = OperationPoller(self.invoke)
+        # Shared by every thread using the endpoint, so a throttled route pauses all of its callers
+        self.rate_limiter = RateLimiter(constants.RATE_LIMITS)
+
+        # Sessions are kept per thread and share a single pooled adapter, so keep-alive connections are
+        # reused across threads while each thread keeps its own session state
+        self._session_local = threading.local()
+        self._adapter = None
+        if hasattr(self.requests, "Session"):
+            self._adapter = _PooledHTTPAdapter(
+                stats=self.connection_stats,
+                pool_connections=pool_connections or constants.HTTP_POOL_CONNECTIONS,
+                pool_maxsize=pool_maxsize or constants.HTTP_POOL_MAXSIZE,
+            )
         self._refresh_token()
 
-    def invoke(self, method: str, url: str, body: str = "{}", files: Optional[dict] = None, **kwargs) -> dict:
+    def invoke(
+        self,
+        method: str,
+        url: str,
+        body: str = "{}",
+        files: Optional[dict] = None,
+        wait_for_operation: bool = True,
+        **kwargs,
+    ) -> dict:
         """
         Sends an HTTP request to the specified URL with the given method and body.
 
@@ -48,10 +88,13 @@ class FabricEndpoint:
             url: URL to send the request to.
             body: The JSON body to include in the request. Defaults to an empty JSON object.
             files: The file path to be included in the request. Defaults to None.
+            wait_for_operation: Wait for a long-running operation to complete. When False, the 202 response
+                starting the operation is returned. Defaults to True.
             **kwargs: Additional keyword arguments to pass to the method.
         """
         exit_loop = False
         iteration_count = 0
+        throttled_count = 0
         long_running = False
         start_time = time.time()
         invoke_log_message = ""
@@ -64,7 +107,12 @@ class FabricEndpoint:
                 }
                 if files is None:
                     headers["Content-Type"] = "application/json; charset=utf-8"
-                response = self.requests.request(method=method, url=url, headers=headers, json=body, files=files)
+                else:
+                    _rewind_files(files)
+                self.rate_limiter.acquire(url)
+                # Definition bodies are streamed as they are serialized instead of being serialized up front
+                body_kwargs = {"data": body} if isinstance(body, DefinitionBody) else {"json": body}
+                response = self._send(method=method, url=url, headers=headers, files=files, **body_kwargs)
 
                 iteration_count += 1
 
@@ -74,6 +122,20 @@ class FabricEndpoint:
                 if response.status_code == 401 and response.headers.get("x-ms-public-api-error-code") == "TokenExpired":
                     logger.info(f"{constants.INDENT}AAD token expired. Refreshing token.")
                     self._refresh_token()
+                # Handle API throttling, pausing every call to the route until Retry-After has passed
+                elif response.status_code == 429:
+                    if throttled_count >= constants.RATE_LIMIT_MAX_RETRIES:
+                        msg = f"Maximum retry attempts ({constants.RATE_LIMIT_MAX_RETRIES}) exceeded."
+                        raise Exception(msg)
+                    retry_after = parse_retry_after(
+                        response.headers.get("Retry-After"),
+                        default=min(constants.RATE_LIMIT_BASE_DELAY * (2**throttled_count), 60),
+                    )
+                    throttled_count += 1
+                    self.rate_limiter.throttle(url, retry_after)
+                # Hand the long-running operation back to the caller without waiting for it
+                elif response.status_code == 202 and not wait_for_operation:
+                    exit_loop = True
                 else:
                     exit_loop, method, url, body, long_running = _handle_response(
                         response,
@@ -95,15 +157,84 @@ class FabricEndpoint:
 
         end_time = time.time()
         logger.debug(f"Request completed in {end_time - start_time} seconds")
+        logger.debug(f"HTTP connections {self.connection_stats}")
+        logger.debug(f"Rate limits {self.rate_limiter.stats}")
 
         return {
             "header": dict(response.headers),
-            "body": (response.json() if "application/json" in response.headers.get("Content-Type") else {}),
+            "body": (response.json() if "application/json" in response.headers.get("Content-Type", "") else {}),
             "status_code": response.status_code,
         }
 
+    def invoke_async(self, method: str, url: str, body: str = "{}", **kwargs) -> Future:
+        """
+        Sends an HTTP request and returns a future resolved with the response once its operation has completed.
+
+        Long-running operations are registered with the operation poller instead of being waited on, the future
+        then resolves with the operation result. Other responses resolve the future straight away.
+
+        Args:
+            method: HTTP method to use for the request (e.g., 'POST').
+            url: URL to send the request to.
+            body: The JSON body to include in the request. Defaults to an empty JSON object.
+            **kwargs: Additional keyword arguments to pass to the method.
+        """
+        response = self.invoke(method=method, url=url, body=body, wait_for_operation=False, **kwargs)
+
+        location = response["header"].get("Location")
+        if response["status_code"] == 202 and location:
+            return self.operation_poller.submit(
+                location=location,
+                retry_after=parse_retry_after(response["header"].get("Retry-After"), default=None),
+                description=f"{method} on '{url}'",
+            )
+
+        future = Future()
+        future.set_result(response)
+        return future
+
+    @property
+    def throttling_stats(self) -> dict[str, dict]:
+        """Return the requests sent, the throttled responses and the seconds waited for per API route family."""
+        return self.rate_limiter.stats
+
+    def close(self) -> None:
+        """Stops the operation poller and closes the pooled HTTP connections held by the endpoint."""
+        self.operation_poller.close()
+        if self._adapter is not None:
+            self._adapter.close()
+
+    def _send(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Sends a single HTTP request through the pooled session of the calling thread.
+
+        Falls back to the injected requests module when it does not provide sessions.
+
+        Args:
+            method: HTTP method to use for the request.
+            url: URL to send the request to.
+            **kwargs: Additional keyword arguments passed to the request.
+        """
+        if self._adapter is None:
+            return self.requests.request(method=method, url=url, **kwargs)
+
+        session = getattr(self._session_local, "session", None)
+        if session is None:
+            session = self.requests.Session()
+            session.mount("https://", self._adapter)
+            session.mount("http://", self._adapter)
+            self._session_local.session = session
+
+        return session.request(method=method, url=url, **kwargs)
+
     def _refresh_token(self) -> None:
         """Refreshes the AAD token if empty or expiration has passed."""
+        # Serialize refreshes so concurrent requests hitting an expired token only acquire one new token
+        with self._token_lock:
+            self._refresh_token_unlocked()
+
+    def _refresh_token_unlocked(self) -> None:
+        """Refreshes the AAD token if empty or expiration has passed, the caller must hold the token lock."""
         if (
             self.aad_token is None
             or self.aad_token_expiration is None
@@ -148,6 +279,81 @@ class FabricEndpoint:
                 raise TokenError(msg, logger) from e
 
 
+class _ConnectionStats:
+    """Thread-safe counters for the connections opened and reused by the HTTP connection pool."""
+
+    def __init__(self) -> None:
+        """Initializes the counters."""
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._opened = 0
+
+    def record_request(self) -> None:
+        """Records a request sent through the pool."""
+        with self._lock:
+            self._requests += 1
+
+    def record_opened(self) -> None:
+        """Records a new connection opened by the pool."""
+        with self._lock:
+            self._opened += 1
+
+    @property
+    def opened(self) -> int:
+        """Return the number of connections opened."""
+        return self._opened
+
+    @property
+    def reused(self) -> int:
+        """Return the number of requests served by an already open keep-alive connection."""
+        return max(self._requests - self._opened, 0)
+
+    def __str__(self) -> str:
+        """Return the counters as a log friendly string."""
+        return f"opened: {self.opened}, reused: {self.reused}"
+
+
+class _PooledHTTPAdapter(HTTPAdapter):
+    """HTTP adapter that counts the connections opened and reused by its connection pools."""
+
+    def __init__(self, stats: _ConnectionStats, **kwargs) -> None:
+        """
+        Initializes the adapter.
+
+        Args:
+            stats: The counters to update.
+            **kwargs: Keyword arguments passed to HTTPAdapter (pool_connections, pool_maxsize, ...).
+        """
+        # Set before HTTPAdapter.__init__ as it calls init_poolmanager
+        self.stats = stats
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, connections: int, maxsize: int, block: bool = False, **pool_kwargs) -> None:
+        """Initializes the pool manager with connection pools that record every new connection."""
+        super().init_poolmanager(connections, maxsize, block, **pool_kwargs)
+        stats = self.stats
+
+        class _CountingHTTPConnectionPool(HTTPConnectionPool):
+            def _new_conn(self) -> object:
+                stats.record_opened()
+                return super()._new_conn()
+
+        class _CountingHTTPSConnectionPool(HTTPSConnectionPool):
+            def _new_conn(self) -> object:
+                stats.record_opened()
+                return super()._new_conn()
+
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _CountingHTTPConnectionPool,
+            "https": _CountingHTTPSConnectionPool,
+        }
+
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        """Sends the request and records it."""
+        self.stats.record_request()
+        return super().send(request, **kwargs)
+
+
 def _log_executing_identity(msg: str) -> None:
     if "disable_print_identity" not in constants.FEATURE_FLAG:
         logger.info(msg)
@@ -162,7 +368,8 @@ def _handle_response(
     iteration_count: int,
 ) -> tuple:
     """
-    Handles the response from an HTTP request, including retries, throttling, and token expiration.
+    Handles the response from an HTTP request, including long-running operations and retries. Throttled responses and
+    expired tokens are handled by FabricEndpoint.invoke.
     Technical debt: this method needs to be refactored to be more testable and requires less parameters.
     Initial approach is only temporary to support testing, but only temporary.
 
@@ -175,7 +382,7 @@ def _handle_response(
         iteration_count: The current iteration count of the loop.
     """
     exit_loop = False
-    retry_after = response.headers.get("Retry-After", 60)
+    retry_after = parse_retry_after(response.headers.get("Retry-After"), default=60)
 
     # Handle long-running operations
     # https://learn.microsoft.com/en-us/rest/api/fabric/core/long-running-operations/get-operation-result
@@ -221,16 +428,6 @@ def _handle_response(
     ):
         exit_loop = True
 
-    # Handle API throttling
-    elif response.status_code == 429:
-        handle_retry(
-            attempt=iteration_count,
-            base_delay=10,
-            max_retries=5,
-            response_retry_after=retry_after,
-            prepend_message="API is throttled.",
-        )
-
     # Handle unauthorized access
     elif response.status_code == 401 and response.headers.get("x-ms-public-api-error-code") == "Unauthorized":
         msg = f"The executing identity is not authorized to call {method} on '{url}'."
@@ -285,6 +482,30 @@ def _handle_response(
     return exit_loop, method, url, body, long_running
 
 
+def parse_retry_after(value: Optional[str], default: Optional[float]) -> Optional[float]:
+    """
+    Returns the seconds to wait given by a Retry-After header, as a number of seconds or an HTTP date.
+
+    Args:
+        value: The value of the Retry-After header, None if the response has none.
+        default: The seconds returned when the header is missing or invalid.
+    """
+    if value is None:
+        return default
+    try:
+        return max(float(value), 0.0)
+    except (TypeError, ValueError):
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        logger.debug(f"Ignoring invalid Retry-After header '{value}'")
+        return default
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=datetime.timezone.utc)
+    return max((retry_at - datetime.datetime.now(datetime.timezone.utc)).total_seconds(), 0.0)
+
+
 def handle_retry(
     attempt: int,
     base_delay: float,
@@ -347,6 +568,26 @@ def _decode_jwt(token: str) -> dict:
         raise TokenError(msg, logger) from e
 
 
+def _rewind_files(files: dict) -> None:
+    """
+    Rewind the open files of a multipart request, so a retried request uploads them from the start again.
+
+    Args:
+        files: The files of the request, each a file object or a tuple of the file name and file object.
+    """
+    for value in files.values():
+        file_obj = value[1] if isinstance(value, tuple) else value
+        if hasattr(file_obj, "seek"):
+            file_obj.seek(0)
+
+
+def _format_body(body: any) -> str:
+    """Format the request body for the invoke log, definition bodies are summarized rather than serialized."""
+    if isinstance(body, DefinitionBody):
+        return repr(body)
+    return json.dumps(body, indent=4)
+
+
 def _format_invoke_log(response: requests.Response, method: str, url: str, body: str) -> str:
     """
     Format the log message for the invoke method.
@@ -360,7 +601,7 @@ def _format_invoke_log(response: requests.Response, method: str, url: str, body:
     message = [
         f"\nURL: {url}",
         f"Method: {method}",
-        (f"Request Body:\n{json.dumps(body, indent=4)}" if body else "Request Body: None"),
+        (f"Request Body:\n{_format_body(body)}" if body else "Request Body: None"),
     ]
     if response is not None:
         message.extend([
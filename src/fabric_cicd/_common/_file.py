@@ -4,25 +4,41 @@
 """Functions and classes to manage file operations."""
 
 import base64
+import json
 import logging
+from collections.abc import Iterator
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import ClassVar
+from typing import ClassVar, Optional, Union
 
+from fabric_cicd import constants
 from fabric_cicd._common._check_utils import check_file_type
 from fabric_cicd._common._exceptions import FileTypeError
+from fabric_cicd._common._scan_index import ScanIndex
 
 logger = logging.getLogger(__name__)
 
 
 @dataclass()
 class File:
-    """A class to represent a single file in an item object."""
+    """
+    A class to represent a single file in an item object.
+
+    The file type and contents are only read from disk on first access, so files that are never published (e.g.
+    the libraries of shell only items or excluded paths) are never loaded into memory.
+
+    The contents of a JSON file can also be used parsed, see json_contents. The file is parsed once until its text
+    changes, and serialized once when its text is next needed.
+    """
 
     item_path: Path
     file_path: Path
-    type: str = field(default="text", init=False)
-    contents: str = field(default="", init=False)
+    scan_index: Optional[ScanIndex] = field(default=None, repr=False, compare=False)
+    _type: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    _contents: Optional[Union[str, bytes]] = field(default=None, init=False, repr=False, compare=False)
+    _json_contents: any = field(default=None, init=False, repr=False, compare=False)
+    _json_indent: Optional[int] = field(default=None, init=False, repr=False, compare=False)
+    _json_parsed: bool = field(default=False, init=False, repr=False, compare=False)
     IMMUTABLE_FIELDS: ClassVar[set] = {"item_path", "file_path"}
 
     def __setattr__(self, key: str, value: any) -> None:
@@ -43,31 +59,100 @@ class File:
             raise AttributeError(msg)
         super().__setattr__(key, value)
 
-    def __post_init__(self) -> None:
-        """After initializing the object, read the file contents and set the type."""
-        file_type = check_file_type(self.file_path)
+    @property
+    def type(self) -> str:
+        """Return the file type (text, image or binary), detected on first access."""
+        if self._type is None:
+            file_type = self.scan_index.get(self.file_path, "type") if self.scan_index else None
+            if file_type is None:
+                file_type = check_file_type(self.file_path)
+                if self.scan_index:
+                    self.scan_index.set(self.file_path, "type", file_type)
+            self._type = file_type
+        return self._type
 
-        if file_type != "text":
-            try:
-                self.contents = self.file_path.read_bytes()
-            except Exception as e:
-                msg = (
-                    f"Error reading file {self.file_path} as binary.  "
-                    f"Please submit this as a bug https://github.com/microsoft/fabric-cicd/issues/new?template=1-bug.yml.md. Exception: {e}"
-                )
-                FileTypeError(msg, logger)
-        else:
+    @property
+    def contents(self) -> Union[str, bytes]:
+        """Return the file contents, read on first access."""
+        if self._contents is None:
+            if self._json_parsed:
+                self._contents = json.dumps(self._json_contents, indent=self._json_indent)
+            else:
+                self._contents = self._read_contents()
+        return self._contents
+
+    @contents.setter
+    def contents(self, value: str) -> None:
+        """Replace the contents of a text file."""
+        self._contents = value
+        self._json_contents = None
+        self._json_parsed = False
+
+    @property
+    def json_contents(self) -> any:
+        """
+        Return the contents of a JSON file parsed, the same object is returned until the contents change.
+
+        Changes made to the returned object must be saved with set_json_contents.
+        """
+        if not self._json_parsed:
+            self._json_contents = json.loads(self.contents)
+            self._json_parsed = True
+        return self._json_contents
+
+    @property
+    def has_pending_json(self) -> bool:
+        """Return whether the parsed JSON contents changed and are not serialized yet."""
+        return self._json_parsed and self._contents is None
+
+    @property
+    def json_indent(self) -> Optional[int]:
+        """Return the indent the parsed JSON contents are serialized with."""
+        return self._json_indent
+
+    def set_json_contents(self, value: any, indent: Optional[int] = None) -> None:
+        """
+        Replace the contents of a JSON file, serialized the next time the text contents are needed.
+
+        Args:
+            value: The parsed JSON contents.
+            indent: The indent of the serialized JSON. Defaults to None, a single line.
+        """
+        if self.type != "text":
+            msg = "item contents is immutable for non text files"
+            raise AttributeError(msg)
+        self._contents = None
+        self._json_contents = value
+        self._json_indent = indent
+        self._json_parsed = True
+
+    def copy(self) -> "File":
+        """Return a copy of the file with its detected type, its contents are read again when needed."""
+        file_copy = File(self.item_path, self.file_path, self.scan_index)
+        file_copy._type = self._type
+        return file_copy
+
+    def _read_contents(self) -> Union[str, bytes]:
+        """Read the file contents, as text or bytes based on the file type."""
+        if self.type != "text":
             try:
-                self.contents = self.file_path.read_text(encoding="utf-8")
+                return self.file_path.read_bytes()
             except Exception as e:
-                msg = (
-                    f"Error reading file {self.file_path} as text.  "
-                    f"Please submit this as a bug https://github.com/microsoft/fabric-cicd/issues/new?template=1-bug.yml.md. Exception: {e}"
-                )
-                FileTypeError(msg, logger)
-
-        # set after as image contents are now immutable
-        self.type = file_type
+                error = self._read_error("binary", e)
+                raise error from e
+        try:
+            return self.file_path.read_text(encoding="utf-8")
+        except Exception as e:
+            error = self._read_error("text", e)
+            raise error from e
+
+    def _read_error(self, read_as: str, error: Exception) -> FileTypeError:
+        """Return the error of a file that could not be read as text or binary."""
+        msg = (
+            f"Error reading file {self.file_path} as {read_as}.  "
+            f"Please submit this as a bug https://github.com/microsoft/fabric-cicd/issues/new?template=1-bug.yml.md. Exception: {error}"
+        )
+        return FileTypeError(msg, logger)
 
     @property
     def name(self) -> str:
@@ -89,3 +174,56 @@ class File:
             "payload": base64.b64encode(byte_file).decode("utf-8"),
             "payloadType": "InlineBase64",
         }
+
+    def iter_bytes(self, chunk_size: int = constants.PAYLOAD_CHUNK_SIZE) -> Iterator[bytes]:
+        """
+        Yield the file contents as bytes, a chunk at a time.
+
+        Text files are encoded to UTF-8 a slice at a time. Binary files not already loaded are read from disk a
+        chunk at a time and are not kept in memory.
+
+        Args:
+            chunk_size: The size of a chunk, in characters for text files and bytes for binary files.
+        """
+        if self.type == "text" or self._contents is not None:
+            contents = self.contents
+            for start in range(0, len(contents), chunk_size):
+                chunk = contents[start : start + chunk_size]
+                yield chunk.encode("utf-8") if isinstance(chunk, str) else chunk
+            return
+
+        try:
+            with self.file_path.open("rb") as file:
+                while chunk := file.read(chunk_size):
+                    yield chunk
+        except OSError as e:
+            error = self._read_error("binary", e)
+            raise error from e
+
+    def iter_base64_payload(self, chunk_size: int = constants.PAYLOAD_CHUNK_SIZE) -> Iterator[bytes]:
+        """
+        Yield the file contents base64 encoded, a chunk at a time, the chunks join into base64_payload["payload"].
+
+        Args:
+            chunk_size: The size of a chunk read from the file, see iter_bytes.
+        """
+        remainder = b""
+        for chunk in self.iter_bytes(chunk_size):
+            if remainder:
+                chunk = remainder + chunk
+            # Only whole groups of 3 bytes are encoded so the chunks join without padding in between
+            cut = len(chunk) - len(chunk) % 3
+            remainder = chunk[cut:]
+            if cut:
+                yield base64.b64encode(chunk[:cut] if remainder else chunk)
+        if remainder:
+            yield base64.b64encode(remainder)
+
+    @property
+    def base64_payload_size(self) -> int:
+        """Return the length of the base64 encoded file contents, without encoding them."""
+        if self.type != "text" and self._contents is None:
+            byte_size = self.file_path.stat().st_size
+        else:
+            byte_size = sum(len(chunk) for chunk in self.iter_bytes())
+        return 4 * -(-byte_size // 3)
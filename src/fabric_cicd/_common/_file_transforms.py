@@ -0,0 +1,111 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""Runs the transforms applied to the repository files before they are published, and times each stage."""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from fabric_cicd._common._file import File
+
+logger = logging.getLogger(__name__)
+
+TEXT = "text"
+JSON = "json"
+
+
+@dataclass(frozen=True)
+class FileTransform:
+    """
+    A transform stage applied to the text files of an item.
+
+    Attributes:
+        name: The name the time spent by the stage is recorded under.
+        kind: TEXT if the stage works on File.contents, JSON if it works on File.json_contents.
+        func: Updates the file.
+        json_func: The same update made on File.json_contents, for a TEXT stage that can also work on the parsed
+            JSON. Used in place of func when the file is parsed anyway. Defaults to None.
+        applies: Checks if the stage changes a file, the stage is skipped for the other files. Defaults to None, all
+            files.
+    """
+
+    name: str
+    kind: str
+    func: Callable[[File], None]
+    json_func: Optional[Callable[[File], None]] = None
+    applies: Optional[Callable[[File], bool]] = None
+
+
+class TransformTimings:
+    """The total time spent and the number of files processed per transform stage, shared by all threads."""
+
+    def __init__(self) -> None:
+        """Initializes empty timings."""
+        self._lock = threading.Lock()
+        self._stages = {}
+
+    def record(self, stage: str, seconds: float) -> None:
+        """
+        Adds the time a stage spent on a file.
+
+        Args:
+            stage: The name of the stage.
+            seconds: The time spent on the file.
+        """
+        with self._lock:
+            total, files = self._stages.get(stage, (0.0, 0))
+            self._stages[stage] = (total + seconds, files + 1)
+
+    @property
+    def stats(self) -> dict[str, dict]:
+        """Return the seconds spent and the files processed per stage."""
+        with self._lock:
+            return {
+                stage: {"seconds": round(total, 3), "files": files} for stage, (total, files) in self._stages.items()
+            }
+
+    def log(self) -> None:
+        """Logs the time spent per stage at debug level."""
+        for stage, stats in self.stats.items():
+            logger.debug(f"File transform '{stage}': {stats['seconds']} seconds for {stats['files']} files")
+
+
+def run_file_transforms(file_obj: File, transforms: list[FileTransform], timings: TransformTimings) -> None:
+    """
+    Runs the transform stages on a text file, in order.
+
+    A file is parsed at most once and serialized at most once. The JSON stages share a single parse, and a TEXT stage
+    that can also work on the parsed JSON does so when the file is already parsed or the next stage needs it parsed.
+    The file is serialized when a TEXT stage follows the JSON stages, or when the payload is built.
+
+    Args:
+        file_obj: The file to transform.
+        transforms: The stages, in order.
+        timings: The timings the time spent by each stage is added to.
+    """
+    stages = [transform for transform in transforms if transform.applies is None or transform.applies(file_obj)]
+    for index, transform in enumerate(stages):
+        func = transform.func
+        if transform.json_func is not None and _parse_json_first(file_obj, stages[index + 1 :]):
+            func = transform.json_func
+
+        start = time.perf_counter()
+        func(file_obj)
+        timings.record(transform.name, time.perf_counter() - start)
+
+
+def _parse_json_first(file_obj: File, next_stages: list[FileTransform]) -> bool:
+    """
+    Checks if a stage that works on either representation should use the parsed JSON of a file.
+
+    Args:
+        file_obj: The file to transform.
+        next_stages: The stages still to run on the file, in order.
+    """
+    if file_obj.has_pending_json:
+        return True
+    next_kind = next((stage.kind for stage in next_stages if stage.json_func is None), TEXT)
+    return next_kind == JSON
@@ -4,11 +4,13 @@
 """Functions and classes to manage Item operations."""
 
 import os
+from collections.abc import Iterable
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import ClassVar
+from typing import ClassVar, Optional
 
 from fabric_cicd._common._file import File
+from fabric_cicd._common._scan_index import ScanIndex
 
 
 @dataclass
@@ -44,10 +46,36 @@ class Item:
         """Return the relative path of the file."""
         return str(self.file_path.relative_to(self.item_path).as_posix())
 
-    def collect_item_files(self) -> None:
-        """Collect all files in the item path."""
+    def copy(self) -> "Item":
+        """Return a copy of the item with copies of its files, e.g. to deploy the item to another workspace."""
+        return Item(
+            type=self.type,
+            name=self.name,
+            description=self.description,
+            guid=self.guid,
+            logical_id=self.logical_id,
+            path=self.path,
+            item_files=[file.copy() for file in self.item_files],
+            folder_id=self.folder_id,
+        )
+
+    def collect_item_files(
+        self, scan_index: Optional[ScanIndex] = None, walk: Optional[Iterable[tuple[Path, list, list]]] = None
+    ) -> None:
+        """
+        Collect all files in the item path.
+
+        Args:
+            scan_index: The repository scan index used to look up the file types. Defaults to None.
+            walk: The directories of the item path with their subdirectory and file names, as listed by os.walk.
+                Defaults to walking the item path.
+        """
         self.item_files = []
-        for root, _dirs, files in os.walk(self.path):
+        if walk is None:
+            walk = os.walk(self.path)
+        for root, _dirs, files in walk:
             for file in files:
                 full_path = Path(root, file)
-                self.item_files.append(File(self.path, full_path))
+                if scan_index:
+                    scan_index.mark_seen(full_path)
+                self.item_files.append(File(self.path, full_path, scan_index))
@@ -0,0 +1,95 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""Indexes items by logical ID, GUID and path for constant time lookups."""
+
+import threading
+from pathlib import Path
+from typing import Optional
+
+from fabric_cicd._common._item import Item
+
+
+class ItemRegistry:
+    """
+    Hash indexes of a dictionary of items by item type, keyed by logical ID, GUID and path.
+
+    When several items of a type share a key, the first one added is returned, as with a scan of the dictionary.
+    """
+
+    def __init__(self, items: dict[str, dict[str, Item]]) -> None:
+        """
+        Indexes the items.
+
+        Args:
+            items: Dictionary of item type to a dictionary of item name to item, e.g. FabricWorkspace.repository_items.
+        """
+        self._lock = threading.Lock()
+        self._by_logical_id = {}
+        self._by_guid = {}
+        self._by_path = {}
+
+        for item_type_items in items.values():
+            for item in item_type_items.values():
+                self.add(item)
+
+    def add(self, item: Item) -> None:
+        """
+        Indexes an item, or the current values of an item already indexed, e.g. once its GUID has been assigned.
+
+        Args:
+            item: The item to index.
+        """
+        with self._lock:
+            if item.logical_id:
+                self._by_logical_id.setdefault((item.type, item.logical_id), item)
+            if item.guid:
+                self._by_guid.setdefault((item.type, item.guid), item)
+            if item.path != Path():
+                self._by_path.setdefault((item.type, Path(item.path)), item)
+
+    def remove(self, item: Item) -> None:
+        """
+        Removes an item from the indexes.
+
+        Args:
+            item: The item to remove.
+        """
+        with self._lock:
+            for index, key in (
+                (self._by_logical_id, (item.type, item.logical_id)),
+                (self._by_guid, (item.type, item.guid)),
+                (self._by_path, (item.type, Path(item.path))),
+            ):
+                if index.get(key) is item:
+                    del index[key]
+
+    def get_by_logical_id(self, item_type: str, logical_id: str) -> Optional[Item]:
+        """
+        Returns the item of the given type with the logical ID, or None if not found.
+
+        Args:
+            item_type: Type of the item.
+            logical_id: Logical ID of the item.
+        """
+        return self._by_logical_id.get((item_type, logical_id))
+
+    def get_by_guid(self, item_type: str, guid: str) -> Optional[Item]:
+        """
+        Returns the item of the given type with the GUID, or None if not found.
+
+        Args:
+            item_type: Type of the item.
+            guid: GUID of the deployed item.
+        """
+        return self._by_guid.get((item_type, guid))
+
+    def get_by_path(self, item_type: str, path: Path) -> Optional[Item]:
+        """
+        Returns the item of the given type found at the path, or None if not found.
+
+        Args:
+            item_type: Type of the item.
+            path: Full path of the item directory.
+        """
+        return self._by_path.get((item_type, Path(path)))
@@ -7,15 +7,23 @@ import inspect
 import logging
 import re
 import sys
+import threading
 import traceback
+from collections.abc import Iterator
+from contextlib import contextmanager
+from functools import partial
 from logging import LogRecord
 from pathlib import Path
-from typing import ClassVar
+from typing import Callable, ClassVar, Optional
 
 from fabric_cicd import constants
 from fabric_cicd._common import _exceptions
 from fabric_cicd._common._color import Fore, Style
 
+# Console output written by concurrent publishes, see buffered_output
+_output_lock = threading.RLock()
+_output_buffer = threading.local()
+
 
 class CustomFormatter(logging.Formatter):
     LEVEL_COLORS: ClassVar[dict[str, str]] = {
@@ -78,6 +86,7 @@ def configure_logger(level: int = logging.INFO) -> None:
 
     # Configure Console Handler
     console_handler = logging.StreamHandler()
+    console_handler.addFilter(_BufferingFilter(console_handler))
     console_handler.setLevel(level)
     console_handler.setFormatter(
         CustomFormatter(
@@ -140,6 +149,8 @@ def print_header(message: str) -> None:
     """
     Prints a header message with a decorative line above and below it.
 
+    The header is printed in one write, or with the output of the current thread when it is buffered.
+
     Args:
         message: The header message to print.
     """
@@ -147,8 +158,88 @@ def print_header(message: str) -> None:
     formatted_message = f"########## {message}"
     formatted_message = f"{formatted_message} {line_separator[len(formatted_message) + 1 :]}"
 
-    print()  # Print a blank line before the header
-    print(f"{Fore.GREEN}{Style.BRIGHT}{line_separator}{Style.RESET_ALL}")
-    print(f"{Fore.GREEN}{Style.BRIGHT}{formatted_message}{Style.RESET_ALL}")
-    print(f"{Fore.GREEN}{Style.BRIGHT}{line_separator}{Style.RESET_ALL}")
-    print()
+    header = "\n".join([
+        "",  # Print a blank line before the header
+        f"{Fore.GREEN}{Style.BRIGHT}{line_separator}{Style.RESET_ALL}",
+        f"{Fore.GREEN}{Style.BRIGHT}{formatted_message}{Style.RESET_ALL}",
+        f"{Fore.GREEN}{Style.BRIGHT}{line_separator}{Style.RESET_ALL}",
+        "",
+    ])
+    _write_output(lambda: print(header))
+
+
+@contextmanager
+def buffered_output(parent_writes: Optional[list] = None) -> Iterator[None]:
+    """
+    Holds the console output of the current thread, and writes it as one block when the context exits.
+
+    Used around each item and each item type published on its own thread, so the output of concurrent items is not
+    interleaved. Nested contexts write their output with the outermost one.
+
+    Args:
+        parent_writes: The buffered output of the thread that started the current one, see get_buffered_output. The
+            block is added to it instead of being written, so it is written with the output of that thread.
+    """
+    if getattr(_output_buffer, "writes", None) is not None:
+        yield
+        return
+
+    _output_buffer.writes = []
+    try:
+        yield
+    finally:
+        writes = _output_buffer.writes
+        _output_buffer.writes = None
+        if parent_writes is not None:
+            parent_writes.append(partial(_write_block, writes))
+        else:
+            _write_block(writes)
+
+
+def get_buffered_output() -> Optional[list]:
+    """Returns the buffered output of the current thread, None when its output is not buffered."""
+    return getattr(_output_buffer, "writes", None)
+
+
+def _write_block(writes: list[Callable[[], None]]) -> None:
+    """Writes buffered console output as one block."""
+    with _output_lock:
+        for write in writes:
+            write()
+
+
+def _write_output(write: Callable[[], None]) -> None:
+    """Writes console output now, or once the buffered output of the current thread is written."""
+    writes = getattr(_output_buffer, "writes", None)
+    if writes is not None:
+        writes.append(write)
+        return
+    with _output_lock:
+        write()
+
+
+class _BufferingFilter(logging.Filter):
+    """Holds the log records of a thread whose output is buffered, they are handled when the output is written."""
+
+    def __init__(self, handler: logging.Handler) -> None:
+        """
+        Initializes the filter.
+
+        Args:
+            handler: The handler the filter is added to.
+        """
+        super().__init__()
+        self.handler = handler
+
+    def filter(self, record: LogRecord) -> bool:
+        """
+        Returns False for a record held in the buffer of the current thread.
+
+        Args:
+            record: The log record.
+        """
+        writes = getattr(_output_buffer, "writes", None)
+        if writes is None:
+            return True
+        writes.append(lambda: self.handler.handle(record))
+        return False
@@ -0,0 +1,188 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""Tracks pending Fabric long-running operations and polls all of them from a single thread."""
+
+import heapq
+import itertools
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Optional
+
+import fabric_cicd.constants as constants
+from fabric_cicd._common._exceptions import InvokeError
+
+logger = logging.getLogger(__name__)
+
+
+class _Operation:
+    """A long-running operation waiting for its next status check."""
+
+    def __init__(self, location: str, description: str) -> None:
+        """
+        Initializes the operation.
+
+        Args:
+            location: The operation state URL returned in the Location header.
+            description: The request that started the operation, used in log and error messages.
+        """
+        self.location = location
+        self.description = description
+        self.future = Future()
+        self.attempt = 0
+
+
+class OperationPoller:
+    """
+    Polls every registered long-running operation from one background thread.
+
+    Each operation is checked again once its own Retry-After has elapsed, so any number of operations can be in
+    flight while the threads that started them carry on.
+    """
+
+    def __init__(self, invoke: Callable[..., dict]) -> None:
+        """
+        Initializes the poller, the polling thread is started with the first operation.
+
+        Args:
+            invoke: The function used to call the operation URLs, FabricEndpoint.invoke.
+        """
+        self._invoke = invoke
+        self._condition = threading.Condition()
+        self._queue = []
+        self._sequence = itertools.count()
+        self._thread = None
+        self._checking = None
+        self._closed = False
+
+    def submit(self, location: str, retry_after: Optional[float] = None, description: str = "") -> Future:
+        """
+        Registers an operation and returns a future resolved with the operation result.
+
+        The result has the same shape as FabricEndpoint.invoke. When the operation does not return a result, the
+        final operation state is used instead.
+
+        Args:
+            location: The operation state URL returned in the Location header.
+            retry_after: Seconds to wait before the first status check. Defaults to constants.LRO_INITIAL_DELAY.
+            description: The request that started the operation, used in log and error messages.
+        """
+        operation = _Operation(location, description)
+        delay = constants.LRO_INITIAL_DELAY if retry_after is None else retry_after
+
+        with self._condition:
+            if self._closed:
+                msg = "Cannot track new operations after the poller has been closed."
+                raise InvokeError(msg, logger)
+            self._schedule(operation, delay)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="fabric-cicd-operation-poller", daemon=True)
+                self._thread.start()
+
+        return operation.future
+
+    @property
+    def pending(self) -> int:
+        """Return the number of operations that have not completed yet."""
+        with self._condition:
+            return len(self._queue)
+
+    def close(self) -> None:
+        """Stops the polling thread, operations still pending are failed."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _schedule(self, operation: _Operation, delay: float) -> None:
+        """Queues the next status check of the operation, the caller must hold the condition."""
+        heapq.heappush(self._queue, (time.monotonic() + delay, next(self._sequence), operation))
+        self._condition.notify_all()
+
+    def _run(self) -> None:
+        """Runs the polling loop, failing the pending operations if the loop stops on an unexpected error."""
+        try:
+            self._poll()
+        except BaseException as e:
+            with self._condition:
+                self._closed = True
+                pending = [operation for _, _, operation in self._queue]
+                if self._checking is not None:
+                    pending.append(self._checking)
+                self._queue.clear()
+            for operation in pending:
+                if not operation.future.done():
+                    operation.future.set_exception(e)
+            logger.debug(f"Operation poller stopped on an unexpected error: {e}")
+
+    def _poll(self) -> None:
+        """Checks the operations in order of their next due time until the poller is closed."""
+        while True:
+            with self._condition:
+                while not self._closed and (not self._queue or self._queue[0][0] > time.monotonic()):
+                    timeout = self._queue[0][0] - time.monotonic() if self._queue else None
+                    self._condition.wait(timeout)
+
+                if self._closed:
+                    for _, _, operation in self._queue:
+                        msg = f"Operation for {operation.description} was abandoned as the poller was closed."
+                        operation.future.set_exception(InvokeError(msg, logger))
+                    self._queue.clear()
+                    return
+
+                _, _, operation = heapq.heappop(self._queue)
+                self._checking = operation
+
+            delay = self._check(operation)
+            with self._condition:
+                if delay is not None:
+                    self._schedule(operation, delay)
+                self._checking = None
+
+    def _check(self, operation: _Operation) -> Optional[float]:
+        """
+        Checks the state of the operation and resolves its future once the operation has completed.
+
+        Returns the seconds to wait before the next check while the operation is still running.
+
+        Args:
+            operation: The operation to check.
+        """
+        # https://learn.microsoft.com/en-us/rest/api/fabric/core/long-running-operations/get-operation-state
+        try:
+            response = self._invoke(method="GET", url=operation.location)
+            status = response["body"].get("status")
+
+            if status == "Succeeded":
+                # If location not included in operation success call, no body is expected to be returned
+                result_location = response["header"].get("Location")
+                result = self._invoke(method="GET", url=result_location) if result_location else response
+                operation.future.set_result(result)
+                return None
+
+            if status == "Failed":
+                response_error = response["body"]["error"]
+                msg = (
+                    f"Operation failed for {operation.description}. Error Code: {response_error['errorCode']}. "
+                    f"Error Message: {response_error['message']}"
+                )
+                operation.future.set_exception(InvokeError(msg, logger))
+                return None
+
+            if status == "Undefined":
+                msg = f"Operation is in an undefined state for {operation.description}. Full Body: {response['body']}"
+                operation.future.set_exception(InvokeError(msg, logger))
+                return None
+
+        except Exception as e:
+            operation.future.set_exception(e)
+            return None
+
+        operation.attempt += 1
+        backoff = min(constants.LRO_BASE_DELAY * (2**operation.attempt), constants.LRO_MAX_DELAY)
+        delay = float(response["header"].get("Retry-After", backoff))
+        logger.debug(f"Operation in progress for {operation.description}. Checking again in {delay} seconds")
+        return delay
@@ -0,0 +1,142 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""Process-wide rate limiting of the Fabric API calls, grouped by route family."""
+
+import logging
+import threading
+import time
+from urllib.parse import urlparse
+
+import fabric_cicd.constants as constants
+
+logger = logging.getLogger(__name__)
+
+
+def get_route_family(url: str) -> str:
+    """
+    Returns the route family of a Fabric API URL, e.g. 'items' for /v1/workspaces/{workspace_id}/items/{item_id}.
+
+    Args:
+        url: The URL of the request.
+    """
+    segments = [segment.lower() for segment in urlparse(url).path.split("/") if segment]
+
+    if "shortcuts" in segments:
+        return "shortcuts"
+
+    # Routes are scoped to a workspace: /v1/workspaces/{workspace_id}/{family}/...
+    if "workspaces" in segments:
+        index = segments.index("workspaces")
+        return segments[index + 2] if len(segments) > index + 2 else "workspaces"
+
+    return segments[1] if len(segments) > 1 else "default"
+
+
+class _TokenBucket:
+    """Token bucket of a route family that can also be paused when the API returns Retry-After."""
+
+    def __init__(self, rate: float, capacity: int) -> None:
+        """
+        Initializes a full bucket.
+
+        Args:
+            rate: Tokens added per second.
+            capacity: Maximum number of tokens, the size of a burst.
+        """
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.requests = 0
+        self.throttled = 0
+        self.waited = 0.0
+
+    def take(self, now: float) -> float:
+        """Takes a token and returns 0, or returns the seconds to wait before a token is available."""
+        if now < self.paused_until:
+            return self.paused_until - now
+
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+        if self.tokens >= 1:
+            self.tokens -= 1
+            self.requests += 1
+            return 0.0
+
+        return (1 - self.tokens) / self.rate
+
+
+class RateLimiter:
+    """
+    Rate limits the Fabric API calls of every thread with a token bucket per route family.
+
+    A throttled call pauses its whole route family for the Retry-After period, so every caller on that route
+    waits instead of each one being throttled and backing off on its own.
+    """
+
+    def __init__(self, limits: dict[str, tuple[float, int]]) -> None:
+        """
+        Initializes the rate limiter.
+
+        Args:
+            limits: Dictionary of route family to the requests per second and the burst size allowed. Must contain
+                a "default" entry, used by the route families without their own limit.
+        """
+        self._lock = threading.Lock()
+        self._buckets = {family: _TokenBucket(rate, capacity) for family, (rate, capacity) in limits.items()}
+
+    def acquire(self, url: str) -> None:
+        """
+        Blocks until a call to the URL is allowed by its route family.
+
+        Args:
+            url: The URL of the request.
+        """
+        family = self._get_family(url)
+
+        while True:
+            with self._lock:
+                bucket = self._buckets[family]
+                delay = bucket.take(time.monotonic())
+                if not delay:
+                    return
+                bucket.waited += delay
+
+            logger.debug(f"Rate limit reached for '{family}' routes. Waiting {delay:.2f} seconds")
+            time.sleep(delay)
+
+    def throttle(self, url: str, retry_after: float) -> None:
+        """
+        Pauses every call to the route family of the URL for the Retry-After period.
+
+        Args:
+            url: The URL of the throttled request.
+            retry_after: Seconds to pause the route family for.
+        """
+        family = self._get_family(url)
+
+        with self._lock:
+            bucket = self._buckets[family]
+            bucket.throttled += 1
+            bucket.paused_until = max(bucket.paused_until, time.monotonic() + retry_after)
+            bucket.tokens = 0.0
+
+        logger.info(f"{constants.INDENT}API is throttled. Pausing '{family}' calls for {retry_after:.0f} seconds...")
+
+    def _get_family(self, url: str) -> str:
+        """Returns the route family of the URL, routes without their own limit share the default one."""
+        family = get_route_family(url)
+        return family if family in self._buckets else "default"
+
+    @property
+    def stats(self) -> dict[str, dict]:
+        """Return the requests sent, the throttled responses and the seconds waited per route family."""
+        with self._lock:
+            return {
+                family: {"requests": bucket.requests, "throttled": bucket.throttled, "waited": round(bucket.waited, 2)}
+                for family, bucket in self._buckets.items()
+                if bucket.requests or bucket.throttled
+            }
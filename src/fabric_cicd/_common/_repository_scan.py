@@ -0,0 +1,50 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""Shares the scan of a repository between the workspaces it is deployed to."""
+
+import threading
+from pathlib import Path
+from typing import Callable, Optional
+
+from fabric_cicd._common._item import Item
+
+
+class RepositoryScan:
+    """
+    The walk of a repository and the items parsed from it, computed by the first workspace that needs them and reused
+    by the other workspaces the repository is deployed to.
+
+    The parsed items only hold what is read from the repository. Each workspace deploys its own copy, with the GUID
+    and folder of its target workspace and its own rendered file contents.
+    """
+
+    def __init__(self) -> None:
+        """Initializes an empty scan."""
+        self._lock = threading.Lock()
+        self._walk = None
+        self._items = None
+
+    def get_walk(self, walk_repository: Callable[[], list[tuple[Path, list[str], list[str]]]]) -> list:
+        """
+        Returns the walk of the repository, walked on first use.
+
+        Args:
+            walk_repository: Returns the directory, subdirectory names and file names of every repository directory.
+        """
+        with self._lock:
+            if self._walk is None:
+                self._walk = walk_repository()
+            return self._walk
+
+    def get_items(self, scan_items: Callable[[], list[tuple[Path, Optional[Item]]]]) -> list:
+        """
+        Returns the item directories and the items parsed from them, parsed on first use.
+
+        Args:
+            scan_items: Returns each item directory with the item parsed from it, or None for an empty directory.
+        """
+        with self._lock:
+            if self._items is None:
+                self._items = scan_items()
+            return self._items
@@ -0,0 +1,196 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""Persists what was learned about repository files between runs, keyed by the file size, modification time and hash."""
+
+import json
+import logging
+import threading
+import time
+from functools import partial
+from pathlib import Path
+from typing import Optional
+
+import fabric_cicd.constants as constants
+from fabric_cicd._common._deployment_manifest import hash_payload
+
+logger = logging.getLogger(__name__)
+
+# Coarsest modification time resolution of common file systems (FAT), a file modified within it of being hashed could
+# change again without its modification time changing
+MTIME_GRANULARITY_NS = 2_000_000_000
+
+
+class ScanIndex:
+    """
+    An on-disk index of the repository scan, e.g. the parsed .platform metadata and the detected file types.
+
+    A value is only returned while the contents of its file are unchanged. A file whose size and modification time
+    are unchanged is trusted without being opened. When only the modification time changed, e.g. in a fresh checkout
+    of the repository, the file is hashed and its values are kept if the hash matches. A file modified within
+    MTIME_GRANULARITY_NS of being hashed is always hashed again, as a change made in the same tick is invisible to its
+    modification time. Entries of files not seen by the latest scan are dropped on save.
+
+    Output should be like this:
+    {
+        "version": "<fabric-cicd version>",
+        "files": {
+            "Hello World.Notebook/.platform": {
+                "size": 391, "mtime_ns": 1718000000000000000, "hash": "<sha256>", "hashed_ns": 1718000100000000000,
+                "metadata": {...}
+            },
+            "Hello World.Notebook/notebook-content.py": {
+                "size": 210, "mtime_ns": 1718000000000000000, "hash": "<sha256>", "hashed_ns": 1718000100000000000,
+                "type": "text"
+            }
+        }
+    }
+    """
+
+    def __init__(self, index_path: Path, repository_directory: Path) -> None:
+        """
+        Loads the index, a missing, invalid or outdated index file is treated as an empty index.
+
+        Args:
+            index_path: Path of the index file.
+            repository_directory: The repository directory, file paths are stored relative to it.
+        """
+        self.index_path = index_path
+        self.repository_directory = repository_directory
+        self._lock = threading.Lock()
+        self._files = {}
+        self._seen = set()
+        self._changed = False
+        self.hits = 0
+        self.misses = 0
+
+        try:
+            index = json.loads(index_path.read_text(encoding="utf-8"))
+            if index.get("version") == constants.VERSION:
+                self._files = index["files"]
+        except FileNotFoundError:
+            pass
+        except (json.JSONDecodeError, KeyError, AttributeError) as e:
+            logger.debug(f"Ignoring invalid repository scan index '{index_path}'. {e}")
+
+    def start_scan(self) -> None:
+        """Starts a new repository scan, entries not seen by it are dropped on save."""
+        with self._lock:
+            self._seen = set()
+            self.hits = 0
+            self.misses = 0
+
+    def mark_seen(self, file_path: Path) -> None:
+        """
+        Keeps the entry of a file found by the current scan, even if none of its values are looked up.
+
+        Args:
+            file_path: The path of the file.
+        """
+        relative_path = file_path.relative_to(self.repository_directory).as_posix()
+        with self._lock:
+            self._seen.add(relative_path)
+
+    def get(self, file_path: Path, key: str) -> Optional[any]:
+        """
+        Returns the value recorded for the file, or None if the file changed since it was recorded.
+
+        Args:
+            file_path: The path of the file.
+            key: The name of the value.
+        """
+        relative_path, file_stat = self._stat(file_path)
+
+        with self._lock:
+            self._seen.add(relative_path)
+            entry = self._files.get(relative_path)
+        if entry is not None and not self._is_trusted(entry, file_stat):
+            # The file is only opened when its modification time cannot tell if it changed
+            file_hash = self._hash(file_path) if entry["size"] == file_stat[0] else None
+            with self._lock:
+                if file_hash is not None and file_hash == entry.get("hash"):
+                    entry.update({"mtime_ns": file_stat[1], "hashed_ns": time.time_ns()})
+                else:
+                    # The file changed, every value recorded for it is outdated
+                    if self._files.get(relative_path) is entry:
+                        del self._files[relative_path]
+                    entry = None
+                self._changed = True
+
+        with self._lock:
+            if entry is None or key not in entry:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            return entry[key]
+
+    def set(self, file_path: Path, key: str, value: any) -> None:
+        """
+        Records a value for the file in its current state.
+
+        Args:
+            file_path: The path of the file.
+            key: The name of the value.
+            value: The JSON serializable value.
+        """
+        relative_path, file_stat = self._stat(file_path)
+
+        with self._lock:
+            self._seen.add(relative_path)
+            entry = self._files.get(relative_path)
+        if entry is None or (entry["size"], entry["mtime_ns"]) != file_stat:
+            entry = {
+                "size": file_stat[0],
+                "mtime_ns": file_stat[1],
+                "hash": self._hash(file_path),
+                "hashed_ns": time.time_ns(),
+            }
+
+        with self._lock:
+            # Values recorded meanwhile by another thread for the same state of the file are kept
+            current = self._files.get(relative_path)
+            if current is not None and (current["size"], current["mtime_ns"]) == file_stat:
+                entry = current
+            self._files[relative_path] = entry
+            entry[key] = value
+            self._changed = True
+
+    def save(self) -> None:
+        """Writes the index if it changed, dropping the entries of files not seen by the latest scan."""
+        with self._lock:
+            unseen = self._files.keys() - self._seen
+            for relative_path in unseen:
+                del self._files[relative_path]
+
+            logger.debug(f"Repository scan index hits: {self.hits}, misses: {self.misses}")
+            if not self._changed and not unseen:
+                return
+
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = self.index_path.with_name(f"{self.index_path.name}.tmp")
+            temp_path.write_text(
+                json.dumps({"version": constants.VERSION, "files": self._files}, separators=(",", ":")),
+                encoding="utf-8",
+            )
+            temp_path.replace(self.index_path)
+            self._changed = False
+
+    @staticmethod
+    def _is_trusted(entry: dict, file_stat: tuple[int, int]) -> bool:
+        """Checks if an entry can be trusted from the size and modification time of its file alone."""
+        return (entry["size"], entry["mtime_ns"]) == file_stat and (
+            entry.get("hashed_ns", 0) - entry["mtime_ns"] > MTIME_GRANULARITY_NS
+        )
+
+    @staticmethod
+    def _hash(file_path: Path) -> str:
+        """Returns the hash of the file contents, read a chunk at a time."""
+        with file_path.open("rb") as f:
+            return hash_payload(iter(partial(f.read, constants.PAYLOAD_CHUNK_SIZE), b""))
+
+    def _stat(self, file_path: Path) -> tuple[str, tuple[int, int]]:
+        """Returns the index key of the file and its current size and modification time."""
+        file_stat = file_path.stat()
+        relative_path = file_path.relative_to(self.repository_directory).as_posix()
+        return relative_path, (file_stat.st_size, file_stat.st_mtime_ns)
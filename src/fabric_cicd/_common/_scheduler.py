@@ -0,0 +1,118 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""Functions to run publish tasks concurrently on a thread pool while honoring their dependencies."""
+
+import logging
+from collections.abc import Iterable
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable
+
+from fabric_cicd._common._exceptions import ItemDependencyError
+from fabric_cicd._common._logging import buffered_output, get_buffered_output
+
+logger = logging.getLogger(__name__)
+
+
+def run_concurrently(func: Callable, arguments: Iterable, max_workers: int, buffer_output: bool = True) -> list:
+    """
+    Calls the function once per argument using up to max_workers threads and returns the results in input order.
+
+    Runs sequentially in the calling thread when max_workers is 1. The first exception raised by a call is
+    re-raised once the running calls have finished; calls that have not started yet are cancelled.
+
+    The console output of each call on a thread is written as one block once the call completes, so the output of
+    calls running at the same time, e.g. the items of an item type, is not interleaved. When the output of the calling
+    thread is buffered, the blocks are written with it.
+
+    Args:
+        func: The function to call with each argument.
+        arguments: The arguments to call the function with.
+        max_workers: The maximum number of calls to run at the same time.
+        buffer_output: Whether to write the console output of each call as one block. Defaults to True, calls
+            running for a long time with output worth following as it happens should not be buffered.
+    """
+    arguments = list(arguments)
+
+    if max_workers <= 1 or len(arguments) <= 1:
+        return [func(argument) for argument in arguments]
+
+    parent_writes = get_buffered_output()
+
+    def _call(argument: any) -> any:
+        if not buffer_output:
+            return func(argument)
+        with buffered_output(parent_writes):
+            return func(argument)
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(arguments))) as executor:
+        futures = [executor.submit(_call, argument) for argument in arguments]
+        try:
+            return [future.result() for future in futures]
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+
+
+def run_with_dependencies(
+    tasks: dict[str, Callable], dependencies: dict[str, Iterable], max_workers: int, buffer_output: bool = True
+) -> None:
+    """
+    Runs each task as soon as all of its dependencies have completed, using up to max_workers threads.
+
+    Runs the tasks sequentially in the given order when max_workers is 1, the given order must then already
+    satisfy the dependencies. Dependencies on names that are not in tasks are ignored.
+
+    The console output of each task on a thread is written as one block once the task completes, including the
+    output of the calls it runs concurrently, so e.g. the header of an item type is written with its items.
+
+    Args:
+        tasks: Dictionary of task name to a callable taking no arguments.
+        dependencies: Dictionary of task name to the names of the tasks that must complete first.
+        max_workers: The maximum number of tasks to run at the same time.
+        buffer_output: Whether to write the console output of each task as one block. Defaults to True.
+    """
+    if max_workers <= 1:
+        for task in tasks.values():
+            task()
+        return
+
+    parent_writes = get_buffered_output()
+
+    def _run(task: Callable) -> None:
+        if not buffer_output:
+            task()
+            return
+        with buffered_output(parent_writes):
+            task()
+
+    pending = {name: {dep for dep in dependencies.get(name, []) if dep in tasks and dep != name} for name in tasks}
+    running = {}
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        try:
+            while pending or running:
+                # Submit every task whose dependencies are complete, keeping the given order
+                for name in [name for name, waiting_on in pending.items() if not waiting_on]:
+                    logger.debug(f"Starting task '{name}'")
+                    running[executor.submit(_run, tasks[name])] = name
+                    del pending[name]
+
+                if not running:
+                    msg = (
+                        f"Circular dependency found between {sorted(pending)}. Cannot determine a valid publish order."
+                    )
+                    raise ItemDependencyError(msg, logger)
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    future.result()
+                    logger.debug(f"Completed task '{name}'")
+                    for waiting_on in pending.values():
+                        waiting_on.discard(name)
+        except BaseException:
+            for future in running:
+                future.cancel()
+            raise
@@ -33,6 +33,7 @@ def validate_data_type(expected_type: str, variable_name: str, input_value: any)
     type_validators = {
         "string": lambda x: isinstance(x, str),
         "bool": lambda x: isinstance(x, bool),
+        "int": lambda x: isinstance(x, int) and not isinstance(x, bool),
         "list": lambda x: isinstance(x, list),
         "list[string]": lambda x: isinstance(x, list) and all(isinstance(item, str) for item in x),
         "FabricWorkspace": lambda x: isinstance(x, FabricWorkspace),
@@ -150,6 +151,79 @@ def validate_fabric_workspace_obj(input_value: FabricWorkspace) -> FabricWorkspa
     return input_value
 
 
+def validate_max_workers(input_value: int) -> int:
+    """
+    Validate the maximum number of concurrent workers.
+
+    Args:
+        input_value: The input value to validate.
+    """
+    validate_data_type("int", "max_workers", input_value)
+
+    if input_value < 1:
+        msg = "The provided max_workers must be greater than or equal to 1."
+        raise InputError(msg, logger)
+
+    return input_value
+
+
+def validate_deployment_manifest_path(input_value: str) -> Path:
+    """
+    Validate the deployment manifest path and convert string to Path object
+
+    Args:
+        input_value: The input value to validate.
+    """
+    validate_data_type("string", "deployment_manifest_path", input_value)
+
+    manifest_path = Path(input_value)
+
+    if manifest_path.is_dir():
+        msg = f"The provided deployment_manifest_path '{input_value}' is a directory, a file path is expected."
+        raise InputError(msg, logger)
+
+    return manifest_path.resolve()
+
+
+def validate_deployment_plan_path(input_value: str) -> Path:
+    """
+    Validate the deployment plan path and convert string to Path object
+
+    Args:
+        input_value: The input value to validate.
+    """
+    validate_data_type("string", "deployment_plan_path", input_value)
+
+    plan_path = Path(input_value)
+
+    if plan_path.is_dir():
+        msg = f"The provided deployment_plan_path '{input_value}' is a directory, a file path is expected."
+        raise InputError(msg, logger)
+
+    return plan_path.resolve()
+
+
+def validate_deployment_targets(input_value: list) -> list[dict]:
+    """
+    Validate the target workspaces of a multi-workspace deployment.
+
+    Args:
+        input_value: The input value to validate.
+    """
+    validate_data_type("list", "targets", input_value)
+
+    if not input_value:
+        msg = "At least one deployment target is required."
+        raise InputError(msg, logger)
+
+    for target in input_value:
+        if not isinstance(target, dict) or not (target.get("workspace_id") or target.get("workspace_name")):
+            msg = f"The deployment target {target} must be a dictionary with a workspace_id or a workspace_name."
+            raise InputError(msg, logger)
+
+    return input_value
+
+
 def validate_token_credential(input_value: TokenCredential) -> TokenCredential:
     """
     Validate the token credential.
@@ -24,7 +24,8 @@ def publish_dataflows(fabric_workspace_obj: FabricWorkspace) -> None:
     # Set the order of dataflows to be published based on their dependencies
     publish_order = set_publish_order(fabric_workspace_obj, item_type, find_referenced_dataflows)
 
-    fabric_workspace_obj._refresh_deployed_items()
+    # Items created implicitly by Fabric, e.g. the default KQL Database of an Eventhouse, can be referenced
+    fabric_workspace_obj._refresh_deployed_items_if_stale()
 
     # Publish
     for item_name in publish_order:
@@ -3,7 +3,6 @@
 
 """Functions to process and deploy DataPipeline item."""
 
-import json
 import logging
 import re
 
@@ -29,7 +28,8 @@ def publish_datapipelines(fabric_workspace_obj: FabricWorkspace) -> None:
     # Set the order of data pipelines to be published based on their dependencies
     publish_order = set_publish_order(fabric_workspace_obj, item_type, find_referenced_datapipelines)
 
-    fabric_workspace_obj._refresh_deployed_items()
+    # Items created implicitly by Fabric, e.g. the default KQL Database of an Eventhouse, can be referenced
+    fabric_workspace_obj._refresh_deployed_items_if_stale()
 
     # Publish
     for item_name in publish_order:
@@ -38,16 +38,16 @@ def publish_datapipelines(fabric_workspace_obj: FabricWorkspace) -> None:
         )
 
 
-def func_process_file(workspace_obj: FabricWorkspace, item_obj: Item, file_obj: File) -> str:  # noqa: ARG001
+def func_process_file(workspace_obj: FabricWorkspace, item_obj: Item, file_obj: File) -> None:  # noqa: ARG001
     """
-    Custom file processing for datapipeline items.
+    Custom file processing for datapipeline items, the parsed file contents are updated in place.
 
     Args:
         workspace_obj: The FabricWorkspace object.
         item_obj: The item object.
         file_obj: The file object.
     """
-    return update_activity_references(workspace_obj, file_obj)
+    update_activity_references(workspace_obj, file_obj)
 
 
 def find_referenced_datapipelines(fabric_workspace_obj: FabricWorkspace, file_content: dict, lookup_type: str) -> list:
@@ -80,7 +80,7 @@ def find_referenced_datapipelines(fabric_workspace_obj: FabricWorkspace, file_co
     return reference_list
 
 
-def update_activity_references(fabric_workspace_obj: FabricWorkspace, file_obj: File) -> str:
+def update_activity_references(fabric_workspace_obj: FabricWorkspace, file_obj: File) -> None:
     """
     Updates the item connection referenced in a data pipeline activity where the activity points
     to an item within the same workspace, but the workspace ID is not the default guid (all zeroes)
@@ -91,8 +91,8 @@ def update_activity_references(fabric_workspace_obj: FabricWorkspace, file_obj:
         fabric_workspace_obj: The FabricWorkspace object.
         file_obj: The file object.
     """
-    # Create a dictionary from the raw file
-    item_content_dict = json.loads(file_obj.contents)
+    # Use the parsed file, shared with the other JSON transforms of the file
+    item_content_dict = file_obj.json_contents
     guid_pattern = re.compile(constants.VALID_GUID_REGEX)
 
     # dpath library finds and replaces feature branch workspace IDs found in all levels of activities in the dictionary
@@ -121,5 +121,5 @@ def update_activity_references(fabric_workspace_obj: FabricWorkspace, file_obj:
                     dpath.set(item_content_dict, workspace_id_path, fabric_workspace_obj.workspace_id)
                     dpath.set(item_content_dict, item_id_path, deployed_guid)
 
-    # Convert the updated dict back to a JSON string
-    return json.dumps(item_content_dict, indent=2)
+    # Save the updated dict, serialized back to a JSON string once the text is needed
+    file_obj.set_json_contents(item_content_dict, indent=2)
@@ -3,17 +3,23 @@
 
 """Functions to process and deploy Environment item."""
 
+import copy
 import logging
 import os
 import re
 import urllib.parse
+from functools import partial
 from pathlib import Path
+from typing import Optional
 
 import dpath
 import yaml
 
 from fabric_cicd import FabricWorkspace, constants
+from fabric_cicd._common._deployment_manifest import hash_payload
+from fabric_cicd._common._exceptions import FailedPublishedItemStatusError
 from fabric_cicd._common._fabric_endpoint import handle_retry
+from fabric_cicd._common._scheduler import run_concurrently
 
 logger = logging.getLogger(__name__)
 
@@ -22,56 +28,150 @@ def publish_environments(fabric_workspace_obj: FabricWorkspace) -> None:
     """
     Publishes all environment items from the repository.
 
-    Environments can only deploy the shell; compute and spark configurations are published separately.
+    Environments can only deploy the shell; compute and spark configurations are staged separately. The environments
+    are staged concurrently and their publishes are submitted together once all of them are staged, the builds are
+    then tracked by check_environment_publish_state while the other item types are published.
 
     Args:
         fabric_workspace_obj: The FabricWorkspace object containing the items to be published.
     """
+    item_type = "Environment"
+    environments = fabric_workspace_obj.repository_items.get(item_type, {})
+
     # Check for ongoing publish
     check_environment_publish_state(fabric_workspace_obj, True)
 
-    item_type = "Environment"
-    for item_name, item in fabric_workspace_obj.repository_items.get(item_type, {}).items():
+    def _stage_environment(item_name: str) -> Optional[tuple[str, dict]]:
         # Only deploy the shell for environments
         fabric_workspace_obj._publish_item(
             item_name=item_name,
             item_type=item_type,
             skip_publish_logging=True,
         )
-        if item.skip_publish:
-            continue
-        _publish_environment_metadata(fabric_workspace_obj, item_name=item_name)
+        if environments[item_name].skip_publish:
+            return None
+        metadata = _stage_environment_metadata(fabric_workspace_obj, item_name=item_name)
+        if metadata is None:
+            return None
+        return item_name, metadata
+
+    staged_environments = dict(
+        staged
+        for staged in run_concurrently(_stage_environment, environments, fabric_workspace_obj.max_workers)
+        if staged is not None
+    )
+
+    # Submit the publishes together so the environments build at the same time
+    run_concurrently(
+        partial(_submit_environment_publish, fabric_workspace_obj),
+        staged_environments,
+        fabric_workspace_obj.max_workers,
+    )
+    fabric_workspace_obj.environment_publishes = staged_environments
 
 
-def _publish_environment_metadata(fabric_workspace_obj: FabricWorkspace, item_name: str) -> None:
+def _stage_environment_metadata(fabric_workspace_obj: FabricWorkspace, item_name: str) -> Optional[dict]:
     """
-    Publishes compute settings and libraries for a given environment item.
+    Stages compute settings and libraries for a given environment item.
 
-    This process involves two steps:
-    1. Check for ongoing publish.
-    2. Updating the compute settings.
-    3. Uploading/overwrite libraries to the environment.
-    4. Delete libraries in the environment that are not present in repository.
-    5. Publish the updated settings.
+    This process involves four steps:
+    1. Updating the compute settings, when they differ from the staged settings.
+    2. Uploading the libraries that are not staged with the same contents.
+    3. Delete libraries in the environment that are not present in repository.
+    4. Comparing the compute settings and libraries with the published environment.
+
+    Returns the hashes of the libraries to record once the environment is published, or None when the published
+    environment already matches the repository and does not need to be published again. Without a deployment manifest
+    this is only known for environments without custom libraries, as the API does not return their contents.
 
     Args:
         fabric_workspace_obj: The FabricWorkspace object.
-        item_name: Name of the environment item whose compute settings are to be published.
+        item_name: Name of the environment item whose compute settings are to be staged.
     """
     item_type = "Environment"
     item_path = fabric_workspace_obj.repository_items[item_type][item_name].path
     item_guid = fabric_workspace_obj.repository_items[item_type][item_name].guid
 
+    # The hashes of the libraries recorded when the environment was last published
+    published_hashes = (
+        fabric_workspace_obj.deployment_manifest.get_metadata(item_type, item_name, item_guid).get("libraries", {})
+        if fabric_workspace_obj.deployment_manifest is not None
+        else {}
+    )
+
     # Update compute settings
-    _update_compute_settings(fabric_workspace_obj, item_path, item_guid, item_name)
+    compute_settings = _get_compute_settings(fabric_workspace_obj, item_path, item_name)
+    if _is_compute_current(compute_settings, _get_environment_compute(fabric_workspace_obj, item_guid, staging=True)):
+        logger.debug(f"Spark settings of '{item_name}' are already staged")
+    else:
+        _update_compute_settings(fabric_workspace_obj, item_guid, compute_settings)
 
     repo_library_files = _get_repo_libraries(item_path)
+    library_hashes = {file_name: _hash_library(file_path) for file_name, file_path in repo_library_files.items()}
+    staged_libraries = _get_environment_libraries(fabric_workspace_obj, item_guid, staging=True)
 
-    # Add libraries to environment, overwriting anything with the same name and return the list of libraries
-    _add_libraries(fabric_workspace_obj, item_guid, repo_library_files)
+    # The API only returns the contents of environment.yml, custom libraries are compared using the manifest
+    custom_libraries_unknown = fabric_workspace_obj.deployment_manifest is None and any(
+        file_name != "environment.yml" for file_name in repo_library_files
+    )
+    if custom_libraries_unknown:
+        logger.debug(
+            f"Uploading every custom library of '{item_name}', pass a deployment manifest to skip unchanged ones"
+        )
+
+    # Upload the libraries that are not staged with the same contents
+    _add_libraries(
+        fabric_workspace_obj,
+        item_guid,
+        {
+            file_name: file_path
+            for file_name, file_path in repo_library_files.items()
+            if not _is_library_current(
+                file_name, file_path, library_hashes[file_name], staged_libraries, published_hashes
+            )
+        },
+    )
 
     # Remove libraries from live environment that are not in the repository
-    _remove_libraries(fabric_workspace_obj, item_guid, repo_library_files)
+    _remove_libraries(fabric_workspace_obj, item_guid, repo_library_files, staged_libraries)
+
+    # Compare with the published environment, a publish rebuilds the environment even when nothing changed
+    compute_published = _is_compute_current(
+        compute_settings, _get_environment_compute(fabric_workspace_obj, item_guid, staging=False)
+    )
+    published_libraries = _get_environment_libraries(fabric_workspace_obj, item_guid, staging=False)
+    libraries_published = set(published_libraries) == set(repo_library_files) and all(
+        _is_library_current(file_name, file_path, library_hashes[file_name], published_libraries, published_hashes)
+        for file_name, file_path in repo_library_files.items()
+    )
+
+    if compute_published and libraries_published:
+        logger.info(
+            f"{constants.INDENT}Skipped publish, the compute settings and libraries match the published environment"
+        )
+        return None
+
+    if not compute_published:
+        logger.debug(f"The compute settings of '{item_name}' differ from the published environment")
+    if not libraries_published and custom_libraries_unknown:
+        logger.debug(
+            f"The libraries of '{item_name}' may differ from the published environment, the contents of custom "
+            "libraries are only known with a deployment manifest"
+        )
+    elif not libraries_published:
+        logger.debug(f"The libraries of '{item_name}' differ from the published environment")
+    return {"libraries": library_hashes}
+
+
+def _submit_environment_publish(fabric_workspace_obj: FabricWorkspace, item_name: str) -> None:
+    """
+    Publishes the staged settings and libraries of an environment item, the publish runs in the background.
+
+    Args:
+        fabric_workspace_obj: The FabricWorkspace object.
+        item_name: Name of the environment item to publish.
+    """
+    item_guid = fabric_workspace_obj.repository_items["Environment"][item_name].guid
 
     # Publish updated settings
     # https://learn.microsoft.com/en-us/rest/api/fabric/environment/spark-libraries/publish-environment
@@ -79,100 +179,186 @@ def _publish_environment_metadata(fabric_workspace_obj: FabricWorkspace, item_na
         method="POST", url=f"{fabric_workspace_obj.base_api_url}/environments/{item_guid}/staging/publish"
     )
 
-    logger.info(f"{constants.INDENT}Publish Submitted")
+    logger.info(f"{constants.INDENT}Publish Submitted for '{item_name}'")
 
 
-def check_environment_publish_state(fabric_workspace_obj: FabricWorkspace, initial_check: bool = False) -> None:
+def check_environment_publish_state(
+    fabric_workspace_obj: FabricWorkspace, initial_check: bool = False, item_names: Optional[list[str]] = None
+) -> None:
     """
-    Checks the publish state of environments after deployment
+    Checks the publish state of environments after deployment.
+
+    A single poller lists the environments of the workspace and tracks the state of each environment, until none of
+    them is running. Every failed or cancelled publish is raised once all of them have completed.
 
     Args:
         fabric_workspace_obj: The FabricWorkspace object.
         initial_check: Flag to ignore publish failures on initial check.
+        item_names: The environments to track. Defaults to the environments in the repository that are not excluded
+            from the deployment.
     """
-    ongoing_publish = True
-    iteration = 1
-
-    environments = fabric_workspace_obj.repository_items.get("Environment", {})
+    if item_names is None:
+        item_names = [
+            k
+            for k in fabric_workspace_obj.repository_items.get("Environment", {})
+            if not fabric_workspace_obj.publish_item_name_exclude_regex
+            or not re.search(fabric_workspace_obj.publish_item_name_exclude_regex, k)
+        ]
 
-    filtered_environments = [
-        k
-        for k in environments
-        if not fabric_workspace_obj.publish_item_name_exclude_regex
-        or not re.search(fabric_workspace_obj.publish_item_name_exclude_regex, k)
-    ]
+    if not item_names:
+        return
 
-    logger.info(f"Checking Environment Publish State for {filtered_environments}")
+    logger.info(f"Checking Environment Publish State for {list(item_names)}")
 
-    while ongoing_publish:
-        ongoing_publish = False
+    pending_environments = set(item_names)
+    failed_publishes = []
+    iteration = 1
 
+    while pending_environments:
+        # https://learn.microsoft.com/en-us/rest/api/fabric/environment/items/list-environments
         response_state = fabric_workspace_obj.endpoint.invoke(
             method="GET", url=f"{fabric_workspace_obj.base_api_url}/environments/"
         )
-
-        for item in response_state["body"]["value"]:
-            item_name = item["displayName"]
-            item_state = dpath.get(item, "properties/publishDetails/state", default="").lower()
-            if item_name in environments and item_state == "running":
-                ongoing_publish = True
-            elif item_state in ["failed", "cancelled"] and not initial_check:
-                msg = f"Publish {item_state} for {item_name}"
-                raise Exception(msg)
-
-        if ongoing_publish:
+        environment_states = {
+            item["displayName"]: dpath.get(item, "properties/publishDetails/state", default="").lower()
+            for item in response_state["body"]["value"]
+        }
+
+        for item_name in sorted(pending_environments):
+            item_state = environment_states.get(item_name, "")
+            if item_state == "running":
+                continue
+            pending_environments.discard(item_name)
+            if initial_check:
+                continue
+            if item_state in ["failed", "cancelled"]:
+                failed_publishes.append(f"Publish {item_state} for {item_name}")
+            else:
+                _record_published_environment(fabric_workspace_obj, item_name)
+                logger.info(f"{constants.INDENT}Published '{item_name}'")
+
+        if pending_environments:
             handle_retry(
                 attempt=iteration,
                 base_delay=5,
                 response_retry_after=120,
-                prepend_message=f"{constants.INDENT}Operation in progress.",
+                prepend_message=f"{constants.INDENT}Operation in progress for {sorted(pending_environments)}.",
             )
             iteration += 1
 
-    if not initial_check:
-        logger.info(f"{constants.INDENT}Published.")
+    if failed_publishes:
+        msg = ". ".join(failed_publishes)
+        raise FailedPublishedItemStatusError(msg, logger)
 
 
-def _update_compute_settings(
-    fabric_workspace_obj: FabricWorkspace, item_path: Path, item_guid: str, item_name: str
-) -> None:
+def _record_published_environment(fabric_workspace_obj: FabricWorkspace, item_name: str) -> None:
     """
-    Update spark compute settings.
+    Records the library hashes of an environment published by this run in the deployment manifest.
+
+    The hashes are only recorded once the publish has succeeded, so a failed publish is submitted again by the next
+    run.
+
+    Args:
+        fabric_workspace_obj: The FabricWorkspace object.
+        item_name: Name of the published environment item.
+    """
+    metadata = fabric_workspace_obj.environment_publishes.get(item_name)
+    if fabric_workspace_obj.deployment_manifest is None or metadata is None:
+        return
+    item_guid = fabric_workspace_obj.repository_items["Environment"][item_name].guid
+    fabric_workspace_obj.deployment_manifest.record_metadata("Environment", item_name, item_guid, **metadata)
+
+
+def _get_compute_settings(fabric_workspace_obj: FabricWorkspace, item_path: Path, item_name: str) -> dict:
+    """
+    Return the spark compute settings of the environment item, as sent to the API.
 
     Args:
         fabric_workspace_obj: The FabricWorkspace object.
         item_path: The path to the environment item.
-        item_guid: The GUID of the environment item.
         item_name: Name of the environment item.
     """
     # Read compute settings from YAML file
     with Path.open(Path(item_path, "Setting", "Sparkcompute.yml"), "r+", encoding="utf-8") as f:
         yaml_body = yaml.safe_load(f)
 
-        # Update instance pool settings if present
-        if "instance_pool_id" in yaml_body:
-            pool_id = yaml_body["instance_pool_id"]
-            if "spark_pool" in fabric_workspace_obj.environment_parameter:
-                parameter_dict = fabric_workspace_obj.environment_parameter["spark_pool"]
-                for key in parameter_dict:
-                    instance_pool_id = key["instance_pool_id"]
-                    replace_value = key["replace_value"]
-                    input_name = key.get("item_name")
-                    if instance_pool_id == pool_id and (input_name == item_name or not input_name):
-                        # replace any found references with specified environment value
-                        yaml_body["instancePool"] = replace_value[fabric_workspace_obj.environment]
-                        del yaml_body["instance_pool_id"]
-
-        yaml_body = _convert_environment_compute_to_camel(fabric_workspace_obj, yaml_body)
-
-        # Update compute settings
-        # https://learn.microsoft.com/en-us/rest/api/fabric/environment/spark-compute/update-staging-settings
-        fabric_workspace_obj.endpoint.invoke(
-            method="PATCH",
-            url=f"{fabric_workspace_obj.base_api_url}/environments/{item_guid}/staging/sparkcompute",
-            body=yaml_body,
-        )
-        logger.info(f"{constants.INDENT}Updated Spark Settings")
+    # Update instance pool settings if present
+    if "instance_pool_id" in yaml_body:
+        pool_id = yaml_body["instance_pool_id"]
+        if "spark_pool" in fabric_workspace_obj.environment_parameter:
+            parameter_dict = fabric_workspace_obj.environment_parameter["spark_pool"]
+            for key in parameter_dict:
+                instance_pool_id = key["instance_pool_id"]
+                replace_value = key["replace_value"]
+                input_name = key.get("item_name")
+                if instance_pool_id == pool_id and (input_name == item_name or not input_name):
+                    # replace any found references with specified environment value
+                    yaml_body["instancePool"] = replace_value[fabric_workspace_obj.environment]
+                    del yaml_body["instance_pool_id"]
+
+    return _convert_environment_compute_to_camel(fabric_workspace_obj, yaml_body)
+
+
+def _get_environment_compute(fabric_workspace_obj: FabricWorkspace, item_guid: str, staging: bool) -> dict:
+    """
+    Return the staged or published spark compute settings of the environment.
+
+    Args:
+        fabric_workspace_obj: The FabricWorkspace object.
+        item_guid: The GUID of the environment item.
+        staging: Whether to return the staged settings instead of the published settings.
+    """
+    # https://learn.microsoft.com/en-us/rest/api/fabric/environment/spark-compute/get-staging-settings
+    # https://learn.microsoft.com/en-us/rest/api/fabric/environment/spark-compute/get-published-settings
+    staging_path = "staging/" if staging else ""
+    response = fabric_workspace_obj.endpoint.invoke(
+        method="GET", url=f"{fabric_workspace_obj.base_api_url}/environments/{item_guid}/{staging_path}sparkcompute"
+    )
+    return response["body"]
+
+
+def _is_compute_current(compute_settings: dict, environment_compute: dict) -> bool:
+    """
+    Checks if the compute settings of the environment are the ones of the repository.
+
+    The settings must be equal, including nested settings such as the spark properties, so a setting removed from the
+    repository is a change. Only the fields of constants.ENVIRONMENT_COMPUTE_API_FIELDS the repository does not set
+    are ignored.
+
+    Args:
+        compute_settings: The compute settings of the repository, see _get_compute_settings.
+        environment_compute: The compute settings of the environment, see _get_environment_compute.
+    """
+    environment_compute = copy.deepcopy(environment_compute)
+    for *parent_keys, field in constants.ENVIRONMENT_COMPUTE_API_FIELDS:
+        repository_parent, environment_parent = compute_settings, environment_compute
+        for key in parent_keys:
+            repository_parent = repository_parent.get(key) if isinstance(repository_parent, dict) else None
+            environment_parent = environment_parent.get(key) if isinstance(environment_parent, dict) else None
+        if isinstance(environment_parent, dict) and not (
+            isinstance(repository_parent, dict) and field in repository_parent
+        ):
+            environment_parent.pop(field, None)
+    return compute_settings == environment_compute
+
+
+def _update_compute_settings(fabric_workspace_obj: FabricWorkspace, item_guid: str, compute_settings: dict) -> None:
+    """
+    Update spark compute settings.
+
+    Args:
+        fabric_workspace_obj: The FabricWorkspace object.
+        item_guid: The GUID of the environment item.
+        compute_settings: The compute settings of the repository, see _get_compute_settings.
+    """
+    # Update compute settings
+    # https://learn.microsoft.com/en-us/rest/api/fabric/environment/spark-compute/update-staging-settings
+    fabric_workspace_obj.endpoint.invoke(
+        method="PATCH",
+        url=f"{fabric_workspace_obj.base_api_url}/environments/{item_guid}/staging/sparkcompute",
+        body=compute_settings,
+    )
+    logger.info(f"{constants.INDENT}Updated Spark Settings")
 
 
 def _get_repo_libraries(item_path: Path) -> dict:
@@ -193,58 +379,115 @@ def _get_repo_libraries(item_path: Path) -> dict:
     return repo_library_files
 
 
-def _add_libraries(fabric_workspace_obj: FabricWorkspace, item_guid: str, repo_library_files: dict) -> None:
+def _hash_library(file_path: Path) -> str:
     """
-    Add libraries to environment, overwriting anything with the same name.
+    Return the hash of a library file, read from disk a chunk at a time.
 
     Args:
-        fabric_workspace_obj: The FabricWorkspace object.
-        item_guid: The GUID of the environment item.
-        repo_library_files: The list of libraries in the repository.
+        file_path: The path to the library file.
     """
-    for file_name, file_path in repo_library_files.items():
-        library_file = {"file": (file_name, file_path.open("rb"))}
-
-        # Upload libraries From Repo
-        # https://learn.microsoft.com/en-us/rest/api/fabric/environment/spark-libraries/upload-staging-library
-        fabric_workspace_obj.endpoint.invoke(
-            method="POST",
-            url=f"{fabric_workspace_obj.base_api_url}/environments/{item_guid}/staging/libraries",
-            files=library_file,
-        )
-        logger.info(f"{constants.INDENT}Updated Library {file_path.name}")
+    with file_path.open("rb") as f:
+        return hash_payload(iter(partial(f.read, constants.PAYLOAD_CHUNK_SIZE), b""))
 
 
-def _remove_libraries(fabric_workspace_obj: FabricWorkspace, item_guid: str, repo_library_files: dict) -> None:
+def _get_environment_libraries(
+    fabric_workspace_obj: FabricWorkspace, item_guid: str, staging: bool
+) -> dict[str, Optional[str]]:
     """
-    Remove libraries not in repository.
+    Return the names of the staged or published libraries of the environment, with the contents of its environment.yml.
 
     Args:
         fabric_workspace_obj: The FabricWorkspace object.
         item_guid: The GUID of the environment item.
-        repo_library_files: The list of libraries in the repository.
-
+        staging: Whether to return the staged libraries instead of the published libraries.
     """
-    # Get staged libraries
     # https://learn.microsoft.com/en-us/rest/api/fabric/environment/spark-libraries/get-staging-libraries
+    # https://learn.microsoft.com/en-us/rest/api/fabric/environment/spark-libraries/get-published-libraries
+    staging_path = "staging/" if staging else ""
     response_environment = fabric_workspace_obj.endpoint.invoke(
-        method="GET", url=f"{fabric_workspace_obj.base_api_url}/environments/{item_guid}/staging/libraries"
+        method="GET", url=f"{fabric_workspace_obj.base_api_url}/environments/{item_guid}/{staging_path}libraries"
     )
 
+    environment_libraries = {}
     if response_environment["body"].get("errorCode", "") != "EnvironmentLibrariesNotFound":
-        if (
-            "environmentYml" in response_environment["body"]
-            and response_environment["body"]["environmentYml"]  # not none or ''
-            and "environment.yml" not in repo_library_files
-        ):
-            _remove_library(fabric_workspace_obj, item_guid, "environment.yml")
+        environment_yml = response_environment["body"].get("environmentYml")
+        if environment_yml:  # not none or ''
+            environment_libraries["environment.yml"] = environment_yml
 
         custom_libraries = response_environment["body"].get("customLibraries", None)
         if custom_libraries:
             for files in custom_libraries.values():
                 for file in files:
-                    if file not in repo_library_files:
-                        _remove_library(fabric_workspace_obj, item_guid, file)
+                    environment_libraries[file] = None
+
+    return environment_libraries
+
+
+def _is_library_current(
+    file_name: str, file_path: Path, library_hash: str, environment_libraries: dict, published_hashes: dict
+) -> bool:
+    """
+    Checks if a repository library is in the environment with the same contents.
+
+    The API only returns the names of custom libraries, so their contents are known from the hash recorded when they
+    were last published. The contents of environment.yml are returned and compared directly.
+
+    Args:
+        file_name: The name of the library.
+        file_path: The path to the library in the repository.
+        library_hash: The hash of the library in the repository.
+        environment_libraries: The staged or published libraries, see _get_environment_libraries.
+        published_hashes: The hashes of the libraries recorded when the environment was last published.
+    """
+    if file_name not in environment_libraries:
+        return False
+    if published_hashes.get(file_name) == library_hash:
+        return True
+    environment_contents = environment_libraries[file_name]
+    return environment_contents is not None and environment_contents == file_path.read_text(encoding="utf-8")
+
+
+def _add_libraries(fabric_workspace_obj: FabricWorkspace, item_guid: str, library_files: dict) -> None:
+    """
+    Add libraries to environment concurrently, overwriting anything with the same name.
+
+    Args:
+        fabric_workspace_obj: The FabricWorkspace object.
+        item_guid: The GUID of the environment item.
+        library_files: The libraries to upload, by file name.
+    """
+
+    def _add_library(file_name: str) -> None:
+        file_path = library_files[file_name]
+        with file_path.open("rb") as f:
+            # Upload libraries From Repo
+            # https://learn.microsoft.com/en-us/rest/api/fabric/environment/spark-libraries/upload-staging-library
+            fabric_workspace_obj.endpoint.invoke(
+                method="POST",
+                url=f"{fabric_workspace_obj.base_api_url}/environments/{item_guid}/staging/libraries",
+                files={"file": (file_name, f)},
+            )
+        logger.info(f"{constants.INDENT}Updated Library {file_path.name}")
+
+    run_concurrently(_add_library, library_files, fabric_workspace_obj.max_workers)
+
+
+def _remove_libraries(
+    fabric_workspace_obj: FabricWorkspace, item_guid: str, repo_library_files: dict, staged_libraries: dict
+) -> None:
+    """
+    Remove libraries not in repository concurrently.
+
+    Args:
+        fabric_workspace_obj: The FabricWorkspace object.
+        item_guid: The GUID of the environment item.
+        repo_library_files: The list of libraries in the repository.
+        staged_libraries: The staged libraries, see _get_environment_libraries.
+    """
+    removed_libraries = [file_name for file_name in staged_libraries if file_name not in repo_library_files]
+    run_concurrently(
+        partial(_remove_library, fabric_workspace_obj, item_guid), removed_libraries, fabric_workspace_obj.max_workers
+    )
 
 
 def _remove_library(fabric_workspace_obj: FabricWorkspace, item_guid: str, file_name: str) -> None:
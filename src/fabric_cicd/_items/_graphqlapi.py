@@ -4,8 +4,10 @@
 """Functions to process and deploy API for GraphQL item."""
 
 import logging
+from functools import partial
 
 from fabric_cicd import FabricWorkspace
+from fabric_cicd._common._scheduler import run_concurrently
 
 logger = logging.getLogger(__name__)
 
@@ -19,5 +21,8 @@ def publish_graphqlapis(fabric_workspace_obj: FabricWorkspace) -> None:
     """
     item_type = "GraphQLApi"
 
-    for item_name in fabric_workspace_obj.repository_items.get(item_type, {}):
-        fabric_workspace_obj._publish_item(item_name=item_name, item_type=item_type)
+    run_concurrently(
+        partial(fabric_workspace_obj._publish_item, item_type=item_type),
+        fabric_workspace_obj.repository_items.get(item_type, {}),
+        fabric_workspace_obj.max_workers,
+    )
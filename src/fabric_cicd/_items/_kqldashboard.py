@@ -3,13 +3,14 @@
 
 """Functions to process and deploy Real-Time Dashboard item."""
 
-import json
 import logging
+from functools import partial
 
 from fabric_cicd import FabricWorkspace
 from fabric_cicd._common._exceptions import ParsingError
 from fabric_cicd._common._file import File
 from fabric_cicd._common._item import Item
+from fabric_cicd._common._scheduler import run_concurrently
 
 logger = logging.getLogger(__name__)
 
@@ -23,28 +24,30 @@ def publish_kqldashboard(fabric_workspace_obj: FabricWorkspace) -> None:
     """
     item_type = "KQLDashboard"
 
-    fabric_workspace_obj._refresh_deployed_items()
+    # Items created implicitly by Fabric, e.g. the default KQL Database of an Eventhouse, can be referenced
+    fabric_workspace_obj._refresh_deployed_items_if_stale()
 
-    for item_name in fabric_workspace_obj.repository_items.get(item_type, {}):
-        fabric_workspace_obj._publish_item(
-            item_name=item_name, item_type=item_type, func_process_file=func_process_file
-        )
+    run_concurrently(
+        partial(fabric_workspace_obj._publish_item, item_type=item_type, func_process_file=func_process_file),
+        fabric_workspace_obj.repository_items.get(item_type, {}),
+        fabric_workspace_obj.max_workers,
+    )
 
 
-def func_process_file(workspace_obj: FabricWorkspace, item_obj: Item, file_obj: File) -> str:
+def func_process_file(workspace_obj: FabricWorkspace, item_obj: Item, file_obj: File) -> None:
     """
-    Custom file processing for KQL Dashboard items.
+    Custom file processing for KQL Dashboard items, the parsed file contents are updated in place.
 
     Args:
         workspace_obj: The FabricWorkspace object.
         item_obj: The item object.
         file_obj: The file object.
     """
-    # For KQL Dashboard, we do not need to process the file content
-    return replace_cluster_uri(workspace_obj, file_obj) if item_obj.type == "KQLDashboard" else file_obj.contents
+    if item_obj.type == "KQLDashboard":
+        replace_cluster_uri(workspace_obj, file_obj)
 
 
-def replace_cluster_uri(fabric_workspace_obj: FabricWorkspace, file_obj: File) -> str:
+def replace_cluster_uri(fabric_workspace_obj: FabricWorkspace, file_obj: File) -> None:
     """
     Replaces an empty cluster URI value in a Real-Time Dashboard item with the cluster URI associated
     with its KQL Database source in the raw file content.
@@ -53,8 +56,8 @@ def replace_cluster_uri(fabric_workspace_obj: FabricWorkspace, file_obj: File) -
         fabric_workspace_obj: The FabricWorkspace object.
         file_obj: The file object.
     """
-    # Create a dictionary from the raw file
-    json_content_dict = json.loads(file_obj.contents)
+    # Use the parsed file, shared with the other JSON transforms of the file
+    json_content_dict = file_obj.json_contents
 
     data_sources = json_content_dict.get("dataSources")
 
@@ -87,4 +90,4 @@ def replace_cluster_uri(fabric_workspace_obj: FabricWorkspace, file_obj: File) -
 
             data_source["clusterUri"] = kqldatabase_cluster_uri
 
-    return json.dumps(json_content_dict, indent=2)
+    file_obj.set_json_contents(json_content_dict, indent=2)
@@ -5,6 +5,8 @@
 
 import json
 import logging
+from functools import partial
+from typing import Callable
 
 import dpath
 
@@ -12,6 +14,7 @@ from fabric_cicd import FabricWorkspace, constants
 from fabric_cicd._common._exceptions import FailedPublishedItemStatusError
 from fabric_cicd._common._fabric_endpoint import handle_retry
 from fabric_cicd._common._item import Item
+from fabric_cicd._common._scheduler import run_concurrently
 
 logger = logging.getLogger(__name__)
 
@@ -25,7 +28,8 @@ def publish_lakehouses(fabric_workspace_obj: FabricWorkspace) -> None:
     """
     item_type = "Lakehouse"
 
-    for item_name, item in fabric_workspace_obj.repository_items.get(item_type, {}).items():
+    def _publish_lakehouse(item_name: str) -> None:
+        item = fabric_workspace_obj.repository_items[item_type][item_name]
         creation_payload = next(
             (
                 {"enableSchemas": True}
@@ -44,70 +48,139 @@ def publish_lakehouses(fabric_workspace_obj: FabricWorkspace) -> None:
 
         # Check if the item is published to avoid any post publish actions
         if item.skip_publish:
-            continue
-
-        check_sqlendpoint_provision_status(fabric_workspace_obj, item)
+            return
 
         logger.info(f"{constants.INDENT}Published")
 
+    # Create every lakehouse first, their SQL endpoints are then provisioned at the same time
+    run_concurrently(
+        _publish_lakehouse,
+        fabric_workspace_obj.repository_items.get(item_type, {}),
+        fabric_workspace_obj.max_workers,
+    )
+
+    check_sqlendpoint_provision_status(
+        fabric_workspace_obj,
+        [
+            item_obj
+            for item_obj in fabric_workspace_obj.repository_items.get(item_type, {}).values()
+            if not item_obj.skip_publish
+        ],
+    )
+
     # Need all lakehouses published first to protect interrelationships
     if "enable_shortcut_publish" in constants.FEATURE_FLAG:
-        for item_obj in fabric_workspace_obj.repository_items.get(item_type, {}).values():
-            # Check if the item is published to avoid any post publish actions
-            if item_obj.skip_publish:
-                continue
-            process_shortcuts(fabric_workspace_obj, item_obj)
+        process_shortcuts(
+            fabric_workspace_obj,
+            [
+                item_obj
+                for item_obj in fabric_workspace_obj.repository_items.get(item_type, {}).values()
+                # Check if the item is published to avoid any post publish actions
+                if not item_obj.skip_publish
+            ],
+        )
 
 
-def check_sqlendpoint_provision_status(fabric_workspace_obj: FabricWorkspace, item_obj: Item) -> None:
+def check_sqlendpoint_provision_status(fabric_workspace_obj: FabricWorkspace, item_objs: list[Item]) -> None:
     """
     Check the SQL endpoint status of the published lakehouses
 
+    A single watcher lists the lakehouses of the workspace until the SQL endpoint of every published lakehouse is
+    provisioned or has failed. The failed SQL endpoints are raised once none is provisioning any more.
+
     Args:
         fabric_workspace_obj: The FabricWorkspace object containing the items to be published
-        item_obj: The item object to check the SQL endpoint status for
+        item_objs: The item objects to check the SQL endpoint status for
 
     """
+    pending_items = {item_obj.guid: item_obj for item_obj in item_objs}
+    failed_items = []
     iteration = 1
 
-    while True:
-        sql_endpoint_status = None
+    while pending_items:
+        sql_endpoint_statuses = _list_sqlendpoint_provision_status(fabric_workspace_obj)
+
+        for item_guid, item_obj in list(pending_items.items()):
+            sql_endpoint_status = sql_endpoint_statuses.get(item_guid)
+
+            if sql_endpoint_status == "Success":
+                logger.info(f"{constants.INDENT}SQL Endpoint provisioned successfully for '{item_obj.name}'")
+                del pending_items[item_guid]
+
+            elif sql_endpoint_status == "Failed":
+                failed_items.append(item_obj.name)
+                del pending_items[item_guid]
+
+        if pending_items:
+            handle_retry(
+                attempt=iteration,
+                base_delay=5,
+                response_retry_after=30,
+                prepend_message=(
+                    f"{constants.INDENT}SQL Endpoint provisioning in progress for "
+                    f"{sorted(item_obj.name for item_obj in pending_items.values())}"
+                ),
+            )
+            iteration += 1
+
+    if failed_items:
+        msg = f"Cannot resolve SQL endpoint for lakehouse {', '.join(failed_items)}"
+        raise FailedPublishedItemStatusError(msg, logger)
 
-        response_state = fabric_workspace_obj.endpoint.invoke(
-            method="GET", url=f"{fabric_workspace_obj.base_api_url}/lakehouses/{item_obj.guid}"
-        )
 
-        sql_endpoint_status = dpath.get(
-            response_state, "body/properties/sqlEndpointProperties/provisioningStatus", default=None
-        )
+def _list_sqlendpoint_provision_status(fabric_workspace_obj: FabricWorkspace) -> dict[str, str]:
+    """
+    Returns the SQL endpoint provisioning status of every lakehouse in the workspace, by lakehouse GUID.
+
+    Args:
+        fabric_workspace_obj: The FabricWorkspace object containing the items to be published
+    """
+    sql_endpoint_statuses = {}
+    request_url = f"{fabric_workspace_obj.base_api_url}/lakehouses"
+
+    while request_url:
+        # https://learn.microsoft.com/en-us/rest/api/fabric/lakehouse/items/list-lakehouses
+        response = fabric_workspace_obj.endpoint.invoke(method="GET", url=request_url)
+
+        for lakehouse in response["body"].get("value", []):
+            sql_endpoint_statuses[lakehouse["id"]] = dpath.get(
+                lakehouse, "properties/sqlEndpointProperties/provisioningStatus", default=None
+            )
+
+        request_url = response["header"].get("continuationUri", None)
 
-        if sql_endpoint_status == "Success":
-            logger.info(f"{constants.INDENT}SQL Endpoint provisioned successfully")
-            break
+    return sql_endpoint_statuses
+
+
+def process_shortcuts(fabric_workspace_obj: FabricWorkspace, item_objs: list[Item]) -> None:
+    """
+    Publishes all shortcuts for the lakehouse items.
 
-        if sql_endpoint_status == "Failed":
-            msg = f"Cannot resolve SQL endpoint for lakehouse {item_obj.name}"
-            raise FailedPublishedItemStatusError(msg, logger)
+    The shortcuts of each lakehouse are compared with the deployed shortcuts, and only the shortcuts to create,
+    update or delete are sent. These run concurrently, for all the lakehouses at once.
 
-        handle_retry(
-            attempt=iteration,
-            base_delay=5,
-            response_retry_after=30,
-            prepend_message=f"{constants.INDENT}SQL Endpoint provisioning in progress",
+    Args:
+        fabric_workspace_obj: The FabricWorkspace object containing the items to be published
+        item_objs: The item objects to publish shortcuts for
+    """
+    shortcut_operations = [
+        operation
+        for operations in run_concurrently(
+            partial(_diff_shortcuts, fabric_workspace_obj), item_objs, fabric_workspace_obj.max_workers
         )
-        iteration += 1
+        for operation in operations
+    ]
+    run_concurrently(lambda operation: operation(), shortcut_operations, fabric_workspace_obj.max_workers)
 
 
-def process_shortcuts(fabric_workspace_obj: FabricWorkspace, item_obj: Item) -> None:
+def _diff_shortcuts(fabric_workspace_obj: FabricWorkspace, item_obj: Item) -> list[Callable[[], None]]:
     """
-    Publishes all shortcuts for a lakehouse item.
+    Returns the operations that bring the deployed shortcuts of a lakehouse in line with the repository.
 
     Args:
         fabric_workspace_obj: The FabricWorkspace object containing the items to be published
         item_obj: The item object to publish shortcuts for
     """
-    deployed_shortcuts = list_deployed_shortcuts(fabric_workspace_obj, item_obj)
-
     shortcut_file_obj = next((file for file in item_obj.item_files if file.name == "shortcuts.metadata.json"), None)
 
     if shortcut_file_obj:
@@ -122,70 +195,110 @@ def process_shortcuts(fabric_workspace_obj: FabricWorkspace, item_obj: Item) ->
 
     shortcuts_to_publish = {f"{shortcut['path']}/{shortcut['name']}": shortcut for shortcut in shortcuts}
 
-    if shortcuts_to_publish:
-        logger.info(f"Publishing Lakehouse '{item_obj.name}' Shortcuts")
-        shortcut_paths_to_unpublish = [path for path in deployed_shortcuts if path not in shortcuts_to_publish]
-        unpublish_shortcuts(fabric_workspace_obj, item_obj, shortcut_paths_to_unpublish)
+    if not shortcuts_to_publish:
+        return []
+
+    logger.info(f"Publishing Lakehouse '{item_obj.name}' Shortcuts")
+    deployed_shortcuts = list_deployed_shortcuts(fabric_workspace_obj, item_obj)
+
+    operations = [
+        partial(unpublish_shortcut, fabric_workspace_obj, item_obj, deployed_shortcut_path)
+        for deployed_shortcut_path in deployed_shortcuts
+        if deployed_shortcut_path not in shortcuts_to_publish
+    ]
+    unchanged_count = 0
+    for shortcut_path, shortcut in shortcuts_to_publish.items():
+        if shortcut_path in deployed_shortcuts and _is_shortcut_current(shortcut, deployed_shortcuts[shortcut_path]):
+            unchanged_count += 1
+            continue
         # Deploy and overwrite shortcuts
-        publish_shortcuts(fabric_workspace_obj, item_obj, shortcuts_to_publish)
+        operations.append(partial(publish_shortcut, fabric_workspace_obj, item_obj, shortcut))
 
+    if unchanged_count:
+        logger.info(f"{constants.INDENT}{unchanged_count} Shortcuts Unchanged")
+    return operations
 
-def publish_shortcuts(fabric_workspace_obj: FabricWorkspace, item_obj: Item, shortcut_dict: dict) -> None:
+
+def publish_shortcut(fabric_workspace_obj: FabricWorkspace, item_obj: Item, shortcut: dict) -> None:
     """
-    Publishes all shortcuts defined in the list.
+    Publishes a shortcut, overwriting the deployed shortcut with the same path.
 
     Args:
         fabric_workspace_obj: The FabricWorkspace object containing the items to be published
-        item_obj: The item object to publish shortcuts for
-        shortcut_dict: The dict of shortcuts to publish
-    """
-    for shortcut in shortcut_dict.values():
-        # https://learn.microsoft.com/en-us/rest/api/fabric/core/onelake-shortcuts/create-shortcut
-        try:
-            fabric_workspace_obj.endpoint.invoke(
-                method="POST",
-                url=f"{fabric_workspace_obj.base_api_url}/items/{item_obj.guid}/shortcuts?shortcutConflictPolicy=CreateOrOverwrite",
-                body=shortcut,
+        item_obj: The item object to publish the shortcut for
+        shortcut: The shortcut to publish
+    """
+    # https://learn.microsoft.com/en-us/rest/api/fabric/core/onelake-shortcuts/create-shortcut
+    try:
+        fabric_workspace_obj.endpoint.invoke(
+            method="POST",
+            url=f"{fabric_workspace_obj.base_api_url}/items/{item_obj.guid}/shortcuts?shortcutConflictPolicy=CreateOrOverwrite",
+            body=shortcut,
+        )
+        logger.info(f"{constants.INDENT}{shortcut['name']} Shortcut Published to '{item_obj.name}'")
+    except Exception as e:
+        if "continue_on_shortcut_failure" in constants.FEATURE_FLAG:
+            logger.warning(
+                f"Failed to publish '{shortcut['name']}'. This usually happens when the lakehouse containing the source for this shortcut is published as a shell and has no data yet."
             )
-            logger.info(f"{constants.INDENT}{shortcut['name']} Shortcut Published")
-        except Exception as e:
-            if "continue_on_shortcut_failure" in constants.FEATURE_FLAG:
-                logger.warning(
-                    f"Failed to publish '{shortcut['name']}'. This usually happens when the lakehouse containing the source for this shortcut is published as a shell and has no data yet."
-                )
-                logger.info("The publish process will continue with the other items.")
-                continue
-            msg = f"Failed to publish '{shortcut['name']}' for lakehouse {item_obj.name}"
-            raise FailedPublishedItemStatusError(msg, logger) from e
+            logger.info("The publish process will continue with the other items.")
+            return
+        msg = f"Failed to publish '{shortcut['name']}' for lakehouse {item_obj.name}"
+        raise FailedPublishedItemStatusError(msg, logger) from e
 
 
-def unpublish_shortcuts(fabric_workspace_obj: FabricWorkspace, item_obj: Item, shortcut_paths: list) -> None:
+def unpublish_shortcut(fabric_workspace_obj: FabricWorkspace, item_obj: Item, shortcut_path: str) -> None:
     """
-    Unpublishes all shortcuts defined in the list.
+    Unpublishes a deployed shortcut.
 
     Args:
         fabric_workspace_obj: The FabricWorkspace object containing the items to be published
-        item_obj: The item object to publish shortcuts for
-        shortcut_paths: The list of shortcut paths to unpublish
+        item_obj: The item object to unpublish the shortcut for
+        shortcut_path: The path of the shortcut to unpublish
     """
-    for deployed_shortcut_path in shortcut_paths:
-        # https://learn.microsoft.com/en-us/rest/api/fabric/core/onelake-shortcuts/delete-shortcut
-        fabric_workspace_obj.endpoint.invoke(
-            method="DELETE",
-            url=f"{fabric_workspace_obj.base_api_url}/items/{item_obj.guid}/shortcuts/{deployed_shortcut_path}",
+    # https://learn.microsoft.com/en-us/rest/api/fabric/core/onelake-shortcuts/delete-shortcut
+    fabric_workspace_obj.endpoint.invoke(
+        method="DELETE",
+        url=f"{fabric_workspace_obj.base_api_url}/items/{item_obj.guid}/shortcuts/{shortcut_path}",
+    )
+
+
+def _is_shortcut_current(shortcut: any, deployed_shortcut: any) -> bool:
+    """
+    Checks if a deployed shortcut has the definition of the repository.
+
+    The definitions must be equal at every level, so a field removed from the repository is a change. Only the fields
+    of constants.SHORTCUT_API_FIELDS the API adds with a null value are ignored.
+
+    Args:
+        shortcut: The shortcut definition of the repository, or a value within it.
+        deployed_shortcut: The deployed shortcut definition, see list_deployed_shortcuts, or a value within it.
+    """
+    if isinstance(shortcut, dict) and isinstance(deployed_shortcut, dict):
+        added_fields = deployed_shortcut.keys() - shortcut.keys()
+        if any(key not in constants.SHORTCUT_API_FIELDS or deployed_shortcut[key] is not None for key in added_fields):
+            return False
+        return all(
+            key in deployed_shortcut and _is_shortcut_current(value, deployed_shortcut[key])
+            for key, value in shortcut.items()
+        )
+    if isinstance(shortcut, list) and isinstance(deployed_shortcut, list):
+        return len(shortcut) == len(deployed_shortcut) and all(
+            _is_shortcut_current(value, deployed_value) for value, deployed_value in zip(shortcut, deployed_shortcut)
         )
+    return shortcut == deployed_shortcut
 
 
-def list_deployed_shortcuts(fabric_workspace_obj: FabricWorkspace, item_obj: Item) -> list:
+def list_deployed_shortcuts(fabric_workspace_obj: FabricWorkspace, item_obj: Item) -> dict[str, dict]:
     """
-    Lists all deployed shortcut paths
+    Lists all deployed shortcuts, by shortcut path
 
     Args:
         fabric_workspace_obj: The FabricWorkspace object containing the items to be published
         item_obj: The item object to list the shortcuts for
     """
     request_url = f"{fabric_workspace_obj.base_api_url}/items/{item_obj.guid}/shortcuts"
-    deployed_shortcut_paths = []
+    deployed_shortcuts = {}
 
     while request_url:
         # https://learn.microsoft.com/en-us/rest/api/fabric/core/onelake-shortcuts/list-shortcuts
@@ -193,8 +306,8 @@ def list_deployed_shortcuts(fabric_workspace_obj: FabricWorkspace, item_obj: Ite
 
         # Handle cases where the response body is empty
         shortcuts = response["body"].get("value", [])
-        deployed_shortcut_paths.extend(f"{shortcut['path']}/{shortcut['name']}" for shortcut in shortcuts)
+        deployed_shortcuts.update({f"{shortcut['path']}/{shortcut['name']}": shortcut for shortcut in shortcuts})
 
         request_url = response["header"].get("continuationUri", None)
 
-    return deployed_shortcut_paths
+    return deployed_shortcuts
@@ -3,13 +3,14 @@
 
 """Functions to process and deploy Report item."""
 
-import json
 import logging
+from functools import partial
 
 from fabric_cicd import FabricWorkspace
 from fabric_cicd._common._exceptions import ItemDependencyError
 from fabric_cicd._common._file import File
 from fabric_cicd._common._item import Item
+from fabric_cicd._common._scheduler import run_concurrently
 
 logger = logging.getLogger(__name__)
 
@@ -23,19 +24,22 @@ def publish_reports(fabric_workspace_obj: FabricWorkspace) -> None:
     """
     item_type = "Report"
 
-    for item_name in fabric_workspace_obj.repository_items.get(item_type, {}):
-        exclude_path = r".*\.pbi[/\\].*"
-        fabric_workspace_obj._publish_item(
-            item_name=item_name,
+    exclude_path = r".*\.pbi[/\\].*"
+    run_concurrently(
+        partial(
+            fabric_workspace_obj._publish_item,
             item_type=item_type,
             exclude_path=exclude_path,
             func_process_file=func_process_file,
-        )
+        ),
+        fabric_workspace_obj.repository_items.get(item_type, {}),
+        fabric_workspace_obj.max_workers,
+    )
 
 
-def func_process_file(workspace_obj: FabricWorkspace, item_obj: Item, file_obj: File) -> str:
+def func_process_file(workspace_obj: FabricWorkspace, item_obj: Item, file_obj: File) -> None:
     """
-    Custom file processing for report items.
+    Custom file processing for report items, the parsed definition.pbir contents are updated in place.
 
     Args:
         workspace_obj: The FabricWorkspace object.
@@ -43,7 +47,7 @@ def func_process_file(workspace_obj: FabricWorkspace, item_obj: Item, file_obj:
         file_obj: The file object.
     """
     if file_obj.name == "definition.pbir":
-        definition_body = json.loads(file_obj.contents)
+        definition_body = file_obj.json_contents
         if (
             "datasetReference" in definition_body
             and "byPath" in definition_body["datasetReference"]
@@ -68,5 +72,4 @@ def func_process_file(workspace_obj: FabricWorkspace, item_obj: Item, file_obj:
                 }
             }
 
-            return json.dumps(definition_body, indent=4)
-    return file_obj.contents
+            file_obj.set_json_contents(definition_body, indent=4)
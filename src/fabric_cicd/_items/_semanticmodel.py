@@ -4,8 +4,10 @@
 """Functions to process and deploy Semantic Model item."""
 
 import logging
+from functools import partial
 
 from fabric_cicd import FabricWorkspace
+from fabric_cicd._common._scheduler import run_concurrently
 
 logger = logging.getLogger(__name__)
 
@@ -19,6 +21,9 @@ def publish_semanticmodels(fabric_workspace_obj: FabricWorkspace) -> None:
     """
     item_type = "SemanticModel"
 
-    for item_name in fabric_workspace_obj.repository_items.get(item_type, {}):
-        exclude_path = r".*\.pbi[/\\].*"
-        fabric_workspace_obj._publish_item(item_name=item_name, item_type=item_type, exclude_path=exclude_path)
+    exclude_path = r".*\.pbi[/\\].*"
+    run_concurrently(
+        partial(fabric_workspace_obj._publish_item, item_type=item_type, exclude_path=exclude_path),
+        fabric_workspace_obj.repository_items.get(item_type, {}),
+        fabric_workspace_obj.max_workers,
+    )
@@ -6,6 +6,7 @@
 import logging
 
 from fabric_cicd import FabricWorkspace, constants
+from fabric_cicd._common._scheduler import run_concurrently
 
 logger = logging.getLogger(__name__)
 
@@ -19,7 +20,7 @@ def publish_sqldatabases(fabric_workspace_obj: FabricWorkspace) -> None:
     """
     item_type = "SQLDatabase"
 
-    for item_name, item in fabric_workspace_obj.repository_items.get(item_type, {}).items():
+    def _publish_sqldatabase(item_name: str) -> None:
         fabric_workspace_obj._publish_item(
             item_name=item_name,
             item_type=item_type,
@@ -27,7 +28,13 @@ def publish_sqldatabases(fabric_workspace_obj: FabricWorkspace) -> None:
         )
 
         # Check if the item is published to avoid any post publish actions
-        if item.skip_publish:
-            continue
+        if fabric_workspace_obj.repository_items[item_type][item_name].skip_publish:
+            return
 
         logger.info(f"{constants.INDENT}Published")
+
+    run_concurrently(
+        _publish_sqldatabase,
+        fabric_workspace_obj.repository_items.get(item_type, {}),
+        fabric_workspace_obj.max_workers,
+    )
@@ -8,6 +8,7 @@ import logging
 
 from fabric_cicd import FabricWorkspace, constants
 from fabric_cicd._common._item import Item
+from fabric_cicd._common._scheduler import run_concurrently
 
 logger = logging.getLogger(__name__)
 
@@ -23,12 +24,16 @@ def publish_variablelibraries(fabric_workspace_obj: FabricWorkspace) -> None:
 
     var_libraries = fabric_workspace_obj.repository_items.get(item_type, {})
 
-    for item_name in var_libraries:
+    def _publish_variablelibrary(item_name: str) -> None:
         fabric_workspace_obj._publish_item(item_name=item_name, item_type=item_type)
         if var_libraries[item_name].skip_publish:
-            continue
+            return
+        # The value set can only be activated once the definition containing it has been updated
+        fabric_workspace_obj._wait_for_pending_operations(item_type=item_type, item_name=item_name)
         activate_value_set(fabric_workspace_obj, var_libraries[item_name])
 
+    run_concurrently(_publish_variablelibrary, var_libraries, fabric_workspace_obj.max_workers)
+
 
 def activate_value_set(fabric_workspace_obj: FabricWorkspace, item_obj: Item) -> None:
     """
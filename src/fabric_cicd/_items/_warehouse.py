@@ -7,6 +7,7 @@ import json
 import logging
 
 from fabric_cicd import FabricWorkspace, constants
+from fabric_cicd._common._scheduler import run_concurrently
 
 logger = logging.getLogger(__name__)
 
@@ -20,7 +21,8 @@ def publish_warehouses(fabric_workspace_obj: FabricWorkspace) -> None:
     """
     item_type = "Warehouse"
 
-    for item_name, item in fabric_workspace_obj.repository_items.get(item_type, {}).items():
+    def _publish_warehouse(item_name: str) -> None:
+        item = fabric_workspace_obj.repository_items[item_type][item_name]
         creation_payload = next(
             (
                 json.loads(file.contents)["metadata"]["creationPayload"]
@@ -39,6 +41,12 @@ def publish_warehouses(fabric_workspace_obj: FabricWorkspace) -> None:
 
         # Check if the item is published to avoid any post publish actions
         if item.skip_publish:
-            continue
+            return
 
         logger.info(f"{constants.INDENT}Published")
+
+    run_concurrently(
+        _publish_warehouse,
+        fabric_workspace_obj.repository_items.get(item_type, {}),
+        fabric_workspace_obj.max_workers,
+    )
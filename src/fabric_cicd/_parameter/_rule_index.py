@@ -0,0 +1,108 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+"""Module provides the ParameterRuleIndex class to look up the parameter rules that apply to a repository file."""
+
+import logging
+from pathlib import Path
+from typing import Optional, Union
+
+from fabric_cicd._parameter._utils import process_input_path
+
+logger = logging.getLogger(__name__)
+
+
+def _to_filter_set(value: Union[str, Path, list, None]) -> Optional[frozenset]:
+    """Returns the values of an optional filter as a set, or None if the filter is not set."""
+    if not value:
+        return None
+    if isinstance(value, list):
+        return frozenset(value)
+    return frozenset([value])
+
+
+class _CompiledRule:
+    """A parameter rule with its item_type, item_name and file_path filters resolved once."""
+
+    def __init__(self, position: int, param_dict: dict, repository_directory: Path) -> None:
+        """
+        Resolves the optional filters of the rule.
+
+        Args:
+            position: The position of the rule in the parameter file, rules are applied in this order.
+            param_dict: The parameter dictionary of the rule.
+            repository_directory: The repository directory, relative file paths are resolved against it.
+        """
+        self.position = position
+        self.param_dict = param_dict
+        self.item_types = _to_filter_set(param_dict.get("item_type"))
+        self.item_names = _to_filter_set(param_dict.get("item_name"))
+        self.file_paths = _to_filter_set(process_input_path(repository_directory, param_dict.get("file_path")))
+
+    def matches(self, item_type: str, item_name: str, file_path: Path) -> bool:
+        """Checks the filters of the rule, same conditions as _parameter._utils.check_replacement."""
+        return (
+            (self.item_types is None or item_type in self.item_types)
+            and (self.item_names is None or item_name in self.item_names)
+            and (self.file_paths is None or file_path in self.file_paths)
+        )
+
+
+class ParameterRuleIndex:
+    """
+    The rules of a parameter, e.g. find_replace, indexed by their most selective filter.
+
+    A rule with a file_path filter is indexed by its file paths, otherwise by its item names, otherwise by its item
+    types. A file only checks the rules of its own path, name and type plus the rules without filters, instead of
+    every rule of the parameter file.
+    """
+
+    def __init__(self, rules: list[dict], repository_directory: Path) -> None:
+        """
+        Compiles and indexes the rules.
+
+        Args:
+            rules: The parameter dictionaries of the rules, in parameter file order.
+            repository_directory: The repository directory, relative file paths are resolved against it.
+        """
+        self._unfiltered = []
+        self._by_file_path = {}
+        self._by_item_name = {}
+        self._by_item_type = {}
+
+        for position, param_dict in enumerate(rules or []):
+            rule = _CompiledRule(position, param_dict, repository_directory)
+            if rule.file_paths is not None:
+                index, keys = self._by_file_path, rule.file_paths
+            elif rule.item_names is not None:
+                index, keys = self._by_item_name, rule.item_names
+            elif rule.item_types is not None:
+                index, keys = self._by_item_type, rule.item_types
+            else:
+                self._unfiltered.append(rule)
+                continue
+
+            for key in keys:
+                index.setdefault(key, []).append(rule)
+
+    def get_rules(self, item_type: str, item_name: str, file_path: Path) -> list[dict]:
+        """
+        Returns the parameter dictionaries of the rules applied to a file, in parameter file order.
+
+        Args:
+            item_type: Type of the item the file belongs to.
+            item_name: Name of the item the file belongs to.
+            file_path: The path of the file.
+        """
+        candidates = [
+            *self._unfiltered,
+            *self._by_file_path.get(file_path, ()),
+            *self._by_item_name.get(item_name, ()),
+            *self._by_item_type.get(item_type, ()),
+        ]
+        # A rule is indexed under a single filter, so it is found at most once per file
+        rules = sorted(
+            (rule for rule in candidates if rule.matches(item_type, item_name, file_path)),
+            key=lambda rule: rule.position,
+        )
+        return [rule.param_dict for rule in rules]
@@ -11,10 +11,12 @@ import json
 import logging
 import os
 import re
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional, Union
 
 from azure.core.credentials import TokenCredential
+from jsonpath_ng import JSONPath
 from jsonpath_ng.ext import parse
 
 import fabric_cicd.constants as constants
@@ -91,8 +93,28 @@ def _extract_item_attribute(workspace_obj: FabricWorkspace, variable: str) -> st
         item_name = var_parts[1].strip()
         attribute = var_parts[2].strip()
 
-        # Refresh the workspace items to get the latest deployed items
-        workspace_obj._refresh_deployed_items()
+        # Values resolved earlier in the run are reused until the item they belong to is created or deleted
+        cache_key = (item_type, item_name, attribute.lower())
+        cached_value = workspace_obj._item_attribute_cache.get(cache_key)
+        if cached_value is not None:
+            logger.debug(f"$items cache hit for '{variable}'")
+            return cached_value
+        logger.debug(f"$items cache miss for '{variable}'")
+
+        # The deployed items are kept up to date during the run, only list them if needed
+        workspace_obj._refresh_deployed_items_if_stale()
+
+        # Validate the attribute is supported
+        attr_name = attribute.lower()
+        if attr_name not in constants.ITEM_ATTR_LOOKUP:
+            msg = f"Attribute '{attribute}' is an invalid item attribute, use one of the following: {constants.ITEM_ATTR_LOOKUP}"
+            raise InputError(msg, logger)
+
+        # Items created by the deployment plan being recorded have no attributes yet
+        if item_name not in workspace_obj.workspace_items.get(item_type, {}):
+            planned_id = workspace_obj._get_planned_item_id(item_type, item_name)
+            if planned_id is not None:
+                return planned_id
 
         # Validate items exist in the workspace
         if item_type not in workspace_obj.workspace_items:
@@ -105,12 +127,10 @@ def _extract_item_attribute(workspace_obj: FabricWorkspace, variable: str) -> st
 
         # Get the item's attributes and look for the provided attribute
         item_attr = workspace_obj.workspace_items[item_type][item_name]
-        attr_name = attribute.lower()
 
-        # Validate the attribute is supported
-        if attr_name not in constants.ITEM_ATTR_LOOKUP:
-            msg = f"Attribute '{attribute}' is an invalid item attribute, use one of the following: {constants.ITEM_ATTR_LOOKUP}"
-            raise InputError(msg, logger)
+        # SQL endpoints are not listed with the workspace items, resolve them on first use
+        if attr_name == "sqlendpoint" and item_attr.get(attr_name) is None:
+            workspace_obj._resolve_sql_endpoints()
 
         # Get the attribute value and check if it exists
         attr_value = item_attr.get(attr_name)
@@ -119,6 +139,7 @@ def _extract_item_attribute(workspace_obj: FabricWorkspace, variable: str) -> st
             raise InputError(msg, logger)
 
         logger.debug(f"Found attribute '{attr_name}' with value '{attr_value}'")
+        workspace_obj._item_attribute_cache[cache_key] = attr_value
         return attr_value
 
     except Exception as e:
@@ -143,23 +164,53 @@ def replace_key_value(param_dict: dict, json_content: str, env: str) -> Union[di
         json_content: the JSON content to be modified.
         env: The environment variable to be used for replacement.
     """
+    return replace_key_values([param_dict], json_content, env)
+
+
+def replace_key_values(param_dicts: list[dict], json_content: str, env: str) -> str:
+    """Applies several key_value_replace parameters to a JSON, in order. The JSON is parsed and serialized only once.
+
+    Args:
+        param_dicts: The parameter dictionaries, in parameter file order.
+        json_content: the JSON content to be modified.
+        env: The environment variable to be used for replacement.
+    """
     # Try to load the json content to a dictionary
     try:
         data = json.loads(json_content)
     except json.JSONDecodeError as jde:
         raise ValueError(jde) from jde
 
-    # Extract the jsonpath expression from the find_key attribute of the param_dict
-    jsonpath_expr = parse(param_dict["find_key"])
-    for match in jsonpath_expr.find(data):
-        # If the env is present in the replace_value array perform the replacement
-        if env in param_dict["replace_value"]:
+    return json.dumps(apply_key_values(param_dicts, data, env))
+
+
+def apply_key_values(param_dicts: list[dict], data: any, env: str) -> any:
+    """Applies several key_value_replace parameters to a parsed JSON, in order, and returns the updated JSON.
+
+    Args:
+        param_dicts: The parameter dictionaries, in parameter file order.
+        data: The parsed JSON content to be modified, updated in place.
+        env: The environment variable to be used for replacement.
+    """
+    for param_dict in param_dicts:
+        # If the env is not present in the replace_value array, there is nothing to replace
+        if env not in param_dict["replace_value"]:
+            continue
+
+        # Find the matches with the jsonpath expression of the find_key attribute, compiled once per run
+        for match in _parse_json_path(param_dict["find_key"]).find(data):
             try:
                 match.full_path.update(data, param_dict["replace_value"][env])
             except Exception as match_e:
                 raise ValueError(match_e) from match_e
 
-    return json.dumps(data)
+    return data
+
+
+@lru_cache(maxsize=constants.JSON_PATH_CACHE_SIZE)
+def _parse_json_path(find_key: str) -> JSONPath:
+    """Compiles a jsonpath expression, the most recently used expressions are only compiled once."""
+    return parse(find_key)
 
 
 def replace_variables_in_parameter_file(raw_file: str) -> str:
@@ -6,11 +6,38 @@
 # General
 VERSION = "0.1.23"
 DEFAULT_WORKSPACE_ID = "00000000-0000-0000-0000-000000000000"
+# Stands in for the id of an item a deployment plan creates, while the plan is recorded
+PLANNED_ITEM_ID = "ffffffff-ffff-ffff-ffff-ffffffffffff"
 DEFAULT_API_ROOT_URL = "https://api.powerbi.com"
 FABRIC_API_ROOT_URL = "https://api.fabric.microsoft.com"
 FEATURE_FLAG = set()
 USER_AGENT = f"ms-fabric-cicd/{VERSION}"
 
+# HTTP Connection Pooling
+HTTP_POOL_CONNECTIONS = 10  # Number of per-host connection pools to cache
+HTTP_POOL_MAXSIZE = 10  # Maximum number of keep-alive connections to save per host
+
+# Rate Limiting
+# Requests per second and burst size allowed per API route family, shared by every thread of the process. Fabric does
+# not document its limits, these are conservative defaults: throttled responses still pause the route for their
+# Retry-After. Override before creating a FabricWorkspace to tune, e.g.
+# >>> constants.RATE_LIMITS["items"] = (20, 40)
+RATE_LIMITS = {
+    "items": (10, 20),
+    "folders": (5, 10),
+    "environments": (5, 10),
+    "lakehouses": (5, 10),
+    "shortcuts": (5, 10),
+    "default": (10, 20),
+}
+RATE_LIMIT_MAX_RETRIES = 5  # Maximum number of throttled responses retried for a single call
+RATE_LIMIT_BASE_DELAY = 10  # Base delay of the throttling backoff when the response has no Retry-After
+
+# Long-Running Operations
+LRO_INITIAL_DELAY = 1  # Seconds before the first status check when the response has no Retry-After
+LRO_BASE_DELAY = 0.5  # Base delay of the status check backoff when the response has no Retry-After
+LRO_MAX_DELAY = 60  # Maximum delay between status checks when the response has no Retry-After
+
 # Item Type
 ACCEPTED_ITEM_TYPES_UPN = (
     "DataPipeline",
@@ -37,9 +64,61 @@ ACCEPTED_ITEM_TYPES_NON_UPN = ACCEPTED_ITEM_TYPES_UPN
 
 # Publish
 SHELL_ONLY_PUBLISH = ["Environment", "Lakehouse", "Warehouse", "SQLDatabase"]
+DEFAULT_MAX_WORKERS = 1  # Items and item types are published one at a time unless max_workers is raised
+REPOSITORY_SCAN_MAX_WORKERS = 8  # Item directories parsed at the same time when scanning the repository
+REPOSITORY_SCAN_INDEX_PATH = ".fabric-cicd/scan_index.json"  # Relative to the repository directory
+PAYLOAD_CHUNK_SIZE = 3 * 256 * 1024  # Bytes of a definition part base64 encoded at a time, a multiple of 3
+
+# Item types for which Fabric creates or deletes other items, e.g. the default KQL Database of an Eventhouse or the
+# SQL analytics endpoint of a Lakehouse. The deployed items are listed again after such an item is created or deleted.
+ITEM_TYPES_WITH_IMPLICIT_ITEMS = ["Eventhouse", "Lakehouse", "MirroredDatabase", "SQLDatabase", "Warehouse"]
+
+# Item types that must be published before the given item type, as the item type can reference them
+# through a logical ID, a $items parameter variable or a name lookup. Item types without a dependency
+# between them are published at the same time when max_workers is greater than 1.
+PUBLISH_ITEM_TYPE_DEPENDENCIES = {
+    "VariableLibrary": [],
+    "Warehouse": [],
+    "Lakehouse": [],
+    "SQLDatabase": [],
+    "MirroredDatabase": [],
+    "Environment": [],
+    "Notebook": ["VariableLibrary", "Warehouse", "Lakehouse", "SQLDatabase", "MirroredDatabase", "Environment"],
+    "SemanticModel": ["Warehouse", "Lakehouse", "SQLDatabase", "MirroredDatabase"],
+    "Report": ["SemanticModel"],
+    "CopyJob": ["Warehouse", "Lakehouse", "SQLDatabase", "MirroredDatabase"],
+    "Eventhouse": [],
+    "KQLDatabase": ["Eventhouse"],
+    "KQLQueryset": ["KQLDatabase"],
+    "Reflex": ["Lakehouse", "Notebook", "Eventhouse", "KQLDatabase"],
+    "Eventstream": ["Lakehouse", "Eventhouse", "KQLDatabase", "Reflex"],
+    "KQLDashboard": ["KQLDatabase"],
+    "Dataflow": ["VariableLibrary", "Warehouse", "Lakehouse", "SQLDatabase", "MirroredDatabase"],
+    "DataPipeline": [
+        "VariableLibrary",
+        "Warehouse",
+        "Lakehouse",
+        "SQLDatabase",
+        "MirroredDatabase",
+        "Environment",
+        "Notebook",
+        "SemanticModel",
+        "Report",
+        "CopyJob",
+        "Eventhouse",
+        "KQLDatabase",
+        "KQLQueryset",
+        "Reflex",
+        "Eventstream",
+        "KQLDashboard",
+        "Dataflow",
+    ],
+    "GraphQLApi": ["Warehouse", "Lakehouse", "SQLDatabase", "MirroredDatabase"],
+}
 
 # REGEX Constants
 VALID_GUID_REGEX = r"^[a-fA-F0-9]{8}-[a-fA-F0-9]{4}-[a-fA-F0-9]{4}-[a-fA-F0-9]{4}-[a-fA-F0-9]{12}$"
+GUID_TOKEN_REGEX = r"[a-fA-F0-9]{8}-[a-fA-F0-9]{4}-[a-fA-F0-9]{4}-[a-fA-F0-9]{4}-[a-fA-F0-9]{12}"
 WORKSPACE_ID_REFERENCE_REGEX = r'\"?(default_lakehouse_workspace_id|workspaceId|workspace)\"?\s*[:=]\s*\"(.*?)\"'
 DATAFLOW_ID_REFERENCE_REGEX = r'(dataflowId)\s*=\s*"(.*?)"'
 INVALID_FOLDER_CHAR_REGEX = r'[~"#.%&*:<>?/\\{|}]'
@@ -52,9 +131,17 @@ DATA_PIPELINE_ACTIVITY_TYPES = {
     "PBISemanticModelRefresh": ["groupId", "SemanticModel", "datasetId", "semanticModels"],
 }
 
+# Fields the API adds to the spark compute settings of an Environment, ignored when they are not set in the repository.
+# Paths are key tuples, e.g. the id of an instance pool referenced by name and type.
+ENVIRONMENT_COMPUTE_API_FIELDS = [("instancePool", "id")]
+# Fields the API adds with a null value at any level of a OneLake shortcut, ignored when they are not set in the
+# repository, e.g. the connection of a OneLake target.
+SHORTCUT_API_FIELDS = ["connectionId"]
+
 # Parameter file configs
 PARAMETER_FILE_NAME = "parameter.yml"
 ITEM_ATTR_LOOKUP = ["id", "sqlendpoint"]
+JSON_PATH_CACHE_SIZE = 256  # Number of compiled key_value_replace JSONPath expressions kept for reuse
 
 # Parameter file validation messages
 INVALID_YAML = {"char": "Invalid characters found", "quote": "Unclosed quote: {}"}
@@ -7,8 +7,11 @@ import json
 import logging
 import os
 import re
+import threading
+from concurrent.futures import Future
+from functools import partial
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional
 
 import dpath
 from azure.core.credentials import TokenCredential
@@ -16,10 +19,17 @@ from azure.identity import DefaultAzureCredential
 
 from fabric_cicd import constants
 from fabric_cicd._common._check_utils import check_regex
+from fabric_cicd._common._definition_body import DefinitionBody
+from fabric_cicd._common._deployment_manifest import hash_payload
 from fabric_cicd._common._exceptions import InputError, ParameterFileError, ParsingError
 from fabric_cicd._common._fabric_endpoint import FabricEndpoint
+from fabric_cicd._common._file import File
+from fabric_cicd._common._file_transforms import JSON, TEXT, FileTransform, TransformTimings, run_file_transforms
 from fabric_cicd._common._item import Item
+from fabric_cicd._common._item_registry import ItemRegistry
 from fabric_cicd._common._logging import print_header
+from fabric_cicd._common._scan_index import ScanIndex
+from fabric_cicd._common._scheduler import run_concurrently
 
 logger = logging.getLogger(__name__)
 
@@ -100,14 +110,19 @@ class FabricWorkspace:
             validate_workspace_name,
         )
 
-        # Initialize endpoint
-        self.endpoint = FabricEndpoint(
-            # if credential is not defined, use DefaultAzureCredential
-            token_credential=(
-                # CodeQL [SM05139] Public library needing to have a default auth when user doesn't provide token. Not internal Azure product.
-                DefaultAzureCredential() if token_credential is None else validate_token_credential(token_credential)
+        # Initialize endpoint, unless shared by the workspaces of a multi-workspace deployment
+        if kwargs.get("endpoint") is not None:
+            self.endpoint = kwargs["endpoint"]
+        else:
+            self.endpoint = FabricEndpoint(
+                # if credential is not defined, use DefaultAzureCredential
+                token_credential=(
+                    # CodeQL [SM05139] Public library needing to have a default auth when user doesn't provide token. Not internal Azure product.
+                    DefaultAzureCredential()
+                    if token_credential is None
+                    else validate_token_credential(token_credential)
+                )
             )
-        )
 
         # Set workspace_id class variable
         if workspace_id:
@@ -123,10 +138,35 @@ class FabricWorkspace:
         self.item_type_in_scope = validate_item_type_in_scope(item_type_in_scope, upn_auth=self.endpoint.upn_auth)
         self.environment = validate_environment(environment)
         self.publish_item_name_exclude_regex = None
+        self.max_workers = constants.DEFAULT_MAX_WORKERS
         self.repository_folders = {}
         self.repository_items = {}
         self.deployed_folders = {}
         self.deployed_items = {}
+        self.workspace_items = {}
+        self._item_attribute_cache = {}
+        self._deployed_items_stale = True
+        self._deployed_items_lock = threading.RLock()
+        self.deployment_manifest = None
+        self.deployment_plan = None
+        self._planned_references = threading.local()
+        self._id_tokenizer = None
+        self._logical_id_lookup = {}
+        self._repository_registry = None
+        self._deployed_registry = None
+        self._parameter_rules = {}
+        self._parameter_rules_source = None
+        self.transform_timings = TransformTimings()
+        self._scan_index = None
+        self._repository_walk = None
+        self._repository_scan = kwargs.get("repository_scan")
+        self.force_publish = False
+        self._pending_operations = []
+        self._pending_operations_lock = threading.Lock()
+        self.environment_publishes = {}
+        # The number of items created or updated, and of items left unchanged as per the deployment manifest
+        self.publish_counts = {"published": 0, "unchanged": 0}
+        self._publish_counts_lock = threading.Lock()
 
         # temporarily support base_api_url until deprecated
         if "base_api_url" in kwargs:
@@ -175,72 +215,40 @@ class FabricWorkspace:
     def _refresh_repository_items(self) -> None:
         """Refreshes the repository_items dictionary by scanning the repository directory."""
         self.repository_items = {}
+        self._id_tokenizer = None
+        self._repository_registry = None
         empty_logical_id_paths = []  # Collect all paths with empty logical IDs
 
-        for root, _dirs, files in os.walk(self.repository_directory):
-            directory = Path(root)
-            # valid item directory with .platform file within
-            if ".platform" in files:
-                item_metadata_path = directory / ".platform"
+        # A repository deployed to several workspaces is parsed once, each workspace deploys its own copy of the items
+        if self._repository_scan is not None:
+            scanned_items = self._repository_scan.get_items(self._scan_repository_items)
+        else:
+            scanned_items = self._scan_repository_items()
 
-                # Print a warning and skip directory if empty
-                if not any(directory.iterdir()):
-                    logger.warning(f"Directory {directory.name} is empty.")
-                    continue
+        for directory, item in scanned_items:
+            if item is None:
+                continue
 
-                # Attempt to read metadata file
-                try:
-                    with Path.open(item_metadata_path, encoding="utf-8") as file:
-                        item_metadata = json.load(file)
-                except FileNotFoundError as e:
-                    msg = f"{item_metadata_path} path does not exist in the specified repository. {e}"
-                    ParsingError(msg, logger)
-                except json.JSONDecodeError as e:
-                    msg = f"Error decoding JSON in {item_metadata_path}. {e}"
-                    ParsingError(msg, logger)
-
-                # Ensure required metadata fields are present
-                if "type" not in item_metadata["metadata"] or "displayName" not in item_metadata["metadata"]:
-                    msg = f"displayName & type are required in {item_metadata_path}"
-                    raise ParsingError(msg, logger)
-
-                item_type = item_metadata["metadata"]["type"]
-                item_description = item_metadata["metadata"].get("description", "")
-                item_name = item_metadata["metadata"]["displayName"]
-                item_logical_id = item_metadata["config"]["logicalId"]
-                
-                # Check for empty logical ID and collect the path
-                if not item_logical_id or item_logical_id.strip() == "":
-                    empty_logical_id_paths.append(str(item_metadata_path))
-                    continue  # Skip processing this item further
-                
-                item_path = directory
-                relative_path = f"/{directory.relative_to(self.repository_directory).as_posix()}"
-                relative_parent_path = "/".join(relative_path.split("/")[:-1])
-                if "disable_workspace_folder_publish" not in constants.FEATURE_FLAG:
-                    item_folder_id = self.repository_folders.get(relative_parent_path, "")
-                else:
-                    item_folder_id = ""
+            # Check for empty logical ID and collect the path
+            if not item.logical_id:
+                empty_logical_id_paths.append(str(directory / ".platform"))
+                continue  # Skip processing this item further
 
-                # Get the GUID if the item is already deployed
-                item_guid = self.deployed_items.get(item_type, {}).get(item_name, Item("", "", "", "")).guid
+            if self._repository_scan is not None:
+                item = item.copy()
 
-                if item_type not in self.repository_items:
-                    self.repository_items[item_type] = {}
+            if "disable_workspace_folder_publish" not in constants.FEATURE_FLAG:
+                item.folder_id = self.repository_folders.get(self._get_folder_path(directory), "")
 
-                # Add the item to the repository_items dictionary
-                self.repository_items[item_type][item_name] = Item(
-                    type=item_type,
-                    name=item_name,
-                    description=item_description,
-                    guid=item_guid,
-                    logical_id=item_logical_id,
-                    path=item_path,
-                    folder_id=item_folder_id,
-                )
+            # Get the GUID if the item is already deployed
+            item.guid = self.deployed_items.get(item.type, {}).get(item.name, Item("", "", "", "")).guid
+
+            if item.type not in self.repository_items:
+                self.repository_items[item.type] = {}
+
+            # Add the item to the repository_items dictionary
+            self.repository_items[item.type][item.name] = item
 
-                self.repository_items[item_type][item_name].collect_item_files()
-        
         # If we found any empty logical IDs, raise an error with all paths
         if empty_logical_id_paths:
             if len(empty_logical_id_paths) == 1:
@@ -250,44 +258,165 @@ class FabricWorkspace:
                 msg = f"logicalId cannot be empty in the following files:\n  - {paths_list}"
             raise ParsingError(msg, logger)
 
+    def _scan_repository_items(self) -> list[tuple[Path, Optional[Item]]]:
+        """Returns every item directory of the repository with the item parsed from it, in the os.walk order."""
+        walk = self._walk_repository()
+        # valid item directory with .platform file within, with the part of the walk listing its files. os.walk lists
+        # the subdirectories of a directory right after it, so the item files are collected without walking again
+        item_walks = {}
+        for index, (directory, _dirs, files) in enumerate(walk):
+            if ".platform" not in files:
+                continue
+            end = index + 1
+            while end < len(walk) and walk[end][0].is_relative_to(directory):
+                end += 1
+            item_walks[directory] = walk[index:end]
+        item_directories = list(item_walks)
+
+        if "enable_repository_scan_index" in constants.FEATURE_FLAG:
+            if self._scan_index is None:
+                self._scan_index = ScanIndex(
+                    self.repository_directory / constants.REPOSITORY_SCAN_INDEX_PATH, self.repository_directory
+                )
+            self._scan_index.start_scan()
+
+        # Item directories are scanned concurrently and merged in the os.walk order, so the result is deterministic
+        scanned_items = run_concurrently(
+            lambda directory: self._scan_item_directory(directory, item_walks[directory]),
+            item_directories,
+            constants.REPOSITORY_SCAN_MAX_WORKERS,
+        )
+        self._save_scan_index()
+
+        return list(zip(item_directories, scanned_items))
+
+    def _scan_item_directory(
+        self, directory: Path, walk: Optional[list[tuple[Path, list[str], list[str]]]] = None
+    ) -> Optional[Item]:
+        """
+        Parses the .platform file of an item directory and collects the item files.
+
+        Returns None for an empty directory, and an item without logical ID or files when the logical ID is empty.
+        The GUID and folder of the item in the target workspace are set by _refresh_repository_items.
+
+        Args:
+            directory: The item directory containing the .platform file.
+            walk: The item directory and its subdirectories from the repository walk. Defaults to walking the item
+                directory again.
+        """
+        item_metadata_path = directory / ".platform"
+
+        # Print a warning and skip directory if empty
+        if not any(directory.iterdir()):
+            logger.warning(f"Directory {directory.name} is empty.")
+            return None
+
+        # Attempt to read metadata file, unless unchanged since it was recorded in the scan index
+        item_metadata = self._scan_index.get(item_metadata_path, "metadata") if self._scan_index else None
+        if item_metadata is None:
+            try:
+                with Path.open(item_metadata_path, encoding="utf-8") as file:
+                    item_metadata = json.load(file)
+            except FileNotFoundError as e:
+                msg = f"{item_metadata_path} path does not exist in the specified repository. {e}"
+                raise ParsingError(msg, logger) from e
+            except json.JSONDecodeError as e:
+                msg = f"Error decoding JSON in {item_metadata_path}. {e}"
+                raise ParsingError(msg, logger) from e
+
+            if self._scan_index:
+                self._scan_index.set(item_metadata_path, "metadata", item_metadata)
+
+        # Ensure required metadata fields are present
+        if "type" not in item_metadata["metadata"] or "displayName" not in item_metadata["metadata"]:
+            msg = f"displayName & type are required in {item_metadata_path}"
+            raise ParsingError(msg, logger)
+
+        item_type = item_metadata["metadata"]["type"]
+        item_description = item_metadata["metadata"].get("description", "")
+        item_name = item_metadata["metadata"]["displayName"]
+        item_logical_id = item_metadata["config"]["logicalId"]
+
+        if not item_logical_id or item_logical_id.strip() == "":
+            return Item(type=item_type, name=item_name, description=item_description, guid="", logical_id="")
+
+        item = Item(
+            type=item_type,
+            name=item_name,
+            description=item_description,
+            guid="",
+            logical_id=item_logical_id,
+            path=directory,
+        )
+        item.collect_item_files(self._scan_index, walk)
+
+        return item
+
+    def _get_folder_path(self, directory: Path) -> str:
+        """
+        Returns the repository folder of an item directory, e.g. /Notebooks, or an empty string at the root.
+
+        Args:
+            directory: The item directory.
+        """
+        relative_path = f"/{directory.relative_to(self.repository_directory).as_posix()}"
+        return "/".join(relative_path.split("/")[:-1])
+
+    def _save_scan_index(self) -> None:
+        """Saves the repository scan index, when enabled, with the file types detected since the last save."""
+        if self._scan_index is not None:
+            self._scan_index.save()
+
     def _refresh_deployed_items(self) -> None:
-        """Refreshes the deployed_items dictionary by querying the Fabric workspace items API."""
+        """
+        Refreshes the deployed_items dictionary by querying the Fabric workspace items API.
+
+        Between refreshes, the dictionary is kept up to date by the items created, moved and deleted by fabric-cicd.
+        """
+        # Deltas recorded while the workspace is listed wait for the new dictionaries, so none of them are lost
+        with self._deployed_items_lock:
+            self._list_deployed_items()
+
+    def _refresh_deployed_items_if_stale(self) -> None:
+        """Refreshes the deployed_items dictionary if it was never listed, or Fabric created or deleted items itself."""
+        with self._deployed_items_lock:
+            if self._deployed_items_stale:
+                self._list_deployed_items()
+
+    def _list_deployed_items(self) -> None:
+        """Lists the workspace items into new deployed_items and workspace_items dictionaries."""
         # Get all items in workspace
         # https://learn.microsoft.com/en-us/rest/api/fabric/core/items/get-item
         response = self.endpoint.invoke(method="GET", url=f"{self.base_api_url}/items")
+        self._set_deployed_items(response["body"]["value"])
 
-        self.deployed_items = {}
-        self.workspace_items = {}
+    def _set_deployed_items(self, items: list[dict]) -> None:
+        """
+        Replaces the deployed_items and workspace_items dictionaries with the given items.
+
+        Args:
+            items: The workspace items, as listed by the items API.
+        """
+        # Build new dictionaries and swap them in at the end, so concurrent publishers never see a partial refresh
+        deployed_items = {}
+        workspace_items = {}
 
-        for item in response["body"]["value"]:
+        for item in items:
             item_type = item["type"]
-            item_description = item["description"]
+            item_description = item.get("description", "")
             item_name = item["displayName"]
             item_guid = item["id"]
             item_folder_id = item.get("folderId", "")
-            sql_endpoint = ""
 
             # Add an empty dictionary if the item type hasn't been added yet
-            if item_type not in self.deployed_items:
-                self.deployed_items[item_type] = {}
+            if item_type not in deployed_items:
+                deployed_items[item_type] = {}
 
-            if item_type not in self.workspace_items:
-                self.workspace_items[item_type] = {}
-
-            # Get additional properties based on item type
-            if item_type == "Lakehouse":
-                lakehouse_response = self.endpoint.invoke(
-                    method="GET", url=f"{self.base_api_url}/lakehouses/{item_guid}"
-                )
-                # Use dpath.get for safe nested property access
-                sql_endpoint = dpath.get(
-                    lakehouse_response, "body/properties/sqlEndpointProperties/connectionString", default=""
-                )
-                if not sql_endpoint:
-                    logger.debug(f"Failed to get SQL endpoint for Lakehouse '{item_name}'")
+            if item_type not in workspace_items:
+                workspace_items[item_type] = {}
 
             # Add item details to the deployed_items dictionary
-            self.deployed_items[item_type][item_name] = Item(
+            deployed_items[item_type][item_name] = Item(
                 type=item_type,
                 name=item_name,
                 description=item_description,
@@ -296,7 +425,117 @@ class FabricWorkspace:
             )
 
             # Add item details to the workspace_items dictionary required for parameterization (public-facing attributes)
-            self.workspace_items[item_type][item_name] = {"id": item_guid, "sqlendpoint": sql_endpoint}
+            # The SQL endpoint of a Lakehouse is resolved on first use, see _resolve_sql_endpoints
+            workspace_items[item_type][item_name] = {
+                "id": item_guid,
+                "sqlendpoint": None if item_type == "Lakehouse" else "",
+            }
+
+        self.deployed_items = deployed_items
+        self.workspace_items = workspace_items
+        self._deployed_registry = None
+        self._item_attribute_cache = {}
+        self._deployed_items_stale = False
+
+    def _record_deployed_item(self, item: Item) -> None:
+        """
+        Adds an item created by fabric-cicd to the deployed items.
+
+        Args:
+            item: The created item, with its GUID.
+        """
+        with self._deployed_items_lock:
+            deployed_item = Item(
+                type=item.type,
+                name=item.name,
+                description=item.description,
+                guid=item.guid,
+                folder_id=item.folder_id,
+            )
+            previous_item = self.deployed_items.setdefault(item.type, {}).get(item.name)
+            self.deployed_items[item.type][item.name] = deployed_item
+            if self._deployed_registry is not None:
+                if previous_item is not None:
+                    self._deployed_registry.remove(previous_item)
+                self._deployed_registry.add(deployed_item)
+            self.workspace_items.setdefault(item.type, {})[item.name] = {
+                "id": item.guid,
+                "sqlendpoint": None if item.type == "Lakehouse" else "",
+            }
+            self._forget_item_attributes(item.type, item.name)
+            if item.type in constants.ITEM_TYPES_WITH_IMPLICIT_ITEMS:
+                self._deployed_items_stale = True
+
+    def _resolve_sql_endpoints(self) -> None:
+        """
+        Resolves the SQL endpoint of the deployed Lakehouses not resolved yet, with a single list lakehouses call.
+
+        SQL endpoints are only needed by $items.Lakehouse.<name>.sqlendpoint parameter variables, so they are resolved
+        on first use and kept until the deployed items are listed again. A SQL endpoint not provisioned yet is left
+        unresolved, so that a later use retries.
+        """
+        with self._deployed_items_lock:
+            unresolved = {
+                attributes["id"]: (item_name, attributes)
+                for item_name, attributes in self.workspace_items.get("Lakehouse", {}).items()
+                if attributes["sqlendpoint"] is None
+            }
+        if not unresolved:
+            return
+
+        # List the lakehouses outside of the lock, so that concurrent publishes are not blocked on the API calls
+        sql_endpoints = {}
+        request_url = f"{self.base_api_url}/lakehouses"
+        while request_url:
+            # https://learn.microsoft.com/en-us/rest/api/fabric/lakehouse/items/list-lakehouses
+            response = self.endpoint.invoke(method="GET", url=request_url)
+
+            for lakehouse in response["body"].get("value", []):
+                if lakehouse["id"] in unresolved:
+                    # Use dpath.get for safe nested property access
+                    sql_endpoints[lakehouse["id"]] = dpath.get(
+                        lakehouse, "properties/sqlEndpointProperties/connectionString", default=""
+                    )
+
+            request_url = response["header"].get("continuationUri", None)
+
+        with self._deployed_items_lock:
+            for item_id, (item_name, attributes) in unresolved.items():
+                sql_endpoint = sql_endpoints.get(item_id)
+                if not sql_endpoint:
+                    logger.debug(f"Failed to get SQL endpoint for Lakehouse '{item_name}'")
+                    continue
+                # Skip the Lakehouses redeployed or deleted while listing
+                if self.workspace_items.get("Lakehouse", {}).get(item_name) is attributes:
+                    attributes["sqlendpoint"] = sql_endpoint
+
+    def _forget_deployed_item(self, item_type: str, item_name: str) -> None:
+        """
+        Removes an item deleted by fabric-cicd from the deployed items.
+
+        Args:
+            item_type: Type of the deleted item.
+            item_name: Name of the deleted item.
+        """
+        with self._deployed_items_lock:
+            deployed_item = self.deployed_items.get(item_type, {}).pop(item_name, None)
+            if deployed_item is not None and self._deployed_registry is not None:
+                self._deployed_registry.remove(deployed_item)
+            self.workspace_items.get(item_type, {}).pop(item_name, None)
+            self._forget_item_attributes(item_type, item_name)
+            if item_type in constants.ITEM_TYPES_WITH_IMPLICIT_ITEMS:
+                self._deployed_items_stale = True
+
+    def _forget_item_attributes(self, item_type: str, item_name: str) -> None:
+        """
+        Drops the $items parameter variable values resolved for an item, e.g. once the item has been created again.
+
+        Args:
+            item_type: Type of the item.
+            item_name: Name of the item.
+        """
+        for attribute in constants.ITEM_ATTR_LOOKUP:
+            self._item_attribute_cache.pop((item_type, item_name, attribute), None)
 
     def _replace_logical_ids(self, raw_file: str) -> str:
         """
@@ -305,18 +544,130 @@ class FabricWorkspace:
         Args:
             raw_file: The raw file content where logical IDs need to be replaced.
         """
-        for item_name in self.repository_items.values():
-            for item_details in item_name.values():
-                logical_id = item_details.logical_id
-                item_guid = item_details.guid
+        logical_id_pattern, _, _ = self._get_id_tokenizer()
+        return logical_id_pattern.sub(self._replace_logical_id_match, raw_file)
 
-                if logical_id in raw_file:
-                    if item_guid == "":
-                        msg = f"Cannot replace logical ID '{logical_id}' as referenced item is not yet deployed."
-                        raise ParsingError(msg, logger)
-                    raw_file = raw_file.replace(logical_id, item_guid)
+    def _replace_json_logical_ids(self, file_obj: File) -> None:
+        """
+        Replaces logical IDs with deployed GUIDs in the keys and string values of a parsed JSON file. Same result as
+        _replace_logical_ids on the serialized file, as a logical ID is always within a single JSON string.
 
-        return raw_file
+        Args:
+            file_obj: The File object instance to update.
+        """
+        logical_id_pattern, _, _ = self._get_id_tokenizer()
+
+        def replace(value: any) -> any:
+            if isinstance(value, str):
+                return logical_id_pattern.sub(self._replace_logical_id_match, value)
+            if isinstance(value, dict):
+                return {replace(key): replace(child) for key, child in value.items()}
+            if isinstance(value, list):
+                return [replace(child) for child in value]
+            return value
+
+        file_obj.set_json_contents(replace(file_obj.json_contents), indent=file_obj.json_indent)
+
+    def _replace_ids(self, raw_file: str) -> str:
+        """
+        Replaces logical IDs with deployed GUIDs and the default workspace ID with the target workspace ID in a single
+        pass over the raw file content. Same result as _replace_logical_ids followed by _replace_workspace_ids.
+
+        Args:
+            raw_file: The raw file content where logical and workspace IDs need to be replaced.
+        """
+        logical_id_pattern, id_pattern, workspace_value_group = self._get_id_tokenizer()
+
+        def replace_match(match: re.Match) -> str:
+            if match.group("logical_id") is not None:
+                return self._replace_logical_id_match(match)
+            if match.group(workspace_value_group) == constants.DEFAULT_WORKSPACE_ID:
+                return match.group(0).replace(constants.DEFAULT_WORKSPACE_ID, self.workspace_id)
+            # Non-default workspace references can still contain logical IDs
+            return logical_id_pattern.sub(self._replace_logical_id_match, match.group(0))
+
+        return id_pattern.sub(replace_match, raw_file)
+
+    def _get_id_tokenizer(self) -> tuple[re.Pattern, re.Pattern, int]:
+        """
+        Returns the compiled patterns used to replace IDs, built once per repository refresh.
+
+        The logical ID pattern matches every GUID shaped token, plus the logical IDs that are not GUIDs, so each file
+        is scanned once whatever the number of repository items. The ID pattern also matches workspace ID
+        references; the index of the group holding the referenced workspace ID is returned with the patterns.
+        """
+        if self._id_tokenizer is None:
+            # First item wins for duplicated logical IDs, as with sequential replacement
+            logical_id_lookup = {}
+            for item_type_items in self.repository_items.values():
+                for item in item_type_items.values():
+                    if item.logical_id:
+                        logical_id_lookup.setdefault(item.logical_id, item)
+
+            # Longest first, so a logical ID containing another one is matched whole
+            non_guid_logical_ids = sorted(
+                (
+                    logical_id
+                    for logical_id in logical_id_lookup
+                    if not re.fullmatch(constants.GUID_TOKEN_REGEX, logical_id)
+                ),
+                key=len,
+                reverse=True,
+            )
+            logical_id_regex = "|".join([*map(re.escape, non_guid_logical_ids), constants.GUID_TOKEN_REGEX])
+
+            id_pattern = re.compile(
+                f"(?P<workspace>{constants.WORKSPACE_ID_REFERENCE_REGEX})|(?P<logical_id>{logical_id_regex})"
+            )
+            # The referenced workspace ID is the second group of WORKSPACE_ID_REFERENCE_REGEX
+            workspace_value_group = id_pattern.groupindex["workspace"] + 2
+
+            self._logical_id_lookup = logical_id_lookup
+            self._id_tokenizer = (
+                re.compile(f"(?P<logical_id>{logical_id_regex})"),
+                id_pattern,
+                workspace_value_group,
+            )
+
+        return self._id_tokenizer
+
+    def _replace_logical_id_match(self, match: re.Match) -> str:
+        """
+        Returns the deployed GUID of a logical ID matched by the ID tokenizer, other tokens are kept as they are.
+
+        Args:
+            match: The match of the logical_id group.
+        """
+        logical_id = match.group("logical_id")
+        item = self._logical_id_lookup.get(logical_id)
+
+        if item is None:
+            return logical_id
+
+        if item.guid == "":
+            planned_id = self._get_planned_item_id(item.type, item.name)
+            if planned_id is not None:
+                return planned_id
+            msg = f"Cannot replace logical ID '{logical_id}' as referenced item is not yet deployed."
+            raise ParsingError(msg, logger)
+
+        return item.guid
+
+    def _get_planned_item_id(self, item_type: str, item_name: str) -> Optional[str]:
+        """
+        Returns the placeholder id of a repository item not deployed yet while a deployment plan is recorded, as the
+        plan creates it. The item rendered by the current thread is then marked as referencing a planned create.
+
+        Args:
+            item_type: Type of the referenced item.
+            item_name: Name of the referenced item.
+        """
+        if self.deployment_plan is None or not self.deployment_plan.recording:
+            return None
+        if item_name not in self.repository_items.get(item_type, {}):
+            return None
+        self._planned_references.found = True
+        return constants.PLANNED_ITEM_ID
 
     def _replace_parameters(self, file_obj: object, item_obj: object) -> str:
         """
@@ -326,48 +677,152 @@ class FabricWorkspace:
             file_obj: The File object instance that provides the file content and file path.
             item_obj: The Item object instance that provides the item type and item name.
         """
-        from fabric_cicd._parameter._utils import (
-            check_replacement,
-            extract_find_value,
-            extract_parameter_filters,
-            extract_replace_value,
-            replace_key_value,
-        )
+        from fabric_cicd._parameter._utils import replace_key_values
 
-        # Parse the file_obj and item_obj
         raw_file = file_obj.contents
+
+        parameter_dicts = self._get_key_value_rules(file_obj, item_obj)
+        if parameter_dicts:
+            raw_file = replace_key_values(parameter_dicts, raw_file, self.environment)
+
+        return self._replace_find_values(raw_file, file_obj, item_obj)
+
+    def _get_key_value_rules(self, file_obj: File, item_obj: Item) -> list[dict]:
+        """
+        Returns the key_value_replace parameters applied to a JSON file, in parameter file order.
+
+        Args:
+            file_obj: The File object instance that provides the file path.
+            item_obj: The Item object instance that provides the item type and item name.
+        """
+        if "key_value_replace" not in self.environment_parameter or ".json" not in file_obj.file_path.suffix:
+            return []
+        # Only the rules whose file filters match this file
+        return self._get_parameter_rules("key_value_replace").get_rules(
+            item_obj.type, item_obj.name, file_obj.file_path
+        )
+
+    def _replace_key_values(self, file_obj: File, item_obj: Item) -> None:
+        """
+        Applies the key_value_replace parameters of a JSON file to its parsed contents.
+
+        Args:
+            file_obj: The File object instance to update.
+            item_obj: The Item object instance that provides the item type and item name.
+        """
+        from fabric_cicd._parameter._utils import apply_key_values
+
+        parameter_dicts = self._get_key_value_rules(file_obj, item_obj)
+        if parameter_dicts:
+            file_obj.set_json_contents(apply_key_values(parameter_dicts, file_obj.json_contents, self.environment))
+
+    def _replace_find_values(self, raw_file: str, file_obj: File, item_obj: Item) -> str:
+        """
+        Replaces the find_replace parameter values found in the raw file content with the chosen environment value.
+
+        Args:
+            raw_file: The raw file content where the values need to be replaced.
+            file_obj: The File object instance that provides the file path.
+            item_obj: The Item object instance that provides the item type and item name.
+        """
+        from fabric_cicd._parameter._utils import extract_find_value, extract_replace_value
+
+        if "find_replace" not in self.environment_parameter:
+            return raw_file
+
         item_type = item_obj.type
         item_name = item_obj.name
-        file_path = file_obj.file_path
-
-        if "key_value_replace" in self.environment_parameter:
-            for parameter_dict in self.environment_parameter.get("key_value_replace"):
-                # Extract the file filter values and set the match condition
-                input_type, input_name, input_path = extract_parameter_filters(self, parameter_dict)
-                filter_match = check_replacement(input_type, input_name, input_path, item_type, item_name, file_path)
-
-                # Perform replacement if condition is met
-                if filter_match and ".json" in file_path.suffix:
-                    raw_file = replace_key_value(parameter_dict, raw_file, self.environment)
-
-        if "find_replace" in self.environment_parameter:
-            for parameter_dict in self.environment_parameter.get("find_replace"):
-                # Extract the file filter values and set the match condition
-                input_type, input_name, input_path = extract_parameter_filters(self, parameter_dict)
-                filter_match = check_replacement(input_type, input_name, input_path, item_type, item_name, file_path)
-
-                # Extract the find_value and replace_value_dict
-                find_value = extract_find_value(parameter_dict, raw_file, filter_match)
-                replace_value_dict = parameter_dict.get("replace_value", {})
-
-                # Replace any found references with specified environment value if conditions are met
-                if find_value in raw_file and self.environment in replace_value_dict and filter_match:
-                    replace_value = extract_replace_value(self, replace_value_dict[self.environment])
-                    raw_file = raw_file.replace(find_value, replace_value)
-                    logger.debug(f"Replacing '{find_value}' with '{replace_value}' in {item_name}.{item_type}")
+        for parameter_dict in self._get_parameter_rules("find_replace").get_rules(
+            item_type, item_name, file_obj.file_path
+        ):
+            # Extract the find_value and replace_value_dict
+            find_value = extract_find_value(parameter_dict, raw_file, filter_match=True)
+            replace_value_dict = parameter_dict.get("replace_value", {})
+
+            # Replace any found references with specified environment value if conditions are met
+            if find_value in raw_file and self.environment in replace_value_dict:
+                replace_value = extract_replace_value(self, replace_value_dict[self.environment])
+                raw_file = raw_file.replace(find_value, replace_value)
+                logger.debug(f"Replacing '{find_value}' with '{replace_value}' in {item_name}.{item_type}")
 
         return raw_file
 
+    def _get_file_transforms(self, item_obj: Item, func_process_file: Optional[callable]) -> list[FileTransform]:
+        """
+        Returns the stages applied to the text files of an item before they are published, in order.
+
+        Args:
+            item_obj: The Item object instance being published.
+            func_process_file: Custom function to process file contents. Defaults to None.
+        """
+
+        def text_stage(func: Callable[[str], str]) -> Callable[[File], None]:
+            """Wraps a function of the raw file content as a stage."""
+
+            def stage(file_obj: File) -> None:
+                file_obj.contents = func(file_obj.contents)
+
+            return stage
+
+        def process_file_stage(file_obj: File) -> None:
+            # Item specific processing either returns the new text, or updates the file itself and returns None
+            contents = func_process_file(self, item_obj, file_obj)
+            if contents is not None and contents is not file_obj.contents:
+                file_obj.contents = contents
+
+        def find_replace_stage(file_obj: File) -> None:
+            file_obj.contents = self._replace_find_values(file_obj.contents, file_obj, item_obj)
+
+        # The item specific processing of the repository items works on the parsed JSON
+        transforms = [FileTransform("func_process_file", JSON, process_file_stage)] if func_process_file else []
+        if self._has_replacement_parameters():
+            transforms += [
+                FileTransform(
+                    "replace_logical_ids",
+                    TEXT,
+                    text_stage(self._replace_logical_ids),
+                    json_func=self._replace_json_logical_ids,
+                ),
+                FileTransform(
+                    "key_value_replace",
+                    JSON,
+                    partial(self._replace_key_values, item_obj=item_obj),
+                    applies=lambda file_obj: bool(self._get_key_value_rules(file_obj, item_obj)),
+                ),
+                FileTransform("find_replace", TEXT, find_replace_stage),
+                FileTransform("replace_workspace_ids", TEXT, text_stage(self._replace_workspace_ids)),
+            ]
+        else:
+            # Nothing to replace in between, so logical and workspace IDs are replaced in one pass
+            transforms.append(FileTransform("replace_ids", TEXT, text_stage(self._replace_ids)))
+        return transforms
+
+    def _get_parameter_rules(self, param_name: str) -> object:
+        """
+        Returns the rules of a parameter indexed by their file filters, compiled once per parameter file.
+
+        Args:
+            param_name: The name of the parameter, e.g. find_replace or key_value_replace.
+        """
+        from fabric_cicd._parameter._rule_index import ParameterRuleIndex
+
+        # Compiled again if the parameter dictionary is replaced
+        if self._parameter_rules_source is not self.environment_parameter:
+            self._parameter_rules = {}
+            self._parameter_rules_source = self.environment_parameter
+
+        if param_name not in self._parameter_rules:
+            self._parameter_rules[param_name] = ParameterRuleIndex(
+                self.environment_parameter.get(param_name), self.repository_directory
+            )
+        return self._parameter_rules[param_name]
+
+    def _has_replacement_parameters(self) -> bool:
+        """Checks if the parameter file defines find_replace or key_value_replace parameters."""
+        return bool(
+            self.environment_parameter.get("find_replace") or self.environment_parameter.get("key_value_replace")
+        )
+
     def _replace_workspace_ids(self, raw_file: str) -> str:
         """
         Replaces feature branch workspace ID, default (i.e. 00000000-0000-0000-0000-000000000000) and non-default
@@ -396,14 +851,12 @@ class FabricWorkspace:
             generic_id: Logical id or item guid of the item based on lookup_type.
             lookup_type: Finding references in deployed file or repo file (Deployed or Repository).
         """
-        lookup_dict = self.repository_items if lookup_type == "Repository" else self.deployed_items
-
-        for item_details in lookup_dict[item_type].values():
-            lookup_id = item_details.logical_id if lookup_type == "Repository" else item_details.guid
-            if lookup_id == generic_id:
-                return item_details.name
-        # if not found
-        return None
+        if lookup_type == "Repository":
+            item = self._get_item_registry("Repository").get_by_logical_id(item_type, generic_id)
+        else:
+            item = self._get_item_registry("Deployed").get_by_guid(item_type, generic_id)
+        # None if not found
+        return item.name if item else None
 
     def _convert_path_to_id(self, item_type: str, path: str) -> str:
         """
@@ -413,11 +866,26 @@ class FabricWorkspace:
             item_type: Type of the item (e.g., Notebook, Environment).
             path: Full path of the desired item.
         """
-        for item_details in self.repository_items[item_type].values():
-            if item_details.path == Path(path):
-                return item_details.logical_id
-        # if not found
-        return None
+        item = self._get_item_registry("Repository").get_by_path(item_type, Path(path))
+        # None if not found
+        return item.logical_id if item else None
+
+    def _get_item_registry(self, lookup_type: str) -> ItemRegistry:
+        """
+        Returns the index of the repository or deployed items, built on first use after each refresh.
+
+        Args:
+            lookup_type: The items to index (Deployed or Repository).
+        """
+        if lookup_type == "Repository":
+            if self._repository_registry is None:
+                self._repository_registry = ItemRegistry(self.repository_items)
+            return self._repository_registry
+
+        with self._deployed_items_lock:
+            if self._deployed_registry is None:
+                self._deployed_registry = ItemRegistry(self.deployed_items)
+            return self._deployed_registry
 
     def _publish_item(
         self,
@@ -447,6 +915,19 @@ class FabricWorkspace:
                 logger.info(f"Skipping publishing of {item_type} '{item_name}' due to exclusion regex.")
                 return
 
+        planning = self.deployment_plan is not None and self.deployment_plan.recording
+        planned_action = None
+        planned_hash = None
+        if self.deployment_plan is not None and not self.deployment_plan.recording:
+            planned_action = self.deployment_plan.get_action(item_type, item_name)
+            planned_hash = self.deployment_plan.get_hash(item_type, item_name)
+            if planned_action == "skip":
+                item.skip_publish = True
+                logger.info(f"Skipping publishing of {item_type} '{item_name}', excluded from the deployment plan.")
+                return
+        # Set by _get_planned_item_id when the item references an item the plan being recorded creates
+        self._planned_references.found = False
+
         item_guid = item.guid
         item_files = item.item_files
 
@@ -454,6 +935,7 @@ class FabricWorkspace:
 
         # Only shell deployment, no definition support
         shell_only_publish = item_type in constants.SHELL_ONLY_PUBLISH
+        payload_hash = None
 
         if kwargs.get("creation_payload"):
             creation_payload = {"creationPayload": kwargs["creation_payload"]}
@@ -461,43 +943,91 @@ class FabricWorkspace:
         elif shell_only_publish:
             combined_body = metadata_body
         else:
-            item_payload = []
+            item_parts = []
+            transforms = self._get_file_transforms(item, func_process_file)
             for file in item_files:
                 if not re.match(exclude_path, file.relative_path):
                     if file.type == "text" and not str(file.file_path).endswith(".platform"):
-                        file.contents = func_process_file(self, item, file) if func_process_file else file.contents
-                        file.contents = self._replace_logical_ids(file.contents)
-                        file.contents = self._replace_parameters(file, item)
-                        file.contents = self._replace_workspace_ids(file.contents)
+                        run_file_transforms(file, transforms, self.transform_timings)
 
-                    item_payload.append(file.base64_payload)
+                    item_parts.append(file)
 
-            definition_body = {"definition": {"parts": item_payload}}
-            combined_body = {**metadata_body, **definition_body}
+            # The parts are base64 encoded a chunk at a time as the body is sent, binary files straight from disk
+            definition_body = DefinitionBody(item_parts)
+            combined_body = DefinitionBody(item_parts, metadata_body)
 
-        logger.info(f"Publishing {item_type} '{item_name}'")
+            # Hash of the final rendered payload, compared with the deployment manifest and the deployment plan
+            if self.deployment_manifest is not None or planning or planned_hash is not None:
+                payload_hash = hash_payload(combined_body)
+
+        if planned_hash is not None and payload_hash != planned_hash:
+            msg = (
+                f"The rendered definition of {item_type} '{item_name}' changed since the deployment plan was recorded, "
+                "plan the deployment again."
+            )
+            raise InputError(msg, logger)
 
         is_deployed = bool(item_guid)
+        if planning and (not is_deployed or self._planned_references.found):
+            # The definition is only final once the items the plan creates have their ids, so it cannot be checked
+            payload_hash = None
+        is_unchanged = planned_action == "unchanged" or (
+            is_deployed
+            and payload_hash is not None
+            and self.deployment_manifest is not None
+            and not self.force_publish
+            and self.deployment_manifest.is_unchanged(item_type, item_name, item_guid, payload_hash)
+        )
+
+        if planning:
+            self._record_planned_item(item, is_deployed, is_unchanged, payload_hash)
+            return
+
+        with self._publish_counts_lock:
+            self.publish_counts["unchanged" if is_unchanged else "published"] += 1
+
+        logger.info(f"Publishing {item_type} '{item_name}'")
+        definition_submitted = False
 
         if not is_deployed:
-            combined_body = {**combined_body, **{"folderId": item.folder_id}}
+            if isinstance(combined_body, DefinitionBody):
+                combined_body = combined_body.with_fields(folderId=item.folder_id)
+            else:
+                combined_body = {**combined_body, **{"folderId": item.folder_id}}
 
             # Create a new item if it does not exist
             # https://learn.microsoft.com/en-us/rest/api/fabric/core/items/create-item
-            item_create_response = self.endpoint.invoke(
+            # The new item id is needed straight away, so wait for the creation to complete
+            item_create_response = self.endpoint.invoke_async(
                 method="POST", url=f"{self.base_api_url}/items", body=combined_body
-            )
+            ).result()
             item_guid = item_create_response["body"]["id"]
             self.repository_items[item_type][item_name].guid = item_guid
+            if self._repository_registry is not None:
+                self._repository_registry.add(item)
+            self._record_deployed_item(item)
+            if payload_hash is not None and self.deployment_manifest is not None:
+                self.deployment_manifest.record(item_type, item_name, item_guid, payload_hash)
+
+        elif is_unchanged:
+            logger.info(f"{constants.INDENT}Unchanged since the last deployment, definition not updated")
 
         elif is_deployed and not shell_only_publish:
             # Update the item's definition if full publish is required
             # https://learn.microsoft.com/en-us/rest/api/fabric/core/items/update-item-definition
-            self.endpoint.invoke(
+            # The update completes in the background, see _wait_for_pending_operations
+            operation = self.endpoint.invoke_async(
                 method="POST",
                 url=f"{self.base_api_url}/items/{item_guid}/updateDefinition?updateMetadata=True",
                 body=definition_body,
             )
+            if payload_hash is not None and self.deployment_manifest is not None:
+                operation.add_done_callback(
+                    partial(self._record_deployment, item_type, item_name, item_guid, payload_hash)
+                )
+            with self._pending_operations_lock:
+                self._pending_operations.append((item_type, item_name, operation))
+            definition_submitted = True
         elif is_deployed and shell_only_publish:
             # Remove the 'type' key as it's not supported in the update-item API
             metadata_body.pop("type", None)
@@ -522,12 +1052,163 @@ class FabricWorkspace:
                 logger.debug(
                     f"Moved {item_guid} from folder_id {self.deployed_items[item_type][item_name].folder_id} to folder_id {item.folder_id}"
                 )
+                self.deployed_items[item_type][item_name].folder_id = item.folder_id
 
         # skip_publish_logging provided in kwargs to suppress logging if further processing is to be done
         if not kwargs.get("skip_publish_logging", False):
-            logger.info(f"{constants.INDENT}Published")
+            if definition_submitted:
+                # Logged as published once the update completes, see _wait_for_pending_operations
+                logger.info(f"{constants.INDENT}Definition update submitted")
+            else:
+                logger.info(f"{constants.INDENT}Published")
         return
 
+    def _record_planned_item(
+        self, item: Item, is_deployed: bool, is_unchanged: bool, payload_hash: Optional[str]
+    ) -> None:
+        """
+        Records the planned action of an item in the deployment plan, instead of publishing it.
+
+        Args:
+            item: The repository item.
+            is_deployed: Whether the item is already deployed.
+            is_unchanged: Whether the definition is unchanged since the last deployment.
+            payload_hash: Hash of the rendered payload, None for items without definition or whose definition is only
+                final once the plan is applied.
+        """
+        action = "unchanged" if is_unchanged else "update" if is_deployed else "create"
+        move = False
+        if is_deployed and "disable_workspace_folder_publish" not in constants.FEATURE_FLAG:
+            # Folders created by the plan have no id yet, so the deployed and repository folders are compared by path
+            deployed_folder_id = self.deployed_items[item.type][item.name].folder_id
+            deployed_folder_paths = {folder_id: folder_path for folder_path, folder_id in self.deployed_folders.items()}
+            move = deployed_folder_paths.get(deployed_folder_id, "") != self._get_folder_path(item.path)
+
+        self.deployment_plan.record_item(item.type, item.name, action, payload_hash, move)
+        logger.info(f"Planned {action} of {item.type} '{item.name}'{' and move' if move else ''}")
+
+        # Publishers skip their post publish actions, e.g. shortcuts or libraries, for skipped items
+        item.skip_publish = True
+
+    def _record_plan_state(self) -> None:
+        """Records the repository and workspace state found by plan_all_items in the deployment plan."""
+        folders = {folder_path: self.deployed_folders.get(folder_path, "") for folder_path in self.repository_folders}
+        deployed_items = [
+            {
+                "type": item.type,
+                "displayName": item.name,
+                "description": item.description,
+                "id": item.guid,
+                "folderId": item.folder_id,
+            }
+            for item_type_items in self.deployed_items.values()
+            for item in item_type_items.values()
+        ]
+        items = {
+            item_type: {
+                item_name: {
+                    "action": "skip",
+                    "move": False,
+                    "hash": None,
+                    "logical_id": item.logical_id,
+                    "description": item.description,
+                    "path": item.path.relative_to(self.repository_directory).as_posix(),
+                    "folder": self._get_folder_path(item.path),
+                    "files": [file.relative_path for file in item.item_files],
+                }
+                for item_name, item in item_type_items.items()
+            }
+            for item_type, item_type_items in self.repository_items.items()
+        }
+        self.deployment_plan.set_state(folders, deployed_items, items)
+
+    def _load_plan_folders(self) -> None:
+        """Restores the repository and deployed folders recorded in the deployment plan, instead of listing them."""
+        self.repository_folders = dict(self.deployment_plan.folders)
+        self.deployed_folders = {
+            folder_path: folder_id for folder_path, folder_id in self.deployment_plan.folders.items() if folder_id
+        }
+
+    def _load_plan_items(self) -> None:
+        """Restores the repository and deployed items recorded in the deployment plan, instead of scanning them."""
+        with self._deployed_items_lock:
+            self._set_deployed_items(self.deployment_plan.deployed_items)
+
+        self.repository_items = {}
+        self._id_tokenizer = None
+        self._repository_registry = None
+
+        for item_type, item_type_items in self.deployment_plan.items.items():
+            for item_name, entry in item_type_items.items():
+                item_path = self.repository_directory / entry["path"]
+                if "disable_workspace_folder_publish" not in constants.FEATURE_FLAG:
+                    item_folder_id = self.repository_folders.get(entry["folder"], "")
+                else:
+                    item_folder_id = ""
+
+                item = Item(
+                    type=item_type,
+                    name=item_name,
+                    description=entry["description"],
+                    guid=self.deployed_items.get(item_type, {}).get(item_name, Item("", "", "", "")).guid,
+                    logical_id=entry["logical_id"],
+                    path=item_path,
+                    folder_id=item_folder_id,
+                )
+                item.item_files = [File(item_path, item_path / file_path) for file_path in entry["files"]]
+                self.repository_items.setdefault(item_type, {})[item_name] = item
+
+    def _record_deployment(
+        self, item_type: str, item_name: str, item_guid: str, payload_hash: str, operation: Future
+    ) -> None:
+        """
+        Records the definition update in the deployment manifest once it has succeeded.
+
+        Args:
+            item_type: Type of the item.
+            item_name: Name of the item.
+            item_guid: GUID of the updated item.
+            payload_hash: Hash of the published payload.
+            operation: The completed definition update.
+        """
+        if not operation.cancelled() and operation.exception() is None:
+            self.deployment_manifest.record(item_type, item_name, item_guid, payload_hash)
+
+    def _wait_for_pending_operations(
+        self, item_type: Optional[str] = None, item_name: Optional[str] = None, raise_errors: bool = True
+    ) -> None:
+        """
+        Waits for the pending definition updates to complete, logs every failure and raises the first one.
+
+        Args:
+            item_type: Only wait for the items of this type. Defaults to all item types.
+            item_name: Only wait for the item with this name. Defaults to all items.
+            raise_errors: Whether to raise the first failure. False when another error is already being raised.
+        """
+        operations = []
+        with self._pending_operations_lock:
+            remaining = []
+            for pending in self._pending_operations:
+                pending_item_type, pending_item_name, _ = pending
+                if item_type in (None, pending_item_type) and item_name in (None, pending_item_name):
+                    operations.append(pending)
+                else:
+                    remaining.append(pending)
+            self._pending_operations = remaining
+
+        errors = []
+        for pending_item_type, pending_item_name, operation in operations:
+            try:
+                operation.result()
+            except Exception as e:
+                errors.append(e)
+                logger.error(f"Failed to publish {pending_item_type} '{pending_item_name}'. {e}")
+            else:
+                logger.info(f"Published {pending_item_type} '{pending_item_name}'")
+
+        if errors and raise_errors:
+            raise errors[0]
+
     def _unpublish_item(self, item_name: str, item_type: str) -> None:
         """
         Unpublishes an item from the Fabric workspace.
@@ -544,6 +1225,9 @@ class FabricWorkspace:
         # https://learn.microsoft.com/en-us/rest/api/fabric/core/items/delete-item
         try:
             self.endpoint.invoke(method="DELETE", url=f"{self.base_api_url}/items/{item_guid}")
+            self._forget_deployed_item(item_type, item_name)
+            if self.deployment_manifest is not None:
+                self.deployment_manifest.remove(item_type, item_name)
             logger.info(f"{constants.INDENT}Unpublished")
         except Exception as e:
             logger.warning(f"Failed to unpublish {item_type} '{item_name}'.  Raw exception: {e}")
@@ -610,26 +1294,45 @@ class FabricWorkspace:
         self.repository_folders = {}
 
         root_path = Path(self.repository_directory)
-        folder_hierarchy = {}
+        folders = []
 
-        # Collect all folders that directly contain a .platform file
-        platform_folders = set(p.parent for p in root_path.rglob(".platform"))
+        # Keep the walk for the _refresh_repository_items call that follows, so the repository is only walked once
+        walk = self._walk_repository()
+        self._repository_walk = walk
 
-        # Now, for every folder, check if any of its subfolders is in platform_folders
-        for folder in root_path.rglob("*"):
-            if not folder.is_dir() or folder == root_path or folder.name == ".children":
-                continue
+        # Directories containing an item at any depth, filled bottom-up as children are listed after their parent
+        contains_item = set()
+        for directory, dirs, files in reversed(walk):
+            has_nested_item = any(directory / name in contains_item for name in dirs)
+            if ".platform" in files or has_nested_item:
+                contains_item.add(directory)
 
-            # Skip folders that directly contain a .platform file
-            if folder in platform_folders:
+            # Skip the root, .children folders and folders that directly contain a .platform file
+            if directory == root_path or directory.name == ".children" or ".platform" in files:
                 continue
 
-            # Check if any subfolder (at any depth) is in platform_folders
-            if any(sub in platform_folders for sub in folder.rglob("*") if sub.is_dir()):
-                relative_path = f"/{folder.relative_to(root_path).as_posix()}"
-                folder_hierarchy[relative_path] = ""
+            if has_nested_item:
+                folders.append(f"/{directory.relative_to(root_path).as_posix()}")
+
+        self.repository_folders = dict.fromkeys(reversed(folders), "")
+
+    def _walk_repository(self) -> list[tuple[Path, list[str], list[str]]]:
+        """
+        Returns the directory, subdirectory names and file names of every repository directory, parents first.
+
+        A walk kept by _refresh_repository_folders is used once and then discarded, so later refreshes see the
+        current state of the repository. A repository scan shared by several workspaces is walked once for all of them.
+        """
+        walk, self._repository_walk = self._repository_walk, None
+        if walk is None and self._repository_scan is not None:
+            walk = self._repository_scan.get_walk(self._list_repository_directories)
+        elif walk is None:
+            walk = self._list_repository_directories()
+        return walk
 
-        self.repository_folders = folder_hierarchy
+    def _list_repository_directories(self) -> list[tuple[Path, list[str], list[str]]]:
+        """Walks the repository directory, parents first."""
+        return [(Path(root), dirs, files) for root, dirs, files in os.walk(self.repository_directory)]
 
     def _publish_folders(self) -> None:
         """Publishes all folders from the repository."""
@@ -662,6 +1365,7 @@ class FabricWorkspace:
 
             # Update local hierarchy with the new folder ID
             self.repository_folders[folder_path] = response["body"]["id"]
+            self.deployed_folders[folder_path] = response["body"]["id"]
             logger.debug(f"Published folder: {folder_path}")
 
         logger.info(f"{constants.INDENT}Published")
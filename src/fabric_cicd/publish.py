@@ -4,28 +4,82 @@
 """Module for publishing and unpublishing Fabric workspace items."""
 
 import logging
+import re
+import threading
+import time
+from functools import partial
 from typing import Optional
 
+from azure.core.credentials import TokenCredential
+from azure.identity import DefaultAzureCredential
+
 import fabric_cicd._items as items
 from fabric_cicd import constants
 from fabric_cicd._common._check_utils import check_regex
+from fabric_cicd._common._deployment_manifest import DeploymentManifest
+from fabric_cicd._common._deployment_plan import DeploymentPlan
+from fabric_cicd._common._exceptions import InputError
+from fabric_cicd._common._fabric_endpoint import FabricEndpoint
 from fabric_cicd._common._logging import print_header
+from fabric_cicd._common._repository_scan import RepositoryScan
+from fabric_cicd._common._scheduler import run_concurrently, run_with_dependencies
 from fabric_cicd._common._validate_input import (
+    validate_data_type,
+    validate_deployment_manifest_path,
+    validate_deployment_plan_path,
+    validate_deployment_targets,
     validate_fabric_workspace_obj,
+    validate_max_workers,
+    validate_token_credential,
 )
 from fabric_cicd.fabric_workspace import FabricWorkspace
 
 logger = logging.getLogger(__name__)
 
+# Default publish order of the item types: {item_type: (header, publish function)}
+_PUBLISH_STEPS = {
+    "VariableLibrary": ("Publishing Variable Libraries", items.publish_variablelibraries),
+    "Warehouse": ("Publishing Warehouses", items.publish_warehouses),
+    "Lakehouse": ("Publishing Lakehouses", items.publish_lakehouses),
+    "SQLDatabase": ("Publishing SQL Databases", items.publish_sqldatabases),
+    "MirroredDatabase": ("Publishing Mirrored Databases", items.publish_mirroreddatabase),
+    "Environment": ("Publishing Environments", items.publish_environments),
+    "Notebook": ("Publishing Notebooks", items.publish_notebooks),
+    "SemanticModel": ("Publishing Semantic Models", items.publish_semanticmodels),
+    "Report": ("Publishing Reports", items.publish_reports),
+    "CopyJob": ("Publishing Copy Jobs", items.publish_copyjobs),
+    "Eventhouse": ("Publishing Eventhouses", items.publish_eventhouses),
+    "KQLDatabase": ("Publishing KQL Databases", items.publish_kqldatabases),
+    "KQLQueryset": ("Publishing KQL Querysets", items.publish_kqlquerysets),
+    "Reflex": ("Publishing Activators", items.publish_activators),
+    "Eventstream": ("Publishing Eventstreams", items.publish_eventstreams),
+    "KQLDashboard": ("Publishing KQL Dashboards", items.publish_kqldashboard),
+    "Dataflow": ("Publishing Dataflows", items.publish_dataflows),
+    "DataPipeline": ("Publishing Data Pipelines", items.publish_datapipelines),
+    "GraphQLApi": ("Publishing GraphQL APIs", items.publish_graphqlapis),
+}
+
 
-def publish_all_items(fabric_workspace_obj: FabricWorkspace, item_name_exclude_regex: Optional[str] = None) -> None:
+def publish_all_items(
+    fabric_workspace_obj: FabricWorkspace,
+    item_name_exclude_regex: Optional[str] = None,
+    max_workers: Optional[int] = None,
+    deployment_manifest_path: Optional[str] = None,
+    force_publish: bool = False,
+) -> None:
     """
     Publishes all items defined in the `item_type_in_scope` list of the given FabricWorkspace object.
 
+    Item types are published in dependency order, for example Lakehouses before the Notebooks that reference them
+    and Semantic Models before the Reports bound to them. With `max_workers` greater than 1, item types without a
+    dependency between them and the items within an item type are published at the same time.
+
     Args:
         fabric_workspace_obj: The FabricWorkspace object containing the items to be published.
         item_name_exclude_regex: Regex pattern to exclude specific items from being published.
-
+        max_workers: Maximum number of item types, and of items within an item type, published at the same time. Defaults to 1. Item types and the items within an item type run on separate thread pools, so up to max_workers squared requests can be in flight at once.
+        deployment_manifest_path: Path of a local file recording what was deployed to each workspace and environment. When provided, items whose rendered definition and GUID are unchanged since the last deployment are not updated. It is also required to skip the upload of unchanged Environment custom libraries, whose contents the API does not return.
+        force_publish: Update every item, even those unchanged according to the deployment manifest. Defaults to False.
 
     Examples:
         Basic usage
@@ -46,9 +100,39 @@ def publish_all_items(fabric_workspace_obj: FabricWorkspace, item_name_exclude_r
         ... )
         >>> exclude_regex = ".*_do_not_publish"
         >>> publish_all_items(workspace, exclude_regex)
+
+        With concurrent publishing
+        >>> from fabric_cicd import FabricWorkspace, publish_all_items
+        >>> workspace = FabricWorkspace(
+        ...     workspace_id="your-workspace-id",
+        ...     repository_directory="/path/to/repo",
+        ...     item_type_in_scope=["Lakehouse", "Notebook", "SemanticModel", "Report"]
+        ... )
+        >>> publish_all_items(workspace, max_workers=8)
+
+        With incremental deployment
+        >>> from fabric_cicd import FabricWorkspace, publish_all_items
+        >>> workspace = FabricWorkspace(
+        ...     workspace_id="your-workspace-id",
+        ...     environment="PROD",
+        ...     repository_directory="/path/to/repo",
+        ...     item_type_in_scope=["Notebook", "DataPipeline"]
+        ... )
+        >>> publish_all_items(workspace, deployment_manifest_path="/path/to/deployment_manifest.json")
     """
     fabric_workspace_obj = validate_fabric_workspace_obj(fabric_workspace_obj)
 
+    if max_workers is not None:
+        fabric_workspace_obj.max_workers = validate_max_workers(max_workers)
+
+    if deployment_manifest_path is not None:
+        fabric_workspace_obj.deployment_manifest = DeploymentManifest(
+            path=validate_deployment_manifest_path(deployment_manifest_path),
+            workspace_id=fabric_workspace_obj.workspace_id,
+            environment=fabric_workspace_obj.environment,
+        )
+    fabric_workspace_obj.force_publish = validate_data_type("bool", "force_publish", force_publish)
+
     if "disable_workspace_folder_publish" not in constants.FEATURE_FLAG:
         fabric_workspace_obj._refresh_deployed_folders()
         fabric_workspace_obj._refresh_repository_folders()
@@ -63,71 +147,76 @@ def publish_all_items(fabric_workspace_obj: FabricWorkspace, item_name_exclude_r
         )
         fabric_workspace_obj.publish_item_name_exclude_regex = item_name_exclude_regex
 
-    if "VariableLibrary" in fabric_workspace_obj.item_type_in_scope:
-        print_header("Publishing Variable Libraries")
-        items.publish_variablelibraries(fabric_workspace_obj)
-    if "Warehouse" in fabric_workspace_obj.item_type_in_scope:
-        print_header("Publishing Warehouses")
-        items.publish_warehouses(fabric_workspace_obj)
-    if "Lakehouse" in fabric_workspace_obj.item_type_in_scope:
-        print_header("Publishing Lakehouses")
-        items.publish_lakehouses(fabric_workspace_obj)
-    if "SQLDatabase" in fabric_workspace_obj.item_type_in_scope:
-        print_header("Publishing SQL Databases")
-        items.publish_sqldatabases(fabric_workspace_obj)
-    if "MirroredDatabase" in fabric_workspace_obj.item_type_in_scope:
-        print_header("Publishing Mirrored Databases")
-        items.publish_mirroreddatabase(fabric_workspace_obj)
-    if "Environment" in fabric_workspace_obj.item_type_in_scope:
-        print_header("Publishing Environments")
-        items.publish_environments(fabric_workspace_obj)
-    if "Notebook" in fabric_workspace_obj.item_type_in_scope:
-        print_header("Publishing Notebooks")
-        items.publish_notebooks(fabric_workspace_obj)
-    if "SemanticModel" in fabric_workspace_obj.item_type_in_scope:
-        print_header("Publishing Semantic Models")
-        items.publish_semanticmodels(fabric_workspace_obj)
-    if "Report" in fabric_workspace_obj.item_type_in_scope:
-        print_header("Publishing Reports")
-        items.publish_reports(fabric_workspace_obj)
-    if "CopyJob" in fabric_workspace_obj.item_type_in_scope:
-        print_header("Publishing Copy Jobs")
-        items.publish_copyjobs(fabric_workspace_obj)
-    if "Eventhouse" in fabric_workspace_obj.item_type_in_scope:
-        print_header("Publishing Eventhouses")
-        items.publish_eventhouses(fabric_workspace_obj)
-    if "KQLDatabase" in fabric_workspace_obj.item_type_in_scope:
-        print_header("Publishing KQL Databases")
-        items.publish_kqldatabases(fabric_workspace_obj)
-    if "KQLQueryset" in fabric_workspace_obj.item_type_in_scope:
-        print_header("Publishing KQL Querysets")
-        items.publish_kqlquerysets(fabric_workspace_obj)
-    if "Reflex" in fabric_workspace_obj.item_type_in_scope:
-        print_header("Publishing Activators")
-        items.publish_activators(fabric_workspace_obj)
-    if "Eventstream" in fabric_workspace_obj.item_type_in_scope:
-        print_header("Publishing Eventstreams")
-        items.publish_eventstreams(fabric_workspace_obj)
-    if "KQLDashboard" in fabric_workspace_obj.item_type_in_scope:
-        print_header("Publishing KQL Dashboards")
-        items.publish_kqldashboard(fabric_workspace_obj)
-    if "Dataflow" in fabric_workspace_obj.item_type_in_scope:
-        print_header("Publishing Dataflows")
-        items.publish_dataflows(fabric_workspace_obj)
-    if "DataPipeline" in fabric_workspace_obj.item_type_in_scope:
-        print_header("Publishing Data Pipelines")
-        items.publish_datapipelines(fabric_workspace_obj)
-    if "GraphQLApi" in fabric_workspace_obj.item_type_in_scope:
-        print_header("Publishing GraphQL APIs")
-        logger.warning(
-            "Only user authentication is supported for GraphQL API items sourced from SQL Analytics Endpoint"
+    _publish_item_types(fabric_workspace_obj)
+
+
+def _publish_item_types(fabric_workspace_obj: FabricWorkspace) -> None:
+    """
+    Publishes the item types in scope in dependency order, then checks the publish state of the environments.
+
+    When a deployment plan is being recorded, the items are only rendered and their planned action recorded.
+
+    Args:
+        fabric_workspace_obj: The FabricWorkspace object containing the items to be published.
+    """
+    planning = fabric_workspace_obj.deployment_plan is not None and fabric_workspace_obj.deployment_plan.recording
+
+    # Publish item types as soon as the item types they depend on are published. Each item type publishes its items on
+    # its own pool of max_workers threads, so up to max_workers squared items can be published at once
+    publish_tasks = {
+        item_type: partial(_publish_item_type, fabric_workspace_obj, item_type)
+        for item_type in _PUBLISH_STEPS
+        if item_type in fabric_workspace_obj.item_type_in_scope
+    }
+    try:
+        run_with_dependencies(
+            tasks=publish_tasks,
+            dependencies=constants.PUBLISH_ITEM_TYPE_DEPENDENCIES,
+            max_workers=fabric_workspace_obj.max_workers,
         )
-        items.publish_graphqlapis(fabric_workspace_obj)
+    finally:
+        # Keep the items deployed before a failure, so they are not updated again by the next run
+        if fabric_workspace_obj.deployment_manifest is not None and not planning:
+            fabric_workspace_obj.deployment_manifest.save()
+        # Record the file types detected while publishing
+        fabric_workspace_obj._save_scan_index()
+        fabric_workspace_obj.transform_timings.log()
 
-    # Check Environment Publish
-    if "Environment" in fabric_workspace_obj.item_type_in_scope:
+    # Check Environment Publish, the environments have been building while the other item types were published
+    if "Environment" in fabric_workspace_obj.item_type_in_scope and not planning:
         print_header("Checking Environment Publish State")
-        items.check_environment_publish_state(fabric_workspace_obj)
+        try:
+            items.check_environment_publish_state(
+                fabric_workspace_obj, item_names=fabric_workspace_obj.environment_publishes
+            )
+        finally:
+            # Keep the libraries of the environments that were published successfully
+            if fabric_workspace_obj.deployment_manifest is not None:
+                fabric_workspace_obj.deployment_manifest.save()
+
+
+def _publish_item_type(fabric_workspace_obj: FabricWorkspace, item_type: str) -> None:
+    """
+    Publishes all items of the given item type.
+
+    Args:
+        fabric_workspace_obj: The FabricWorkspace object containing the items to be published.
+        item_type: The item type to publish.
+    """
+    header, publish_func = _PUBLISH_STEPS[item_type]
+    print_header(header)
+    if item_type == "GraphQLApi":
+        logger.warning(
+            "Only user authentication is supported for GraphQL API items sourced from SQL Analytics Endpoint"
+        )
+    published = False
+    try:
+        publish_func(fabric_workspace_obj)
+        published = True
+    finally:
+        # Dependent item types start once the definitions of this item type have been updated. The updates already
+        # submitted are also waited for when an item fails, so none is left running and each failure is reported
+        fabric_workspace_obj._wait_for_pending_operations(item_type=item_type, raise_errors=published)
 
 
 def unpublish_all_orphan_items(fabric_workspace_obj: FabricWorkspace, item_name_exclude_regex: str = "^$") -> None:
@@ -164,10 +253,23 @@ def unpublish_all_orphan_items(fabric_workspace_obj: FabricWorkspace, item_name_
 
     regex_pattern = check_regex(item_name_exclude_regex)
 
-    fabric_workspace_obj._refresh_deployed_items()
+    # The deployed items are kept up to date by publish_all_items, only list them if needed
+    fabric_workspace_obj._refresh_deployed_items_if_stale()
     fabric_workspace_obj._refresh_repository_items()
     print_header("Unpublishing Orphaned Items")
 
+    orphan_items = _find_orphan_items(fabric_workspace_obj, regex_pattern)
+    _unpublish_items(fabric_workspace_obj, orphan_items)
+
+
+def _find_orphan_items(fabric_workspace_obj: FabricWorkspace, regex_pattern: re.Pattern) -> dict[str, list[str]]:
+    """
+    Returns the deployed items not present in the repository, by item type, in unpublish order.
+
+    Args:
+        fabric_workspace_obj: The FabricWorkspace object containing the items to be published.
+        regex_pattern: Compiled regex of the item names excluded from being unpublished.
+    """
     # Lakehouses, SQL Databases, and Warehouses can only be unpublished if their feature flags are set
     unpublish_flag_mapping = {
         "Lakehouse": "enable_lakehouse_unpublish",
@@ -204,6 +306,7 @@ def unpublish_all_orphan_items(fabric_workspace_obj: FabricWorkspace, item_name_
             if not unpublish_flag or unpublish_flag in constants.FEATURE_FLAG:
                 unpublish_order.append(item_type)
 
+    orphan_items = {}
     for item_type in unpublish_order:
         deployed_names = set(fabric_workspace_obj.deployed_items.get(item_type, {}).keys())
         repository_names = set(fabric_workspace_obj.repository_items.get(item_type, {}).keys())
@@ -221,10 +324,331 @@ def unpublish_all_orphan_items(fabric_workspace_obj: FabricWorkspace, item_name_
                 fabric_workspace_obj, item_type, to_delete_list, find_referenced_items_func
             )
 
-        for item_name in to_delete_list:
+        orphan_items[item_type] = to_delete_list
+
+    return orphan_items
+
+
+def _unpublish_items(fabric_workspace_obj: FabricWorkspace, orphan_items: dict[str, list[str]]) -> None:
+    """
+    Unpublishes the given items, then the workspace folders left empty.
+
+    Args:
+        fabric_workspace_obj: The FabricWorkspace object containing the items to be published.
+        orphan_items: The names of the items to unpublish by item type, in unpublish order.
+    """
+    for item_type, item_names in orphan_items.items():
+        for item_name in item_names:
             fabric_workspace_obj._unpublish_item(item_name=item_name, item_type=item_type)
 
-    fabric_workspace_obj._refresh_deployed_items()
+    if fabric_workspace_obj.deployment_manifest is not None:
+        fabric_workspace_obj.deployment_manifest.save()
+
+    # Items deleted along with an unpublished item, e.g. the KQL Databases of an Eventhouse, free up their folders
+    fabric_workspace_obj._refresh_deployed_items_if_stale()
     fabric_workspace_obj._refresh_deployed_folders()
     if "disable_workspace_folder_publish" not in constants.FEATURE_FLAG:
         fabric_workspace_obj._unpublish_folders()
+
+
+def plan_all_items(
+    fabric_workspace_obj: FabricWorkspace,
+    deployment_plan_path: str,
+    item_name_exclude_regex: Optional[str] = None,
+    max_workers: Optional[int] = None,
+    deployment_manifest_path: Optional[str] = None,
+    unpublish_orphan_items: bool = False,
+    orphan_item_name_exclude_regex: str = "^$",
+) -> None:
+    """
+    Plans the deployment of all items defined in the `item_type_in_scope` list of the given FabricWorkspace object, without changing the workspace.
+
+    The repository is scanned, the deployed items and folders are listed and every item is rendered as by
+    `publish_all_items`, and optionally the orphan items are found as by `unpublish_all_orphan_items`. The items to
+    create, update, move and delete, the hash of their rendered definitions and the state the plan is based on are
+    written to the deployment plan file, carried out later by `apply_plan`. References to items the plan creates are
+    rendered with a placeholder id, the definitions containing them and those of the items to create are not hashed.
+
+    Args:
+        fabric_workspace_obj: The FabricWorkspace object containing the items to be published.
+        deployment_plan_path: Path of the deployment plan file to write.
+        item_name_exclude_regex: Regex pattern to exclude specific items from being published.
+        max_workers: Maximum number of item types, and of items within an item type, rendered at the same time. Defaults to 1. Item types and the items within an item type run on separate thread pools, so up to max_workers squared requests can be in flight at once.
+        deployment_manifest_path: Path of the deployment manifest. When provided, items whose rendered definition and GUID are unchanged since the last deployment are planned as unchanged.
+        unpublish_orphan_items: Also plan to unpublish the deployed items not present in the repository. Defaults to False.
+        orphan_item_name_exclude_regex: Regex pattern to exclude specific items from being unpublished. Default is '^$' which will exclude nothing.
+
+    Examples:
+        Plan in the build stage, apply in the release stage
+        >>> from fabric_cicd import FabricWorkspace, apply_plan, plan_all_items
+        >>> workspace = FabricWorkspace(
+        ...     workspace_id="your-workspace-id",
+        ...     environment="PROD",
+        ...     repository_directory="/path/to/repo",
+        ...     item_type_in_scope=["Notebook", "DataPipeline"]
+        ... )
+        >>> plan_all_items(workspace, "/path/to/deployment_plan.json", unpublish_orphan_items=True)
+        >>> apply_plan(workspace, "/path/to/deployment_plan.json")
+    """
+    fabric_workspace_obj = validate_fabric_workspace_obj(fabric_workspace_obj)
+    plan_path = validate_deployment_plan_path(deployment_plan_path)
+    orphan_regex_pattern = check_regex(orphan_item_name_exclude_regex)
+
+    if max_workers is not None:
+        fabric_workspace_obj.max_workers = validate_max_workers(max_workers)
+
+    if deployment_manifest_path is not None:
+        fabric_workspace_obj.deployment_manifest = DeploymentManifest(
+            path=validate_deployment_manifest_path(deployment_manifest_path),
+            workspace_id=fabric_workspace_obj.workspace_id,
+            environment=fabric_workspace_obj.environment,
+        )
+
+    plan = DeploymentPlan(
+        workspace_id=fabric_workspace_obj.workspace_id,
+        environment=fabric_workspace_obj.environment,
+        item_type_in_scope=fabric_workspace_obj.item_type_in_scope,
+    )
+    fabric_workspace_obj.deployment_plan = plan
+    try:
+        if "disable_workspace_folder_publish" not in constants.FEATURE_FLAG:
+            fabric_workspace_obj._refresh_deployed_folders()
+            fabric_workspace_obj._refresh_repository_folders()
+
+        fabric_workspace_obj._refresh_deployed_items()
+        fabric_workspace_obj._refresh_repository_items()
+        fabric_workspace_obj._record_plan_state()
+
+        if item_name_exclude_regex:
+            logger.warning(
+                "Using item_name_exclude_regex is risky as it can prevent needed dependencies from being deployed.  Use at your own risk."
+            )
+            fabric_workspace_obj.publish_item_name_exclude_regex = item_name_exclude_regex
+
+        _publish_item_types(fabric_workspace_obj)
+
+        if unpublish_orphan_items:
+            print_header("Planning Orphaned Items")
+            plan.record_deletes(_find_orphan_items(fabric_workspace_obj, orphan_regex_pattern))
+    finally:
+        fabric_workspace_obj.deployment_plan = None
+
+    plan.save(plan_path)
+    summary = ", ".join(f"{count} {action}" for action, count in plan.summary().items())
+    logger.info(f"Deployment plan written to '{plan_path}': {summary}")
+
+
+def apply_plan(
+    fabric_workspace_obj: FabricWorkspace,
+    deployment_plan_path: str,
+    max_workers: Optional[int] = None,
+    deployment_manifest_path: Optional[str] = None,
+) -> None:
+    """
+    Applies a deployment plan written by `plan_all_items` to the workspace it was planned for.
+
+    The repository items and the deployed items and folders are restored from the plan instead of being scanned and
+    listed again. Missing folders are created, the items planned to be created or updated are rendered and published,
+    unchanged items are only moved when needed, and the planned orphan items are unpublished. The repository directory
+    must contain the same files as when the plan was recorded: the items hashed by the plan are rendered again, and
+    an item whose rendered definition no longer matches its hash fails the deployment.
+
+    Args:
+        fabric_workspace_obj: The FabricWorkspace object of the workspace and environment the plan was recorded for.
+        deployment_plan_path: Path of the deployment plan file written by `plan_all_items`.
+        max_workers: Maximum number of item types, and of items within an item type, published at the same time. Defaults to 1. Item types and the items within an item type run on separate thread pools, so up to max_workers squared requests can be in flight at once.
+        deployment_manifest_path: Path of the deployment manifest, updated with the items deployed. Use the manifest the plan was recorded with.
+
+    Examples:
+        Basic usage
+        >>> from fabric_cicd import FabricWorkspace, apply_plan
+        >>> workspace = FabricWorkspace(
+        ...     workspace_id="your-workspace-id",
+        ...     environment="PROD",
+        ...     repository_directory="/path/to/repo",
+        ...     item_type_in_scope=["Notebook", "DataPipeline"]
+        ... )
+        >>> apply_plan(workspace, "/path/to/deployment_plan.json")
+    """
+    fabric_workspace_obj = validate_fabric_workspace_obj(fabric_workspace_obj)
+    plan = DeploymentPlan.load(validate_deployment_plan_path(deployment_plan_path))
+
+    if (plan.workspace_id, plan.environment) != (fabric_workspace_obj.workspace_id, fabric_workspace_obj.environment):
+        msg = (
+            f"The deployment plan was recorded for workspace '{plan.workspace_id}' and environment '{plan.environment}', "
+            f"not workspace '{fabric_workspace_obj.workspace_id}' and environment '{fabric_workspace_obj.environment}'."
+        )
+        raise InputError(msg, logger)
+    if set(plan.item_type_in_scope) != set(fabric_workspace_obj.item_type_in_scope):
+        msg = f"The deployment plan was recorded for the item types {plan.item_type_in_scope}, not {fabric_workspace_obj.item_type_in_scope}."
+        raise InputError(msg, logger)
+
+    if max_workers is not None:
+        fabric_workspace_obj.max_workers = validate_max_workers(max_workers)
+
+    if deployment_manifest_path is not None:
+        fabric_workspace_obj.deployment_manifest = DeploymentManifest(
+            path=validate_deployment_manifest_path(deployment_manifest_path),
+            workspace_id=fabric_workspace_obj.workspace_id,
+            environment=fabric_workspace_obj.environment,
+        )
+
+    fabric_workspace_obj.deployment_plan = plan
+    try:
+        fabric_workspace_obj._load_plan_folders()
+        if "disable_workspace_folder_publish" not in constants.FEATURE_FLAG:
+            fabric_workspace_obj._publish_folders()
+
+        fabric_workspace_obj._load_plan_items()
+        _publish_item_types(fabric_workspace_obj)
+
+        if plan.deletes:
+            print_header("Unpublishing Orphaned Items")
+            _unpublish_items(fabric_workspace_obj, plan.deletes)
+    finally:
+        fabric_workspace_obj.deployment_plan = None
+
+
+def publish_all_items_to_workspaces(
+    targets: list[dict],
+    repository_directory: str,
+    item_type_in_scope: list[str],
+    token_credential: Optional[TokenCredential] = None,
+    item_name_exclude_regex: Optional[str] = None,
+    max_workers: Optional[int] = None,
+    max_concurrent_workspaces: Optional[int] = None,
+    deployment_manifest_path: Optional[str] = None,
+    force_publish: bool = False,
+) -> list[dict]:
+    """
+    Publishes all items of one repository to several workspaces at the same time, as publish_all_items does for each.
+
+    The repository is walked and parsed once for all the workspaces, and a single credential, token and HTTP
+    connection pool are shared by all of them. Each workspace renders its own payloads from its environment,
+    workspace id and parameter file replacements. A failed workspace does not stop the others: once every workspace
+    has finished, the result of each is logged and the first failure is raised.
+
+    Args:
+        targets: The target workspaces, each a dictionary with a `workspace_id` or a `workspace_name`, and an optional `environment`.
+        repository_directory: Local directory path of the repository where items are to be deployed from.
+        item_type_in_scope: Item types that should be deployed to every workspace.
+        token_credential: The token credential to use for API requests. Defaults to DefaultAzureCredential.
+        item_name_exclude_regex: Regex pattern to exclude specific items from being published.
+        max_workers: Maximum number of item types, and of items within an item type, published at the same time to a workspace. Defaults to 1. Item types and the items within an item type run on separate thread pools, so up to max_workers squared requests can be in flight per workspace.
+        max_concurrent_workspaces: Maximum number of workspaces published at the same time. Defaults to all the targets.
+        deployment_manifest_path: Path of a local file recording what was deployed to each workspace and environment, shared by all the targets.
+        force_publish: Update every item, even those unchanged according to the deployment manifest. Defaults to False.
+
+    Returns:
+        The result of each target, in target order: its workspace_id, environment, status (Succeeded or Failed), the number of items created or updated (items), the number of items left unchanged as per the deployment manifest (unchanged), the seconds taken and the error of a failed target.
+
+    Examples:
+        Basic usage
+        >>> from fabric_cicd import publish_all_items_to_workspaces
+        >>> results = publish_all_items_to_workspaces(
+        ...     targets=[
+        ...         {"workspace_id": "tenant-a-workspace-id", "environment": "TENANT_A"},
+        ...         {"workspace_id": "tenant-b-workspace-id", "environment": "TENANT_B"},
+        ...     ],
+        ...     repository_directory="/path/to/repo",
+        ...     item_type_in_scope=["Notebook", "DataPipeline"],
+        ...     max_workers=4,
+        ...     max_concurrent_workspaces=8,
+        ... )
+    """
+    targets = validate_deployment_targets(targets)
+    max_workers = validate_max_workers(max_workers) if max_workers is not None else constants.DEFAULT_MAX_WORKERS
+    max_concurrent_workspaces = (
+        validate_max_workers(max_concurrent_workspaces) if max_concurrent_workspaces is not None else len(targets)
+    )
+    manifest_path = (
+        validate_deployment_manifest_path(deployment_manifest_path) if deployment_manifest_path is not None else None
+    )
+
+    # A single endpoint shares the token and the pooled connections, sized for every publishing thread
+    endpoint = FabricEndpoint(
+        # CodeQL [SM05139] Public library needing to have a default auth when user doesn't provide token. Not internal Azure product.
+        token_credential=(
+            DefaultAzureCredential() if token_credential is None else validate_token_credential(token_credential)
+        ),
+        pool_maxsize=max(constants.HTTP_POOL_MAXSIZE, min(max_concurrent_workspaces, len(targets)) * max_workers),
+    )
+    repository_scan = RepositoryScan()
+    shared_manifest = None
+    manifest_lock = threading.Lock()
+    errors = {}
+
+    def get_manifest(workspace_id: str, environment: str) -> DeploymentManifest:
+        # The targets share the manifest file, so each save keeps the records of the other targets
+        nonlocal shared_manifest
+        with manifest_lock:
+            if shared_manifest is None:
+                shared_manifest = DeploymentManifest(manifest_path, workspace_id, environment)
+                return shared_manifest
+            return shared_manifest.for_target(workspace_id, environment)
+
+    def publish_target(target: dict) -> dict:
+        environment = target.get("environment", "N/A")
+        result = {
+            "workspace_id": target.get("workspace_id") or target.get("workspace_name"),
+            "environment": environment,
+            "status": "Succeeded",
+            "items": 0,
+            "unchanged": 0,
+            "seconds": 0.0,
+            "error": None,
+        }
+        start_time = time.perf_counter()
+        try:
+            fabric_workspace_obj = FabricWorkspace(
+                repository_directory=repository_directory,
+                item_type_in_scope=item_type_in_scope,
+                environment=environment,
+                workspace_id=target.get("workspace_id"),
+                workspace_name=target.get("workspace_name"),
+                endpoint=endpoint,
+                repository_scan=repository_scan,
+            )
+            result["workspace_id"] = fabric_workspace_obj.workspace_id
+            if manifest_path is not None:
+                fabric_workspace_obj.deployment_manifest = get_manifest(
+                    fabric_workspace_obj.workspace_id, fabric_workspace_obj.environment
+                )
+
+            publish_all_items(
+                fabric_workspace_obj,
+                item_name_exclude_regex=item_name_exclude_regex,
+                max_workers=max_workers,
+                force_publish=force_publish,
+            )
+            result["items"] = fabric_workspace_obj.publish_counts["published"]
+            result["unchanged"] = fabric_workspace_obj.publish_counts["unchanged"]
+        except Exception as e:
+            errors[id(result)] = e
+            result["status"] = "Failed"
+            result["error"] = str(e)
+            logger.error(f"Failed to publish to workspace '{result['workspace_id']}' ({environment})")
+        result["seconds"] = round(time.perf_counter() - start_time, 3)
+        return result
+
+    try:
+        results = run_concurrently(publish_target, targets, max_concurrent_workspaces, buffer_output=False)
+    finally:
+        endpoint.close()
+
+    print_header("Workspace Deployment Summary")
+    for result in results:
+        message = (
+            f"{result['status']}: workspace '{result['workspace_id']}' ({result['environment']}), "
+            f"{result['items']} items published and {result['unchanged']} unchanged in {result['seconds']} seconds"
+        )
+        if result["error"] is None:
+            logger.info(message)
+        else:
+            logger.error(f"{message}. {result['error']}")
+
+    failures = [errors[id(result)] for result in results if id(result) in errors]
+    if failures:
+        raise failures[0]
+
+    return results
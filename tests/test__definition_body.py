@@ -0,0 +1,47 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+import base64
+import json
+
+from fabric_cicd._common._definition_body import DefinitionBody
+from fabric_cicd._common._deployment_manifest import hash_payload
+from fabric_cicd._common._file import File
+
+
+def make_parts(tmp_path):
+    item_path = tmp_path / "ABC.Report"
+    (item_path / "StaticResources").mkdir(parents=True)
+    (item_path / "definition.pbir").write_text('{"version": "4.0", "name": "Répertoire"}', encoding="utf-8")
+    (item_path / "StaticResources" / "logo.png").write_bytes(b"\x89PNG\r\n\x1a\n" + bytes(range(256)) * 10)
+    return [
+        File(item_path=item_path, file_path=item_path / "definition.pbir"),
+        File(item_path=item_path, file_path=item_path / "StaticResources" / "logo.png"),
+    ]
+
+
+def test_definition_body_streams_sorted_json(tmp_path):
+    parts = make_parts(tmp_path)
+    metadata = {"type": "Report", "displayName": "ABC"}
+    body = DefinitionBody(parts, metadata)
+    expected = {**metadata, "definition": {"parts": [part.base64_payload for part in parts]}}
+
+    serialized = b"".join(body)
+    assert serialized == json.dumps(expected, sort_keys=True).encode("utf-8")
+    assert len(body) == len(serialized)
+    assert hash_payload(body) == hash_payload(expected)
+    assert base64.b64decode(json.loads(serialized)["definition"]["parts"][1]["payload"]).startswith(b"\x89PNG")
+
+    # The body can be sent again, e.g. when a throttled request is retried
+    assert b"".join(body) == serialized
+
+
+def test_definition_body_with_fields(tmp_path):
+    parts = make_parts(tmp_path)
+    body = DefinitionBody(parts).with_fields(folderId=None)
+
+    assert json.loads(b"".join(body)) == {
+        "definition": {"parts": [part.base64_payload for part in parts]},
+        "folderId": None,
+    }
+    assert json.loads(b"".join(DefinitionBody([]))) == {"definition": {"parts": []}}
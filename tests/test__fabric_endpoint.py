@@ -3,8 +3,12 @@
 
 import base64
 import datetime
+import email.utils
+import io
 import json
+import threading
 import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from unittest.mock import Mock
 
 import pytest
@@ -12,7 +16,14 @@ from azure.core.exceptions import ClientAuthenticationError
 
 from fabric_cicd import constants
 from fabric_cicd._common._exceptions import InvokeError, TokenError
-from fabric_cicd._common._fabric_endpoint import FabricEndpoint, _decode_jwt, _format_invoke_log, _handle_response
+from fabric_cicd._common._fabric_endpoint import (
+    FabricEndpoint,
+    _decode_jwt,
+    _format_invoke_log,
+    _handle_response,
+    parse_retry_after,
+)
+from fabric_cicd._common._rate_limiter import get_route_family
 
 
 class DummyLogger:
@@ -45,7 +56,7 @@ def setup_mocks(monkeypatch, mocker):
     mock_logger.info.side_effect = dl.info
     mock_logger.debug.side_effect = dl.debug
     monkeypatch.setattr("fabric_cicd._common._fabric_endpoint.logger", mock_logger)
-    mock_requests = mocker.patch("requests.request")
+    mock_requests = mocker.patch("requests.Session.request")
     return dl, mock_requests
 
 
@@ -62,7 +73,7 @@ def generate_mock_jwt(authtype=""):
 
 def test_integration(setup_mocks):
     """Test integration of FabricEndpoint for GET request."""
-    dl, mock_requests = setup_mocks
+    _dl, mock_requests = setup_mocks
     mock_requests.return_value = Mock(
         status_code=200, headers={"Content-Type": "application/json"}, json=Mock(return_value={})
     )
@@ -73,9 +84,252 @@ def test_integration(setup_mocks):
     assert response["status_code"] == 200
 
 
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        # Drain the request body so the keep-alive connection can serve the next request
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        body = b"{}"
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *_):
+        pass
+
+
+@pytest.fixture
+def keep_alive_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), KeepAliveHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_pooled_connections_are_reused(keep_alive_server):
+    """Test that sequential requests reuse the pooled keep-alive connection and are counted."""
+    mock_token_credential = Mock()
+    mock_token_credential.get_token.return_value.token = generate_mock_jwt()
+    endpoint = FabricEndpoint(token_credential=mock_token_credential, pool_maxsize=2)
+
+    for _ in range(3):
+        response = endpoint.invoke("GET", keep_alive_server)
+        assert response["status_code"] == 200
+    endpoint.close()
+
+    assert endpoint.connection_stats.opened == 1
+    assert endpoint.connection_stats.reused == 2
+
+
+def test_injected_requests_module_without_sessions():
+    """Test that an injected requests module without sessions is still used to send requests."""
+    mock_module = Mock(spec=["request"])
+    mock_module.request.return_value = Mock(
+        status_code=200, headers={"Content-Type": "application/json"}, json=Mock(return_value={})
+    )
+    mock_token_credential = Mock()
+    mock_token_credential.get_token.return_value.token = generate_mock_jwt()
+    endpoint = FabricEndpoint(token_credential=mock_token_credential, requests_module=mock_module)
+
+    response = endpoint.invoke("GET", "http://example.com")
+
+    assert response["status_code"] == 200
+    mock_module.request.assert_called_once()
+
+
+def mock_operation_response(status_code, headers=None, body=None):
+    return Mock(
+        status_code=status_code,
+        headers={"Content-Type": "application/json", **(headers or {})},
+        json=Mock(return_value=body or {}),
+    )
+
+
+def test_invoke_async_polls_operation(setup_mocks):
+    """Test that a long-running operation is polled in the background until its result is available."""
+    _dl, mock_requests = setup_mocks
+    responses = {
+        "http://example.com/items": [
+            mock_operation_response(202, {"Location": "http://example.com/operation", "Retry-After": "0"})
+        ],
+        "http://example.com/operation": [
+            mock_operation_response(200, {"Retry-After": "0"}, {"status": "Running"}),
+            mock_operation_response(200, {"Location": "http://example.com/result"}, {"status": "Succeeded"}),
+        ],
+        "http://example.com/result": [mock_operation_response(200, body={"id": "item-guid"})],
+    }
+    mock_requests.side_effect = lambda url, **_kwargs: responses[url].pop(0)
+    mock_token_credential = Mock()
+    mock_token_credential.get_token.return_value.token = generate_mock_jwt()
+    endpoint = FabricEndpoint(token_credential=mock_token_credential)
+
+    future = endpoint.invoke_async("POST", "http://example.com/items")
+
+    assert future.result(timeout=5)["body"] == {"id": "item-guid"}
+    assert endpoint.operation_poller.pending == 0
+    endpoint.close()
+
+
+def test_invoke_async_operation_failed(setup_mocks):
+    """Test that a failed long-running operation fails its future."""
+    _dl, mock_requests = setup_mocks
+    mock_requests.side_effect = [
+        mock_operation_response(202, {"Location": "http://example.com/operation", "Retry-After": "0"}),
+        mock_operation_response(200, body={"status": "Failed", "error": {"errorCode": "Code", "message": "Bad"}}),
+    ]
+    mock_token_credential = Mock()
+    mock_token_credential.get_token.return_value.token = generate_mock_jwt()
+    endpoint = FabricEndpoint(token_credential=mock_token_credential)
+
+    future = endpoint.invoke_async("POST", "http://example.com/items")
+
+    with pytest.raises(InvokeError, match="Operation failed for POST on"):
+        future.result(timeout=5)
+    endpoint.close()
+
+
+def test_operation_poller_fails_pending_operations_on_error(monkeypatch):
+    """Test that pending operations fail instead of waiting forever when the polling loop stops unexpectedly."""
+    from fabric_cicd._common._operation_poller import OperationPoller
+
+    poller = OperationPoller(invoke=Mock())
+
+    def check(_operation):
+        msg = "poller bug"
+        raise RuntimeError(msg)
+
+    monkeypatch.setattr(poller, "_check", check)
+    first = poller.submit("http://example.com/operation-1", retry_after=0, description="first")
+    second = poller.submit("http://example.com/operation-2", retry_after=60, description="second")
+
+    with pytest.raises(RuntimeError, match="poller bug"):
+        first.result(timeout=5)
+    with pytest.raises(RuntimeError, match="poller bug"):
+        second.result(timeout=5)
+    with pytest.raises(InvokeError):
+        poller.submit("http://example.com/operation-3")
+
+
+def test_invoke_async_without_operation(setup_mocks):
+    """Test that a response that does not start an operation resolves the future straight away."""
+    _dl, mock_requests = setup_mocks
+    mock_requests.return_value = mock_operation_response(201, body={"id": "item-guid"})
+    mock_token_credential = Mock()
+    mock_token_credential.get_token.return_value.token = generate_mock_jwt()
+    endpoint = FabricEndpoint(token_credential=mock_token_credential)
+
+    future = endpoint.invoke_async("POST", "http://example.com/items")
+
+    assert future.done()
+    assert future.result()["body"] == {"id": "item-guid"}
+
+
+@pytest.mark.parametrize(
+    ("url", "expected_family"),
+    [
+        ("https://api.fabric.microsoft.com/v1/workspaces/ws-id/items/item-id/updateDefinition", "items"),
+        ("https://api.fabric.microsoft.com/v1/workspaces/ws-id/items/item-id/shortcuts/Tables/a", "shortcuts"),
+        ("https://api.fabric.microsoft.com/v1/workspaces/ws-id/environments/env-id/staging/publish", "environments"),
+        ("https://api.fabric.microsoft.com/v1/workspaces", "workspaces"),
+        ("https://api.fabric.microsoft.com/v1/operations/operation-id", "operations"),
+    ],
+)
+def test_get_route_family(url, expected_family):
+    """Test that URLs are grouped by the API route they call."""
+    assert get_route_family(url) == expected_family
+
+
+def test_invoke_throttled_pauses_route(setup_mocks):
+    """Test that a throttled call pauses its route family and is counted before being retried."""
+    _dl, mock_requests = setup_mocks
+    mock_requests.side_effect = [
+        mock_operation_response(429, {"Retry-After": "0.01"}),
+        mock_operation_response(200, body={"id": "item-guid"}),
+    ]
+    mock_token_credential = Mock()
+    mock_token_credential.get_token.return_value.token = generate_mock_jwt()
+    endpoint = FabricEndpoint(token_credential=mock_token_credential)
+
+    response = endpoint.invoke("GET", "https://api.fabric.microsoft.com/v1/workspaces/ws-id/items/item-id")
+
+    stats = endpoint.throttling_stats
+    assert response["body"] == {"id": "item-guid"}
+    assert stats["items"]["requests"] == 2
+    assert stats["items"]["throttled"] == 1
+    assert stats["items"]["waited"] > 0
+
+
+def test_invoke_throttled_upload_rewinds_file(setup_mocks):
+    """Test that a retried upload sends its file from the start again."""
+    _dl, mock_requests = setup_mocks
+    uploaded = []
+
+    def request(*_args, **kwargs):
+        uploaded.append(kwargs["files"]["file"][1].read())
+        if len(uploaded) == 1:
+            return mock_operation_response(429, {"Retry-After": "0"})
+        return mock_operation_response(200, body={})
+
+    mock_requests.side_effect = request
+    mock_token_credential = Mock()
+    mock_token_credential.get_token.return_value.token = generate_mock_jwt()
+    endpoint = FabricEndpoint(token_credential=mock_token_credential)
+
+    endpoint.invoke(
+        "POST",
+        "https://api.fabric.microsoft.com/v1/workspaces/ws-id/environments/env-id/staging/libraries",
+        files={"file": ("lib.whl", io.BytesIO(b"wheel"))},
+    )
+
+    assert uploaded == [b"wheel", b"wheel"]
+
+
+def test_invoke_throttled_max_retries(setup_mocks, monkeypatch):
+    """Test that a call throttled too many times raises."""
+    _dl, mock_requests = setup_mocks
+    monkeypatch.setattr(constants, "RATE_LIMIT_MAX_RETRIES", 2)
+    mock_requests.return_value = mock_operation_response(429, {"Retry-After": "0"})
+    mock_token_credential = Mock()
+    mock_token_credential.get_token.return_value.token = generate_mock_jwt()
+    endpoint = FabricEndpoint(token_credential=mock_token_credential)
+
+    with pytest.raises(InvokeError, match=r"Maximum retry attempts \(2\) exceeded."):
+        endpoint.invoke("GET", "https://api.fabric.microsoft.com/v1/workspaces/ws-id/items")
+    assert endpoint.throttling_stats["items"]["throttled"] == 2
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        (None, 60),
+        ("10", 10.0),
+        ("0.5", 0.5),
+        ("-3", 0.0),
+        ("soon", 60),
+        ("Wed, 21 Oct 2015 07:28:00 GMT", 0.0),
+    ],
+    ids=["missing", "seconds", "fractional", "negative", "invalid", "past_date"],
+)
+def test_parse_retry_after(value, expected):
+    """Test that Retry-After headers are parsed to seconds, falling back to the default."""
+    assert parse_retry_after(value, default=60) == expected
+
+
+def test_parse_retry_after_future_date():
+    """Test that an HTTP date Retry-After is converted to the seconds left until it."""
+    retry_at = datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(seconds=120)
+
+    assert 100 < parse_retry_after(email.utils.format_datetime(retry_at, usegmt=True), default=60) <= 120
+
+
 def test_performance(setup_mocks):
     """Test that _handle_response completes quickly under long-running simulation."""
-    dl, mock_requests = setup_mocks
+    _dl, _mock_requests = setup_mocks
     response = Mock(status_code=200, headers={}, json=Mock(return_value={"status": "Succeeded"}))
     start_time = time.time()
     _handle_response(
@@ -100,7 +354,7 @@ def test_performance(setup_mocks):
 )
 def test_invoke(setup_mocks, method, url, body, files):
     """Test FabricEndpoint invoke method success + with optional files."""
-    dl, mock_requests = setup_mocks
+    _dl, mock_requests = setup_mocks
     mock_requests.return_value = Mock(
         status_code=200, headers={"Content-Type": "application/json"}, json=Mock(return_value={})
     )
@@ -134,7 +388,7 @@ def test_invoke_token_expired(setup_mocks, monkeypatch):
 
 def test_invoke_exception(setup_mocks):
     """Test invoking endpoint when the AAD token is expired and refreshed."""
-    dl, mock_requests = setup_mocks
+    _dl, mock_requests = setup_mocks
     mock_requests.side_effect = Exception("Test exception")
     mock_token_credential = Mock()
     mock_token_credential.get_token.return_value.token = generate_mock_jwt()
@@ -190,7 +444,7 @@ def test_refresh_token_no_exp_claim(monkeypatch):
     test_token = "dummy_token_value"
     credential = DummyCredential(test_token)
     monkeypatch.setattr("fabric_cicd._common._fabric_endpoint._decode_jwt", lambda _: {"upn": "user@example.com"})
-    with pytest.raises(TokenError, match="Token does not contain expiration claim."):
+    with pytest.raises(TokenError, match=r"Token does not contain expiration claim\."):
         FabricEndpoint(token_credential=credential)
 
 
@@ -233,7 +487,7 @@ def test_handle_response(
     """Test _handle_response behavior for various HTTP responses and long-running operations."""
     response = Mock(status_code=status_code, headers=response_header, json=Mock(return_value=response_json))
 
-    exit_loop, _method, url, _body, long_running = _handle_response(
+    exit_loop, _method, _url, _body, long_running = _handle_response(
         response=response,
         method=request_method,
         url="old",
@@ -313,14 +567,12 @@ def test_handle_response_longrunning_exception(exception_match, response_json):
             {"message": "Internal Server Error"},
             "Unhandled error occurred calling GET on 'http://example.com'. Message: Internal Server Error",
         ),
-        (429, 5, True, {"Retry-After": "10"}, {}, r"Maximum retry attempts \(5\) exceeded."),
     ],
     ids=[
         "unauthorized",
         "principal_type_not_supported",
         "failed_library_removal",
         "unexpected_error",
-        "retry",
     ],
 )
 def test_handle_response_exceptions(
@@ -342,7 +594,7 @@ def test_handle_response_exceptions(
 def test_handle_response_feature_not_available():
     """Test _handle_response for feature not available"""
     response = Mock(status_code=403, reason="FeatureNotAvailable")
-    with pytest.raises(Exception, match="Item type not supported. Description: FeatureNotAvailable"):
+    with pytest.raises(Exception, match=r"Item type not supported\. Description: FeatureNotAvailable"):
         _handle_response(
             response=response,
             method="GET",
@@ -355,7 +607,7 @@ def test_handle_response_feature_not_available():
 
 def test_handle_response_item_display_name_already_in_use(setup_mocks):
     """Test _handle_response logs a retry message when item display name is already in use."""
-    dl, mock_requests = setup_mocks
+    dl, _mock_requests = setup_mocks
     response = Mock(status_code=400, headers={"x-ms-public-api-error-code": "ItemDisplayNameNotAvailableYet"})
     _handle_response(response, "GET", "http://example.com", "{}", False, 1)
     expected = f"{constants.INDENT}Item name is reserved. Checking again in 60 seconds (Attempt 1)..."
@@ -364,9 +616,9 @@ def test_handle_response_item_display_name_already_in_use(setup_mocks):
 
 def test_handle_response_environment_libraries_not_found(setup_mocks):
     """Test _handle_response exits loop when environment libraries are not found (404)."""
-    dl, mock_requests = setup_mocks
+    _dl, _mock_requests = setup_mocks
     response = Mock(status_code=404, headers={"x-ms-public-api-error-code": "EnvironmentLibrariesNotFound"})
-    exit_loop, method, url, body, long_running = _handle_response(
+    exit_loop, _method, _url, _body, long_running = _handle_response(
         response=response,
         method="GET",
         url="http://example.com",
@@ -2,6 +2,7 @@
 # Licensed under the MIT License.
 
 import base64
+import json
 from pathlib import Path
 
 import pytest
@@ -90,3 +91,99 @@ def test_file_text_special_characters(tmp_path):
         "payload": expected_payload,
         "payloadType": "InlineBase64",
     }
+
+
+def test_file_contents_loaded_lazily(tmp_path, mocker):
+    item_path = tmp_path / "workspace/ABC.Environment"
+    file_path = item_path / "Libraries/CustomLibraries/library.whl"
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    file_path.write_text(SAMPLE_TEXT_DATA)
+    check_file_type = mocker.patch("fabric_cicd._common._file.check_file_type", return_value="text")
+
+    file_obj = File(item_path=item_path, file_path=file_path)
+
+    # Nothing is read until the type or contents are accessed
+    assert file_obj.name == "library.whl"
+    assert file_obj.relative_path == "Libraries/CustomLibraries/library.whl"
+    check_file_type.assert_not_called()
+
+    file_path.write_text("updated text")
+    assert file_obj.contents == "updated text"
+    check_file_type.assert_called_once()
+
+
+def test_file_read_error_raised(tmp_path, mocker):
+    from fabric_cicd._common._exceptions import FileTypeError
+
+    item_path = tmp_path / "workspace/ABC.Notebook"
+    file_path = item_path / "notebook-content.py"
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    file_path.write_text(SAMPLE_TEXT_DATA)
+    mocker.patch("fabric_cicd._common._file.check_file_type", return_value="text")
+    file_path.unlink()
+
+    file_obj = File(item_path=item_path, file_path=file_path)
+
+    # A file that cannot be read fails instead of being published empty
+    with pytest.raises(FileTypeError, match="as text") as exc_info:
+        _ = file_obj.contents
+    assert isinstance(exc_info.value.__cause__, FileNotFoundError)
+
+
+def test_file_json_contents_parsed_once(tmp_path, mocker):
+    item_path = tmp_path / "workspace/ABC.DataPipeline"
+    file_path = item_path / "pipeline-content.json"
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    file_path.write_text('{"name": "pipeline", "activities": []}')
+    file_obj = File(item_path=item_path, file_path=file_path)
+    expected = json.dumps({"name": "pipeline", "activities": ["first", "second"]}, indent=2)
+    loads = mocker.spy(json, "loads")
+    dumps = mocker.spy(json, "dumps")
+
+    # Consecutive JSON updates share one parse, and the text is only serialized once it is needed
+    data = file_obj.json_contents
+    data["activities"].append("first")
+    file_obj.set_json_contents(data)
+    data = file_obj.json_contents
+    data["activities"].append("second")
+    file_obj.set_json_contents(data, indent=2)
+    assert loads.call_count == 1
+    assert dumps.call_count == 0
+
+    assert file_obj.contents == expected
+    assert file_obj.contents == expected
+    assert dumps.call_count == 1
+
+    # Reading the parsed contents again does not need a new parse until the text is replaced
+    assert file_obj.json_contents["activities"] == ["first", "second"]
+    assert loads.call_count == 1
+    file_obj.contents = '{"name": "replaced"}'
+    assert file_obj.json_contents == {"name": "replaced"}
+    assert loads.call_count == 2
+
+
+def test_file_base64_payload_streamed_in_chunks(tmp_path, mocker):
+    item_path = tmp_path / "workspace/ABC.SemanticModel"
+    text_path = item_path / "definition/model.tmdl"
+    binary_path = item_path / "StaticResources/image.png"
+    text_path.parent.mkdir(parents=True, exist_ok=True)
+    binary_path.parent.mkdir(parents=True, exist_ok=True)
+    text_path.write_text("model Model\n    culture: ja-JP ✓ モデル\n" * 50, encoding="utf-8")
+    binary_path.write_bytes(bytes(range(256)) * 40)
+    text_file = File(item_path=item_path, file_path=text_path)
+    binary_file = File(item_path=item_path, file_path=binary_path)
+    mocker.patch(
+        "fabric_cicd._common._file.check_file_type", side_effect=lambda path: "image" if path == binary_path else "text"
+    )
+
+    # Chunks split multi-byte characters and groups of 3 bytes, joined they are still the full payload
+    for file_obj in (text_file, binary_file):
+        chunks = list(file_obj.iter_base64_payload(chunk_size=7))
+        assert len(chunks) > 1
+        expected = base64.b64encode(file_obj.file_path.read_bytes())
+        assert b"".join(chunks) == expected
+        assert file_obj.base64_payload_size == len(expected)
+
+    # Binary files are read from disk as they are encoded, without being kept in memory
+    assert binary_file._contents is None
+    assert binary_file.base64_payload["payload"] == base64.b64encode(binary_path.read_bytes()).decode("utf-8")
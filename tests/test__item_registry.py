@@ -0,0 +1,56 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+from pathlib import Path
+
+from fabric_cicd._common._item import Item
+from fabric_cicd._common._item_registry import ItemRegistry
+
+
+def make_items():
+    return {
+        "DataPipeline": {
+            f"Pipeline {i}": Item(
+                type="DataPipeline",
+                name=f"Pipeline {i}",
+                description="",
+                guid=f"guid-{i}" if i % 2 else "",
+                logical_id=f"logical-id-{i}",
+                path=Path(f"/repo/Pipeline {i}.DataPipeline"),
+            )
+            for i in range(1000)
+        }
+    }
+
+
+def test_lookups_by_logical_id_guid_and_path():
+    registry = ItemRegistry(make_items())
+
+    assert registry.get_by_logical_id("DataPipeline", "logical-id-42").name == "Pipeline 42"
+    assert registry.get_by_guid("DataPipeline", "guid-43").name == "Pipeline 43"
+    assert registry.get_by_path("DataPipeline", "/repo/Pipeline 44.DataPipeline").name == "Pipeline 44"
+    assert registry.get_by_guid("DataPipeline", "guid-42") is None
+    assert registry.get_by_logical_id("Notebook", "logical-id-42") is None
+
+
+def test_first_item_wins_for_duplicated_keys():
+    first = Item(type="Notebook", name="First", description="", guid="", logical_id="shared")
+    second = Item(type="Notebook", name="Second", description="", guid="", logical_id="shared")
+    registry = ItemRegistry({"Notebook": {"First": first, "Second": second}})
+
+    assert registry.get_by_logical_id("Notebook", "shared") is first
+
+    registry.remove(first)
+    assert registry.get_by_logical_id("Notebook", "shared") is None
+
+
+def test_guid_indexed_once_assigned():
+    items = make_items()
+    registry = ItemRegistry(items)
+    item = items["DataPipeline"]["Pipeline 42"]
+
+    item.guid = "new-guid"
+    registry.add(item)
+
+    assert registry.get_by_guid("DataPipeline", "new-guid") is item
+    assert registry.get_by_logical_id("DataPipeline", "logical-id-42") is item
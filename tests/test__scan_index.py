@@ -0,0 +1,39 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+import os
+
+from fabric_cicd._common._scan_index import ScanIndex
+
+
+def test_scan_index_checks_content_hash(tmp_path, mocker):
+    index_path = tmp_path / "index.json"
+    file_path = tmp_path / "repo" / "notebook-content.py"
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    file_path.write_text("print('a')", encoding="utf-8")
+    # Modified long before it is hashed, so its modification time alone can be trusted
+    old_mtime_ns = 1_000_000_000_000_000_000
+    os.utime(file_path, ns=(old_mtime_ns, old_mtime_ns))
+
+    scan_index = ScanIndex(index_path, tmp_path / "repo")
+    scan_index.set(file_path, "type", "text")
+    scan_index.save()
+
+    # An unchanged file is not opened
+    hash_spy = mocker.spy(ScanIndex, "_hash")
+    scan_index = ScanIndex(index_path, tmp_path / "repo")
+    assert scan_index.get(file_path, "type") == "text"
+    hash_spy.assert_not_called()
+
+    # A fresh checkout only changes the modification time, the content hash still matches
+    os.utime(file_path, ns=(old_mtime_ns + 1, old_mtime_ns + 1))
+    assert scan_index.get(file_path, "type") == "text"
+    assert hash_spy.call_count == 1
+
+    # A change of the same size made in the same modification time tick is found by the hash
+    file_path.write_text("print('b')", encoding="utf-8")
+    mtime_ns = file_path.stat().st_mtime_ns
+    scan_index.set(file_path, "type", "text")
+    file_path.write_text("print('c')", encoding="utf-8")
+    os.utime(file_path, ns=(mtime_ns, mtime_ns))
+    assert scan_index.get(file_path, "type") is None
@@ -0,0 +1,125 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+import threading
+
+import pytest
+
+from fabric_cicd._common._exceptions import ItemDependencyError
+from fabric_cicd._common._scheduler import run_concurrently, run_with_dependencies
+
+
+def test_run_concurrently_preserves_input_order():
+    assert run_concurrently(lambda value: value * 2, [3, 1, 2], max_workers=3) == [6, 2, 4]
+
+
+def test_run_concurrently_raises_first_error():
+    def func(value):
+        if value == 2:
+            msg = "boom"
+            raise ValueError(msg)
+        return value
+
+    with pytest.raises(ValueError, match="boom"):
+        run_concurrently(func, [1, 2, 3], max_workers=2)
+
+
+def test_run_concurrently_writes_output_per_call():
+    import io
+    import logging
+
+    from fabric_cicd._common._logging import _BufferingFilter
+
+    stream = io.StringIO()
+    handler = logging.StreamHandler(stream)
+    handler.addFilter(_BufferingFilter(handler))
+    test_logger = logging.getLogger("fabric_cicd.test_scheduler")
+    test_logger.addHandler(handler)
+    test_logger.setLevel(logging.INFO)
+    barrier = threading.Barrier(2)
+
+    def func(name):
+        test_logger.info(f"{name} start")
+        # Both calls log while the other one is running
+        barrier.wait(timeout=5)
+        test_logger.info(f"{name} end")
+
+    try:
+        run_concurrently(func, ["a", "b"], max_workers=2)
+    finally:
+        test_logger.removeHandler(handler)
+
+    lines = stream.getvalue().splitlines()
+    assert sorted(lines) == ["a end", "a start", "b end", "b start"]
+    assert lines[0].split()[0] == lines[1].split()[0]
+    assert lines[2].split()[0] == lines[3].split()[0]
+
+
+def test_run_with_dependencies_sequential_keeps_order():
+    order = []
+    tasks = {name: (lambda name=name: order.append(name)) for name in ["A", "B", "C"]}
+
+    run_with_dependencies(tasks, {"C": ["A"]}, max_workers=1)
+
+    assert order == ["A", "B", "C"]
+
+
+def test_run_with_dependencies_waits_for_dependencies():
+    order = []
+    lock = threading.Lock()
+
+    def record(name):
+        with lock:
+            order.append(name)
+
+    tasks = {name: (lambda name=name: record(name)) for name in ["Report", "SemanticModel", "Notebook", "Lakehouse"]}
+    dependencies = {"Report": ["SemanticModel"], "Notebook": ["Lakehouse"], "Unknown": ["Report"]}
+
+    run_with_dependencies(tasks, dependencies, max_workers=4)
+
+    assert sorted(order) == sorted(tasks)
+    assert order.index("SemanticModel") < order.index("Report")
+    assert order.index("Lakehouse") < order.index("Notebook")
+
+
+def test_run_with_dependencies_writes_output_per_task():
+    import io
+    import logging
+
+    from fabric_cicd._common._logging import _BufferingFilter
+
+    stream = io.StringIO()
+    handler = logging.StreamHandler(stream)
+    handler.addFilter(_BufferingFilter(handler))
+    test_logger = logging.getLogger("fabric_cicd.test_scheduler")
+    test_logger.addHandler(handler)
+    test_logger.setLevel(logging.INFO)
+    barrier = threading.Barrier(4)
+
+    def publish_item(name):
+        # Every item of both tasks logs while the others are running
+        barrier.wait(timeout=5)
+        test_logger.info(f"{name} item")
+
+    def publish_item_type(name):
+        test_logger.info(f"{name} header")
+        run_concurrently(publish_item, [name, name], max_workers=2)
+
+    tasks = {name: (lambda name=name: publish_item_type(name)) for name in ["a", "b"]}
+    try:
+        run_with_dependencies(tasks, {}, max_workers=2)
+    finally:
+        test_logger.removeHandler(handler)
+
+    lines = stream.getvalue().splitlines()
+    assert sorted(lines) == ["a header", "a item", "a item", "b header", "b item", "b item"]
+    # The header of each task is written with the output of its items
+    first = lines[0].split()[0]
+    assert lines[:3] == [f"{first} header", f"{first} item", f"{first} item"]
+
+
+def test_run_with_dependencies_detects_cycle():
+    tasks = {"A": lambda: None, "B": lambda: None}
+
+    with pytest.raises(ItemDependencyError, match="Circular dependency"):
+        run_with_dependencies(tasks, {"A": ["B"], "B": ["A"]}, max_workers=2)
@@ -2,6 +2,7 @@
 # Licensed under the MIT License.
 
 import json
+import os
 import tempfile
 from pathlib import Path
 from unittest.mock import MagicMock, patch
@@ -813,3 +814,1059 @@ def test_single_empty_logical_id_validation_message(temp_workspace_dir, patched_
     assert "logicalId cannot be empty in " in error_message
     assert "following files:" not in error_message
     assert str(platform_file_path) in error_message
+
+
+def test_publish_item_skips_unchanged_definition(temp_workspace_dir, patched_fabric_workspace, valid_workspace_id):
+    """Test that an item unchanged since the last deployment recorded in the manifest is not updated."""
+    from concurrent.futures import Future
+
+    from fabric_cicd._common._deployment_manifest import DeploymentManifest
+    from fabric_cicd._common._item import Item
+
+    item_dir = temp_workspace_dir / "TestItem.Notebook"
+    item_dir.mkdir(parents=True, exist_ok=True)
+    metadata_content = {
+        "metadata": {"type": "Notebook", "displayName": "Test Notebook"},
+        "config": {"logicalId": "test-logical-id"},
+    }
+    with (item_dir / ".platform").open("w", encoding="utf-8") as f:
+        json.dump(metadata_content, f)
+    with (item_dir / "notebook-content.py").open("w", encoding="utf-8") as f:
+        f.write("print('Hello World')")
+
+    workspace = patched_fabric_workspace(
+        workspace_id=valid_workspace_id,
+        repository_directory=str(temp_workspace_dir),
+        item_type_in_scope=["Notebook"],
+    )
+    workspace.repository_items["Notebook"]["Test Notebook"].guid = "deployed-guid"
+    workspace.deployed_items = {
+        "Notebook": {"Test Notebook": Item(type="Notebook", name="Test Notebook", description="", guid="deployed-guid")}
+    }
+    manifest_path = temp_workspace_dir / "manifest.json"
+    workspace.deployment_manifest = DeploymentManifest(manifest_path, valid_workspace_id, workspace.environment)
+
+    completed = Future()
+    completed.set_result({"body": {}})
+    workspace.endpoint.invoke_async.return_value = completed
+
+    workspace._publish_item(item_name="Test Notebook", item_type="Notebook")
+    workspace.deployment_manifest.save()
+    assert workspace.endpoint.invoke_async.call_count == 1
+
+    # Reload the manifest as a new deployment would
+    workspace.deployment_manifest = DeploymentManifest(manifest_path, valid_workspace_id, workspace.environment)
+    workspace._publish_item(item_name="Test Notebook", item_type="Notebook")
+    assert workspace.endpoint.invoke_async.call_count == 1
+    assert workspace.publish_counts == {"published": 1, "unchanged": 1}
+
+    workspace.force_publish = True
+    workspace._publish_item(item_name="Test Notebook", item_type="Notebook")
+    assert workspace.endpoint.invoke_async.call_count == 2
+
+    # A different environment of the same workspace does not share the recorded hashes
+    workspace.force_publish = False
+    workspace.deployment_manifest = DeploymentManifest(manifest_path, valid_workspace_id, "PROD")
+    workspace._publish_item(item_name="Test Notebook", item_type="Notebook")
+    assert workspace.endpoint.invoke_async.call_count == 3
+
+
+def test_publish_item_logs_published_after_update_completes(
+    temp_workspace_dir, patched_fabric_workspace, valid_workspace_id, caplog
+):
+    """Test that an item is only logged as published once its definition update completes."""
+    import logging
+    from concurrent.futures import Future
+
+    from fabric_cicd._common._item import Item
+
+    item_dir = temp_workspace_dir / "TestItem.Notebook"
+    item_dir.mkdir(parents=True, exist_ok=True)
+    metadata_content = {
+        "metadata": {"type": "Notebook", "displayName": "Test Notebook"},
+        "config": {"logicalId": "test-logical-id"},
+    }
+    with (item_dir / ".platform").open("w", encoding="utf-8") as f:
+        json.dump(metadata_content, f)
+    with (item_dir / "notebook-content.py").open("w", encoding="utf-8") as f:
+        f.write("print('Hello World')")
+
+    workspace = patched_fabric_workspace(
+        workspace_id=valid_workspace_id,
+        repository_directory=str(temp_workspace_dir),
+        item_type_in_scope=["Notebook"],
+    )
+    workspace.repository_items["Notebook"]["Test Notebook"].guid = "deployed-guid"
+    workspace.deployed_items = {
+        "Notebook": {"Test Notebook": Item(type="Notebook", name="Test Notebook", description="", guid="deployed-guid")}
+    }
+    queued = Future()
+    workspace.endpoint.invoke_async.return_value = queued
+
+    with caplog.at_level(logging.INFO, logger="fabric_cicd.fabric_workspace"):
+        workspace._publish_item(item_name="Test Notebook", item_type="Notebook")
+        assert "Definition update submitted" in caplog.text
+        assert "Published Notebook 'Test Notebook'" not in caplog.text
+
+        queued.set_result({"body": {}})
+        workspace._wait_for_pending_operations()
+    assert "Published Notebook 'Test Notebook'" in caplog.text
+
+
+def test_publish_item_type_waits_for_pending_operations_on_failure(
+    temp_workspace_dir, patched_fabric_workspace, valid_workspace_id, monkeypatch, caplog
+):
+    """Test that the updates already submitted are waited for and reported when publishing an item type fails."""
+    import logging
+    from concurrent.futures import Future
+
+    from fabric_cicd import publish
+
+    workspace = patched_fabric_workspace(
+        workspace_id=valid_workspace_id,
+        repository_directory=str(temp_workspace_dir),
+        item_type_in_scope=["Notebook"],
+    )
+    completed = Future()
+    completed.set_result({"body": {}})
+    failed = Future()
+    failed.set_exception(Exception("Update rejected"))
+
+    def publish_notebooks(fabric_workspace_obj):
+        fabric_workspace_obj._pending_operations.append(("Notebook", "Completed Notebook", completed))
+        fabric_workspace_obj._pending_operations.append(("Notebook", "Failed Notebook", failed))
+        msg = "Invalid definition"
+        raise ValueError(msg)
+
+    monkeypatch.setitem(publish._PUBLISH_STEPS, "Notebook", ("Publishing Notebooks", publish_notebooks))
+
+    caplog.set_level(logging.INFO, logger="fabric_cicd.fabric_workspace")
+    with pytest.raises(ValueError, match="Invalid definition"):
+        publish._publish_item_type(workspace, "Notebook")
+
+    assert workspace._pending_operations == []
+    assert "Published Notebook 'Completed Notebook'" in caplog.text
+    assert "Failed to publish Notebook 'Failed Notebook'. Update rejected" in caplog.text
+
+
+def test_deployed_items_updated_with_deltas(temp_workspace_dir, patched_fabric_workspace, valid_workspace_id):
+    """Test that created and deleted items update the deployed items without listing the workspace again."""
+    from concurrent.futures import Future
+
+    for item_name, item_type in (("Test Notebook", "Notebook"), ("Test Eventhouse", "Eventhouse")):
+        item_dir = temp_workspace_dir / f"{item_name}.{item_type}"
+        item_dir.mkdir(parents=True, exist_ok=True)
+        with (item_dir / ".platform").open("w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "metadata": {"type": item_type, "displayName": item_name},
+                    "config": {"logicalId": f"logical-id-{item_type}"},
+                },
+                f,
+            )
+        with (item_dir / "content.txt").open("w", encoding="utf-8") as f:
+            f.write("content")
+
+    workspace = patched_fabric_workspace(
+        workspace_id=valid_workspace_id,
+        repository_directory=str(temp_workspace_dir),
+        item_type_in_scope=["Notebook", "Eventhouse"],
+    )
+    workspace.endpoint.invoke.return_value = {"body": {"value": []}, "header": {}}
+    workspace._refresh_deployed_items_if_stale()
+    assert workspace.endpoint.invoke.call_count == 1
+
+    created = Future()
+    created.set_result({"body": {"id": "notebook-guid"}})
+    workspace.endpoint.invoke_async.return_value = created
+    workspace._publish_item(item_name="Test Notebook", item_type="Notebook")
+
+    assert workspace.deployed_items["Notebook"]["Test Notebook"].guid == "notebook-guid"
+    assert workspace.workspace_items["Notebook"]["Test Notebook"]["id"] == "notebook-guid"
+    assert workspace._convert_id_to_name("Notebook", "notebook-guid", "Deployed") == "Test Notebook"
+    workspace._refresh_deployed_items_if_stale()
+    assert workspace.endpoint.invoke.call_count == 1
+
+    # Fabric creates a KQL Database with the Eventhouse, so the deployed items are listed again when needed
+    created = Future()
+    created.set_result({"body": {"id": "eventhouse-guid"}})
+    workspace.endpoint.invoke_async.return_value = created
+    workspace._publish_item(item_name="Test Eventhouse", item_type="Eventhouse")
+    workspace.endpoint.invoke.return_value = {
+        "body": {
+            "value": [
+                {"type": "Notebook", "displayName": "Test Notebook", "description": "", "id": "notebook-guid"},
+                {"type": "Eventhouse", "displayName": "Test Eventhouse", "description": "", "id": "eventhouse-guid"},
+                {"type": "KQLDatabase", "displayName": "Test Eventhouse", "description": "", "id": "database-guid"},
+            ]
+        },
+        "header": {},
+    }
+    workspace._refresh_deployed_items_if_stale()
+    assert workspace.endpoint.invoke.call_count == 2
+    assert workspace.deployed_items["KQLDatabase"]["Test Eventhouse"].guid == "database-guid"
+
+    workspace._unpublish_item(item_name="Test Notebook", item_type="Notebook")
+    assert "Test Notebook" not in workspace.deployed_items["Notebook"]
+    assert workspace._convert_id_to_name("Notebook", "notebook-guid", "Deployed") is None
+    assert "Test Notebook" not in workspace.workspace_items["Notebook"]
+    workspace._refresh_deployed_items_if_stale()
+    assert workspace.endpoint.invoke.call_count == 3
+
+
+def test_sql_endpoints_resolved_lazily(temp_workspace_dir, patched_fabric_workspace, valid_workspace_id):
+    """Test that Lakehouse SQL endpoints are resolved on first use, retrying the ones not provisioned yet."""
+    from fabric_cicd._parameter._utils import extract_replace_value
+
+    workspace = patched_fabric_workspace(
+        workspace_id=valid_workspace_id,
+        repository_directory=str(temp_workspace_dir),
+        item_type_in_scope=["Notebook"],
+    )
+
+    provisioned = 2
+
+    def invoke(method, url, **_kwargs):  # noqa: ARG001
+        if url.endswith("/items"):
+            items = [
+                {"type": "Lakehouse", "displayName": f"Lakehouse {i}", "description": "", "id": f"lakehouse-guid-{i}"}
+                for i in range(3)
+            ]
+            return {"body": {"value": items}, "header": {}}
+        if url.endswith("/lakehouses"):
+            # A SQL endpoint not provisioned yet has no connection string
+            lakehouses = [
+                {
+                    "id": f"lakehouse-guid-{i}",
+                    "properties": {
+                        "sqlEndpointProperties": {"connectionString": f"sql-{i}"} if i < provisioned else {}
+                    },
+                }
+                for i in range(3)
+            ]
+            return {"body": {"value": lakehouses}, "header": {}}
+        msg = f"Unexpected call to {url}"
+        raise AssertionError(msg)
+
+    workspace.endpoint.invoke.side_effect = invoke
+    workspace._refresh_deployed_items_if_stale()
+    assert workspace.endpoint.invoke.call_count == 1
+
+    assert extract_replace_value(workspace, "$items.Lakehouse.Lakehouse 0.id") == "lakehouse-guid-0"
+    lakehouse_calls = [call for call in workspace.endpoint.invoke.call_args_list if "lakehouses" in call.kwargs["url"]]
+    assert not lakehouse_calls
+
+    workspace._resolve_sql_endpoints()
+    assert workspace.workspace_items["Lakehouse"]["Lakehouse 0"]["sqlendpoint"] == "sql-0"
+    assert workspace.workspace_items["Lakehouse"]["Lakehouse 1"]["sqlendpoint"] == "sql-1"
+    assert workspace.workspace_items["Lakehouse"]["Lakehouse 2"]["sqlendpoint"] is None
+    lakehouse_calls = [call for call in workspace.endpoint.invoke.call_args_list if "lakehouses" in call.kwargs["url"]]
+    assert len(lakehouse_calls) == 1
+
+    assert extract_replace_value(workspace, "$items.Lakehouse.Lakehouse 1.sqlendpoint") == "sql-1"
+
+    # The SQL endpoint not provisioned yet is retried on its next use
+    provisioned = 3
+    assert extract_replace_value(workspace, "$items.Lakehouse.Lakehouse 2.sqlendpoint") == "sql-2"
+    workspace._resolve_sql_endpoints()
+    lakehouse_calls = [call for call in workspace.endpoint.invoke.call_args_list if "lakehouses" in call.kwargs["url"]]
+    assert len(lakehouse_calls) == 2
+
+
+def test_item_attributes_resolved_once(temp_workspace_dir, patched_fabric_workspace, valid_workspace_id, caplog):
+    """Test that $items variables are resolved from a cache until the item they reference is created again."""
+    import logging
+
+    from fabric_cicd._common._item import Item
+    from fabric_cicd._parameter._utils import extract_replace_value
+
+    workspace = patched_fabric_workspace(
+        workspace_id=valid_workspace_id,
+        repository_directory=str(temp_workspace_dir),
+        item_type_in_scope=["Notebook"],
+    )
+    workspace.endpoint.invoke.return_value = {
+        "body": {"value": [{"type": "Notebook", "displayName": "Notebook", "description": "", "id": "old-guid"}]},
+        "header": {},
+    }
+
+    with caplog.at_level(logging.DEBUG, logger="fabric_cicd._parameter._utils"):
+        for _ in range(3):
+            assert extract_replace_value(workspace, "$items.Notebook.Notebook.id") == "old-guid"
+    assert workspace.endpoint.invoke.call_count == 1
+    assert caplog.text.count("$items cache miss") == 1
+    assert caplog.text.count("$items cache hit") == 2
+
+    # An item created during the run replaces the cached value
+    workspace._record_deployed_item(Item(type="Notebook", name="Notebook", description="", guid="new-guid"))
+    assert extract_replace_value(workspace, "$items.Notebook.Notebook.id") == "new-guid"
+    assert workspace.endpoint.invoke.call_count == 1
+
+
+def test_replace_ids_single_pass(temp_workspace_dir, patched_fabric_workspace, valid_workspace_id):
+    """Test that logical and workspace IDs are replaced in one pass with the same result as sequential replacement."""
+    from fabric_cicd._common._exceptions import ParsingError
+
+    logical_ids = {
+        "Lakehouse A": ("aaaaaaaa-0000-0000-0000-000000000001", "11111111-2222-3333-4444-555555555555"),
+        "Notebook B": ("test-logical-id-b", "66666666-7777-8888-9999-000000000000"),
+        "Notebook B2": ("test-logical-id-b2", "99999999-7777-8888-9999-000000000000"),
+        "Notebook C": ("test-logical-id-c", ""),
+    }
+    for item_name, (logical_id, _) in logical_ids.items():
+        item_dir = temp_workspace_dir / f"{item_name}.Notebook"
+        item_dir.mkdir(parents=True, exist_ok=True)
+        with (item_dir / ".platform").open("w", encoding="utf-8") as f:
+            json.dump(
+                {"metadata": {"type": "Notebook", "displayName": item_name}, "config": {"logicalId": logical_id}}, f
+            )
+
+    workspace = patched_fabric_workspace(
+        workspace_id=valid_workspace_id,
+        repository_directory=str(temp_workspace_dir),
+        item_type_in_scope=["Notebook"],
+    )
+    for item_name, (_, guid) in logical_ids.items():
+        workspace.repository_items["Notebook"][item_name].guid = guid
+
+    content = (
+        '{"lakehouse": "aaaaaaaa-0000-0000-0000-000000000001", "notebooks": ["test-logical-id-b", "test-logical-id-b2"], '
+        '"workspaceId": "00000000-0000-0000-0000-000000000000", "workspace": "aaaaaaaa-0000-0000-0000-000000000001", '
+        '"other": "bbbbbbbb-0000-0000-0000-000000000002"}'
+    )
+    expected = (
+        '{"lakehouse": "11111111-2222-3333-4444-555555555555", '
+        '"notebooks": ["66666666-7777-8888-9999-000000000000", "99999999-7777-8888-9999-000000000000"], '
+        f'"workspaceId": "{valid_workspace_id}", "workspace": "11111111-2222-3333-4444-555555555555", '
+        '"other": "bbbbbbbb-0000-0000-0000-000000000002"}'
+    )
+
+    assert workspace._replace_ids(content) == expected
+    assert workspace._replace_workspace_ids(workspace._replace_logical_ids(content)) == expected
+
+    with pytest.raises(ParsingError, match="Cannot replace logical ID 'test-logical-id-c'"):
+        workspace._replace_ids('{"notebook": "test-logical-id-c"}')
+
+
+def test_publish_item_file_transforms(temp_workspace_dir, patched_fabric_workspace, valid_workspace_id):
+    """Test that the file transform stages run in order on text and parsed JSON, and are timed."""
+    import base64
+    from concurrent.futures import Future
+
+    from fabric_cicd import constants
+
+    item_dir = temp_workspace_dir / "Pipeline.DataPipeline"
+    item_dir.mkdir(parents=True, exist_ok=True)
+    with (item_dir / ".platform").open("w", encoding="utf-8") as f:
+        json.dump({"metadata": {"type": "DataPipeline", "displayName": "Pipeline"}, "config": {"logicalId": "id"}}, f)
+    with (item_dir / "pipeline-content.json").open("w", encoding="utf-8") as f:
+        json.dump({"server": "dev-server", "database": "dev-db", "workspaceId": constants.DEFAULT_WORKSPACE_ID}, f)
+
+    workspace = patched_fabric_workspace(
+        workspace_id=valid_workspace_id,
+        repository_directory=str(temp_workspace_dir),
+        item_type_in_scope=["DataPipeline"],
+    )
+    workspace.environment = "PPE"
+    workspace.environment_parameter = {
+        "key_value_replace": [{"find_key": "$.server", "replace_value": {"PPE": "ppe-server"}}],
+        "find_replace": [{"find_value": "dev-db", "replace_value": {"PPE": "ppe-db"}}],
+    }
+
+    def func_process_file(workspace_obj, item_obj, file_obj):  # noqa: ARG001
+        data = file_obj.json_contents
+        data["processed"] = True
+        file_obj.set_json_contents(data, indent=2)
+
+    created = Future()
+    created.set_result({"body": {"id": "pipeline-guid"}})
+    workspace.endpoint.invoke_async.return_value = created
+    workspace._publish_item(item_name="Pipeline", item_type="DataPipeline", func_process_file=func_process_file)
+
+    body = json.loads(b"".join(workspace.endpoint.invoke_async.call_args.kwargs["body"]))
+    part = next(part for part in body["definition"]["parts"] if part["path"] == "pipeline-content.json")
+    assert json.loads(base64.b64decode(part["payload"])) == {
+        "server": "ppe-server",
+        "database": "ppe-db",
+        "workspaceId": valid_workspace_id,
+        "processed": True,
+    }
+
+    stats = workspace.transform_timings.stats
+    assert list(stats) == [
+        "func_process_file",
+        "replace_logical_ids",
+        "key_value_replace",
+        "find_replace",
+        "replace_workspace_ids",
+    ]
+    assert all(stage["files"] == 1 for stage in stats.values())
+
+
+def test_file_transforms_parse_and_serialize_once(
+    temp_workspace_dir, patched_fabric_workspace, valid_workspace_id, mocker
+):
+    """Test that a JSON file is parsed once and serialized once by the text and JSON transform stages."""
+    from fabric_cicd import constants
+    from fabric_cicd._common._file import File
+    from fabric_cicd._common._file_transforms import TransformTimings, run_file_transforms
+
+    notebook_logical_id = "11111111-2222-3333-4444-555555555555"
+    notebook_dir = temp_workspace_dir / "Notebook.Notebook"
+    notebook_dir.mkdir(parents=True, exist_ok=True)
+    with (notebook_dir / ".platform").open("w", encoding="utf-8") as f:
+        json.dump(
+            {"metadata": {"type": "Notebook", "displayName": "Notebook"}, "config": {"logicalId": notebook_logical_id}},
+            f,
+        )
+    item_dir = temp_workspace_dir / "Pipeline.DataPipeline"
+    item_dir.mkdir(parents=True, exist_ok=True)
+    with (item_dir / ".platform").open("w", encoding="utf-8") as f:
+        json.dump({"metadata": {"type": "DataPipeline", "displayName": "Pipeline"}, "config": {"logicalId": "id"}}, f)
+    content = {
+        "server": "dev-server",
+        "database": "dev-db",
+        "notebookId": notebook_logical_id,
+        "workspaceId": constants.DEFAULT_WORKSPACE_ID,
+    }
+    with (item_dir / "pipeline-content.json").open("w", encoding="utf-8") as f:
+        json.dump(content, f)
+
+    workspace = patched_fabric_workspace(
+        workspace_id=valid_workspace_id,
+        repository_directory=str(temp_workspace_dir),
+        item_type_in_scope=["DataPipeline", "Notebook"],
+    )
+    workspace.repository_items["Notebook"]["Notebook"].guid = "notebook-guid"
+    workspace.environment = "PPE"
+    workspace.environment_parameter = {
+        "key_value_replace": [{"find_key": "$.server", "replace_value": {"PPE": "ppe-server"}}],
+        "find_replace": [{"find_value": "dev-db", "replace_value": {"PPE": "ppe-db"}}],
+    }
+
+    def func_process_file(workspace_obj, item_obj, file_obj):  # noqa: ARG001
+        data = file_obj.json_contents
+        data["processed"] = True
+        file_obj.set_json_contents(data, indent=2)
+
+    item = workspace.repository_items["DataPipeline"]["Pipeline"]
+    expected = {
+        "server": "ppe-server",
+        "database": "ppe-db",
+        "notebookId": "notebook-guid",
+        "workspaceId": valid_workspace_id,
+    }
+    for process_file, expected_contents in ((None, expected), (func_process_file, {**expected, "processed": True})):
+        file_obj = File(item.path, item_dir / "pipeline-content.json")
+        transforms = workspace._get_file_transforms(item, process_file)
+        loads = mocker.spy(json, "loads")
+        dumps = mocker.spy(json, "dumps")
+
+        run_file_transforms(file_obj, transforms, TransformTimings())
+        contents = file_obj.contents
+        assert loads.call_count == 1
+        assert dumps.call_count == 1
+        assert json.loads(contents) == expected_contents
+        mocker.stop(loads)
+        mocker.stop(dumps)
+
+
+def test_refresh_repository_items_deterministic_order(temp_workspace_dir, patched_fabric_workspace, valid_workspace_id):
+    """Test that items scanned concurrently are merged in the repository walk order."""
+    item_names = [f"Notebook {index:02d}" for index in range(20)]
+    for index, item_name in enumerate(item_names):
+        item_dir = temp_workspace_dir / f"folder{index % 3}" / f"{item_name}.Notebook"
+        item_dir.mkdir(parents=True, exist_ok=True)
+        with (item_dir / ".platform").open("w", encoding="utf-8") as f:
+            json.dump(
+                {"metadata": {"type": "Notebook", "displayName": item_name}, "config": {"logicalId": f"id-{index}"}}, f
+            )
+        (item_dir / "notebook-content.py").write_text("print('Hello World')", encoding="utf-8")
+
+    workspace = patched_fabric_workspace(
+        workspace_id=valid_workspace_id,
+        repository_directory=str(temp_workspace_dir),
+        item_type_in_scope=["Notebook"],
+    )
+
+    walk_order = [
+        Path(root).name.removesuffix(".Notebook")
+        for root, _, files in os.walk(temp_workspace_dir)
+        if ".platform" in files
+    ]
+    assert list(workspace.repository_items["Notebook"]) == walk_order
+    assert all(len(item.item_files) == 2 for item in workspace.repository_items["Notebook"].values())
+
+
+def test_repository_scan_index_reuses_unchanged_files(
+    temp_workspace_dir, patched_fabric_workspace, valid_workspace_id, monkeypatch
+):
+    """Test that the scan index only reopens the .platform files and file types that changed since the last scan."""
+    from fabric_cicd import constants
+    from fabric_cicd._common import _file
+
+    monkeypatch.setattr(constants, "FEATURE_FLAG", {"enable_repository_scan_index"})
+
+    for item_name in ["Notebook A", "Notebook B"]:
+        item_dir = temp_workspace_dir / f"{item_name}.Notebook"
+        item_dir.mkdir(parents=True, exist_ok=True)
+        with (item_dir / ".platform").open("w", encoding="utf-8") as f:
+            json.dump(
+                {"metadata": {"type": "Notebook", "displayName": item_name}, "config": {"logicalId": item_name}}, f
+            )
+        (item_dir / "notebook-content.py").write_text("print('Hello World')", encoding="utf-8")
+
+    workspace = patched_fabric_workspace(
+        workspace_id=valid_workspace_id,
+        repository_directory=str(temp_workspace_dir),
+        item_type_in_scope=["Notebook"],
+    )
+    for item in workspace.repository_items["Notebook"].values():
+        assert all(file.type == "text" for file in item.item_files)
+    workspace._save_scan_index()
+    assert (temp_workspace_dir / constants.REPOSITORY_SCAN_INDEX_PATH).is_file()
+
+    # Change one item, then scan again with a new workspace object as a following run would
+    changed_dir = temp_workspace_dir / "Notebook B.Notebook"
+    with (changed_dir / ".platform").open("w", encoding="utf-8") as f:
+        json.dump({"metadata": {"type": "Notebook", "displayName": "Notebook C"}, "config": {"logicalId": "C"}}, f)
+    check_file_type = MagicMock(return_value="text")
+    monkeypatch.setattr(_file, "check_file_type", check_file_type)
+
+    workspace = patched_fabric_workspace(
+        workspace_id=valid_workspace_id,
+        repository_directory=str(temp_workspace_dir),
+        item_type_in_scope=["Notebook"],
+    )
+    types = {
+        file.file_path: file.type for item in workspace.repository_items["Notebook"].values() for file in item.item_files
+    }
+
+    assert set(workspace.repository_items["Notebook"]) == {"Notebook A", "Notebook C"}
+    assert set(types.values()) == {"text"}
+    check_file_type.assert_called_once_with(changed_dir / ".platform")
+
+
+def test_plan_and_apply_deployment(temp_workspace_dir, mock_endpoint, valid_workspace_id):
+    """Test that a deployment plan is recorded without writes and applied without scanning or listing again."""
+    from concurrent.futures import Future
+
+    from fabric_cicd import apply_plan, plan_all_items
+    from fabric_cicd._common._exceptions import InputError
+
+    for item_name, item_type, file_name in (
+        ("Existing", "Notebook", "notebook-content.py"),
+        ("New", "VariableLibrary", "variables.json"),
+        ("Stable", "Notebook", "notebook-content.py"),
+    ):
+        item_dir = temp_workspace_dir / "Notebooks" / f"{item_name}.{item_type}"
+        item_dir.mkdir(parents=True, exist_ok=True)
+        with (item_dir / ".platform").open("w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "metadata": {"type": item_type, "displayName": item_name},
+                    "config": {"logicalId": f"{item_name}-logical-id"},
+                },
+                f,
+            )
+        (item_dir / file_name).write_text(f"print('{item_name}')", encoding="utf-8")
+    # A Notebook referencing the Variable Library the plan creates
+    existing_content = temp_workspace_dir / "Notebooks" / "Existing.Notebook" / "notebook-content.py"
+    existing_content.write_text("print('New-logical-id')", encoding="utf-8")
+
+    deployed_items = [
+        {"type": "Notebook", "displayName": "Existing", "description": "", "id": "existing-guid"},
+        {"type": "Notebook", "displayName": "Stable", "description": "", "id": "stable-guid"},
+        {"type": "Notebook", "displayName": "Orphan", "description": "", "id": "orphan-guid"},
+    ]
+
+    deployed_folders = []
+
+    def invoke(method, url, **_kwargs):
+        if method == "GET" and url.endswith("/items"):
+            return {"body": {"value": deployed_items}, "header": {}}
+        if method == "GET" and url.endswith("/folders"):
+            return {"body": {"value": deployed_folders}, "header": {}}
+        if method == "POST" and url.endswith("/folders"):
+            deployed_folders.append({"id": "notebooks-folder-id", "displayName": "Notebooks"})
+            return {"body": {"id": "notebooks-folder-id"}, "header": {}}
+        return {"body": {}, "header": {}}
+
+    mock_endpoint.invoke.side_effect = invoke
+    created = Future()
+    created.set_result({"body": {"id": "new-guid"}})
+    mock_endpoint.invoke_async.return_value = created
+
+    with patch("fabric_cicd.fabric_workspace.FabricEndpoint", return_value=mock_endpoint):
+        workspace = FabricWorkspace(
+            workspace_id=valid_workspace_id,
+            repository_directory=str(temp_workspace_dir),
+            item_type_in_scope=["Notebook", "VariableLibrary"],
+        )
+        plan_path = temp_workspace_dir / "plan" / "deployment_plan.json"
+        plan_all_items(workspace, str(plan_path), unpublish_orphan_items=True)
+
+    assert {call.kwargs["method"] for call in mock_endpoint.invoke.call_args_list} == {"GET"}
+    mock_endpoint.invoke_async.assert_not_called()
+
+    plan = json.loads(plan_path.read_text(encoding="utf-8"))
+    assert plan["folders"] == {"/Notebooks": ""}
+    assert plan["items"]["Notebook"]["Existing"]["action"] == "update"
+    assert plan["items"]["Notebook"]["Existing"]["move"] is True
+    assert plan["items"]["VariableLibrary"]["New"]["action"] == "create"
+    # Only the definitions that do not depend on the items the plan creates are checked when the plan is applied
+    assert plan["items"]["Notebook"]["Existing"]["hash"] is None
+    assert plan["items"]["VariableLibrary"]["New"]["hash"] is None
+    assert plan["items"]["Notebook"]["Stable"]["hash"]
+    assert sorted(plan["items"]["VariableLibrary"]["New"]["files"]) == [".platform", "variables.json"]
+    assert plan["deletes"] == {"Notebook": ["Orphan"]}
+
+    # The release stage only writes, the repository is not scanned and the items are not listed again
+    mock_endpoint.invoke.reset_mock()
+    endpoint_patch = patch("fabric_cicd.fabric_workspace.FabricEndpoint", return_value=mock_endpoint)
+    walk_patch = patch.object(FabricWorkspace, "_walk_repository", side_effect=AssertionError("repository scanned"))
+    with endpoint_patch, walk_patch:
+        workspace = FabricWorkspace(
+            workspace_id=valid_workspace_id,
+            repository_directory=str(temp_workspace_dir),
+            item_type_in_scope=["Notebook", "VariableLibrary"],
+        )
+        apply_plan(workspace, str(plan_path))
+
+    calls = [(call.kwargs["method"], call.kwargs["url"].split("/")[-1]) for call in mock_endpoint.invoke.call_args_list]
+    assert ("GET", "items") not in calls
+    assert calls[:1] == [("POST", "folders")]
+    assert ("POST", "move") in calls
+    assert ("DELETE", "orphan-guid") in calls
+
+    async_calls = {call.kwargs["url"].split("/")[-1]: call.kwargs for call in mock_endpoint.invoke_async.call_args_list}
+    create_body = json.loads(b"".join(async_calls["items"]["body"]))
+    assert create_body["displayName"] == "New"
+    assert create_body["folderId"] == "notebooks-folder-id"
+    assert "updateDefinition?updateMetadata=True" in async_calls
+    existing_update = next(
+        call.kwargs["body"]
+        for call in mock_endpoint.invoke_async.call_args_list
+        if "existing-guid" in call.kwargs["url"]
+    )
+    existing_part = next(part for part in existing_update.parts if part.relative_path == "notebook-content.py")
+    assert existing_part.contents == "print('new-guid')"
+
+    # A definition changed since the plan was recorded is not deployed
+    (temp_workspace_dir / "Notebooks" / "Stable.Notebook" / "notebook-content.py").write_text(
+        "print('Changed')", encoding="utf-8"
+    )
+    with endpoint_patch, walk_patch:
+        workspace = FabricWorkspace(
+            workspace_id=valid_workspace_id,
+            repository_directory=str(temp_workspace_dir),
+            item_type_in_scope=["Notebook", "VariableLibrary"],
+        )
+        with pytest.raises(InputError, match="Notebook 'Stable' changed since the deployment plan was recorded"):
+            apply_plan(workspace, str(plan_path))
+
+
+def test_publish_all_items_to_workspaces(temp_workspace_dir, mock_endpoint, mocker):
+    """Test that a repository is scanned once and published to every target with its own replacements."""
+    import base64
+    from concurrent.futures import Future
+
+    from azure.identity import DefaultAzureCredential
+
+    from fabric_cicd import publish_all_items_to_workspaces
+    from fabric_cicd._common._exceptions import InputError
+
+    item_dir = temp_workspace_dir / "Hello.Notebook"
+    item_dir.mkdir(parents=True, exist_ok=True)
+    with (item_dir / ".platform").open("w", encoding="utf-8") as f:
+        json.dump({"metadata": {"type": "Notebook", "displayName": "Hello"}, "config": {"logicalId": "hello-id"}}, f)
+    (item_dir / "notebook-content.py").write_text("print('dev-server')", encoding="utf-8")
+    (temp_workspace_dir / "parameter.yml").write_text(
+        "find_replace:\n"
+        '  - find_value: "dev-server"\n'
+        "    replace_value:\n"
+        '      TENANT_A: "tenant-a-server"\n'
+        '      TENANT_B: "tenant-b-server"\n',
+        encoding="utf-8",
+    )
+
+    created = Future()
+    created.set_result({"body": {"id": "hello-guid"}})
+    mock_endpoint.invoke.return_value = {"body": {"value": []}, "header": {}}
+    mock_endpoint.invoke_async.return_value = created
+    mocker.patch("fabric_cicd.publish.FabricEndpoint", return_value=mock_endpoint)
+    scan_spy = mocker.spy(FabricWorkspace, "_scan_item_directory")
+    workspace_a = "11111111-1111-1111-1111-111111111111"
+    workspace_b = "22222222-2222-2222-2222-222222222222"
+
+    results = publish_all_items_to_workspaces(
+        targets=[
+            {"workspace_id": workspace_a, "environment": "TENANT_A"},
+            {"workspace_id": workspace_b, "environment": "TENANT_B"},
+        ],
+        repository_directory=str(temp_workspace_dir),
+        item_type_in_scope=["Notebook"],
+        token_credential=mocker.Mock(spec=DefaultAzureCredential),
+        max_concurrent_workspaces=2,
+    )
+
+    assert [(result["workspace_id"], result["status"], result["items"], result["unchanged"]) for result in results] == [
+        (workspace_a, "Succeeded", 1, 0),
+        (workspace_b, "Succeeded", 1, 0),
+    ]
+    assert scan_spy.call_count == 1
+
+    payloads = {}
+    for call in mock_endpoint.invoke_async.call_args_list:
+        body = json.loads(b"".join(call.kwargs["body"]))
+        part = next(part for part in body["definition"]["parts"] if part["path"] == "notebook-content.py")
+        payloads[call.kwargs["url"].split("/")[-2]] = base64.b64decode(part["payload"]).decode("utf-8")
+    assert payloads == {workspace_a: "print('tenant-a-server')", workspace_b: "print('tenant-b-server')"}
+
+    # A failed target does not stop the others, its failure is raised once all targets have finished
+    mock_endpoint.invoke_async.reset_mock()
+    with pytest.raises(InputError, match="could not be resolved"):
+        publish_all_items_to_workspaces(
+            targets=[{"workspace_name": "missing"}, {"workspace_id": workspace_b, "environment": "TENANT_B"}],
+            repository_directory=str(temp_workspace_dir),
+            item_type_in_scope=["Notebook"],
+            token_credential=mocker.Mock(spec=DefaultAzureCredential),
+        )
+    assert mock_endpoint.invoke_async.call_count == 1
+
+
+def test_publish_environments_concurrently(temp_workspace_dir, patched_fabric_workspace, valid_workspace_id, mocker):
+    """Test that environments are staged concurrently, published together and tracked by a single poller."""
+    from fabric_cicd._common._exceptions import FailedPublishedItemStatusError
+    from fabric_cicd._items._environment import check_environment_publish_state, publish_environments
+
+    for name in ["Env A", "Env B"]:
+        item_dir = temp_workspace_dir / f"{name}.Environment"
+        (item_dir / "Setting").mkdir(parents=True, exist_ok=True)
+        with (item_dir / ".platform").open("w", encoding="utf-8") as f:
+            json.dump({"metadata": {"type": "Environment", "displayName": name}, "config": {"logicalId": name}}, f)
+        (item_dir / "Setting" / "Sparkcompute.yml").write_text("driver_cores: 4\n", encoding="utf-8")
+
+    workspace = patched_fabric_workspace(
+        workspace_id=valid_workspace_id,
+        repository_directory=str(temp_workspace_dir),
+        item_type_in_scope=["Environment"],
+    )
+    workspace._refresh_repository_items()
+    for name, item in workspace.repository_items["Environment"].items():
+        item.guid = f"{name}-guid"
+    workspace.max_workers = 2
+    mocker.patch.object(workspace, "_publish_item")
+    mocker.patch("fabric_cicd._items._environment.handle_retry")
+
+    listings = iter([
+        # Initial check, nothing running
+        [{"displayName": "Env A", "properties": {"publishDetails": {"state": "Success"}}}],
+        # Env A still building, Env B built and an unrelated environment failed
+        [
+            {"displayName": "Env A", "properties": {"publishDetails": {"state": "Running"}}},
+            {"displayName": "Env B", "properties": {"publishDetails": {"state": "Success"}}},
+            {"displayName": "Other", "properties": {"publishDetails": {"state": "Failed"}}},
+        ],
+        [{"displayName": "Env A", "properties": {"publishDetails": {"state": "Failed"}}}],
+    ])
+    calls = []
+
+    def invoke(method, url, **_kwargs):
+        calls.append((method, url.rsplit("/environments/", 1)[-1]))
+        if method == "GET" and url.endswith("/environments/"):
+            return {"body": {"value": next(listings)}, "header": {}}
+        return {"body": {"errorCode": "EnvironmentLibrariesNotFound"}, "header": {}}
+
+    workspace.endpoint.invoke.side_effect = invoke
+    publish_environments(workspace)
+
+    publish_calls = [position for position, call in enumerate(calls) if call[1].endswith("staging/publish")]
+    staging_calls = [position for position, call in enumerate(calls) if call[0] == "PATCH"]
+    assert len(publish_calls) == 2
+    assert len(staging_calls) == 2
+    assert max(staging_calls) < min(publish_calls)
+    assert sorted(workspace.environment_publishes) == ["Env A", "Env B"]
+
+    with pytest.raises(FailedPublishedItemStatusError, match="Publish failed for Env A") as error:
+        check_environment_publish_state(workspace, item_names=workspace.environment_publishes)
+    assert "Other" not in str(error.value)
+    assert [call for call in calls if call == ("GET", "")] == [("GET", "")] * 3
+
+
+class MockEnvironmentApi:
+    """Mock of the environment staging and publish APIs for a single environment."""
+
+    def __init__(self):
+        self.staged = {"compute": {}, "libraries": {}}
+        self.published = {"compute": {}, "libraries": {}}
+        self.calls = []
+
+    def invoke(self, method, url, body=None, files=None, **_kwargs):
+        path = url.split("/environments/", 1)[-1]
+        self.calls.append((method, path.split("/", 1)[-1], files["file"][1].read() if files else body))
+        if path == "":
+            return {"body": {"value": [{"displayName": "Spark", "properties": {"publishDetails": {"state": "Success"}}}]}}
+        state = self.staged if "/staging/" in path else self.published
+        if method == "GET":
+            return {"body": state["compute" if path.endswith("sparkcompute") else "libraries"]}
+        if method == "PATCH":
+            self.staged["compute"] = body
+        return {"body": {}}
+
+    def changes(self):
+        """Return the calls that change the environment."""
+        return [call for call in self.calls if call[0] != "GET"]
+
+
+def create_environment(temp_workspace_dir, patched_fabric_workspace, valid_workspace_id, mocker, sparkcompute):
+    """Create an environment item named Spark and a workspace publishing it through MockEnvironmentApi."""
+    from fabric_cicd._common._deployment_manifest import DeploymentManifest
+
+    item_dir = temp_workspace_dir / "Spark.Environment"
+    (item_dir / "Setting").mkdir(parents=True, exist_ok=True)
+    (item_dir / "Libraries" / "CustomLibraries").mkdir(parents=True, exist_ok=True)
+    with (item_dir / ".platform").open("w", encoding="utf-8") as f:
+        json.dump({"metadata": {"type": "Environment", "displayName": "Spark"}, "config": {"logicalId": "spark"}}, f)
+    (item_dir / "Setting" / "Sparkcompute.yml").write_text(sparkcompute, encoding="utf-8")
+
+    workspace = patched_fabric_workspace(
+        workspace_id=valid_workspace_id,
+        repository_directory=str(temp_workspace_dir),
+        item_type_in_scope=["Environment"],
+    )
+    workspace._refresh_repository_items()
+    workspace.repository_items["Environment"]["Spark"].guid = "spark-guid"
+    workspace.deployment_manifest = DeploymentManifest(
+        temp_workspace_dir / "manifest.json", valid_workspace_id, workspace.environment
+    )
+    mocker.patch.object(workspace, "_publish_item")
+    environment_api = MockEnvironmentApi()
+    workspace.endpoint.invoke.side_effect = environment_api.invoke
+    return workspace, item_dir, environment_api
+
+
+def test_environment_libraries_hash_diffed(temp_workspace_dir, patched_fabric_workspace, valid_workspace_id, mocker):
+    """Test that only new or changed environment libraries are uploaded and unchanged environments are not published."""
+    from fabric_cicd._items._environment import check_environment_publish_state, publish_environments
+
+    workspace, item_dir, environment_api = create_environment(
+        temp_workspace_dir, patched_fabric_workspace, valid_workspace_id, mocker, "driver_cores: 4\n"
+    )
+    (item_dir / "Libraries" / "environment.yml").write_text("dependencies:\n  - pip\n", encoding="utf-8")
+    wheel_path = item_dir / "Libraries" / "CustomLibraries" / "lib.whl"
+    wheel_path.write_bytes(b"wheel v1")
+    staged_libraries = {"customLibraries": {"wheelFiles": ["lib.whl", "old.whl"]}}
+    environment_api.staged["libraries"] = staged_libraries
+    environment_api.published["libraries"] = staged_libraries
+
+    # Nothing recorded yet, so every library is uploaded and the environment published
+    publish_environments(workspace)
+    uploads = sorted(call[2] for call in environment_api.changes() if call[1] == "staging/libraries")
+    assert uploads == [b"dependencies:\n  - pip\n", b"wheel v1"]
+    assert ("DELETE", "staging/libraries?libraryToDelete=old.whl", {}) in environment_api.calls
+    assert list(workspace.environment_publishes) == ["Spark"]
+    check_environment_publish_state(workspace, item_names=workspace.environment_publishes)
+
+    # Everything staged and published with the recorded contents, nothing is uploaded or published
+    libraries = {"environmentYml": "dependencies:\n  - pip\n", "customLibraries": {"wheelFiles": ["lib.whl"]}}
+    environment_api.staged = {"compute": {"driverCores": 4}, "libraries": libraries}
+    environment_api.published = {"compute": {"driverCores": 4}, "libraries": libraries}
+    environment_api.calls.clear()
+    publish_environments(workspace)
+    assert environment_api.changes() == []
+    assert workspace.environment_publishes == {}
+
+    # A changed wheel is the only upload
+    wheel_path.write_bytes(b"wheel v2")
+    environment_api.calls.clear()
+    publish_environments(workspace)
+    assert environment_api.changes() == [
+        ("POST", "staging/libraries", b"wheel v2"),
+        ("POST", "staging/publish", None),
+    ]
+
+
+def test_environment_publish_skipped_when_published(
+    temp_workspace_dir, patched_fabric_workspace, valid_workspace_id, mocker
+):
+    """Test that compute settings matching the published environment are neither staged nor published again."""
+    import copy
+
+    from fabric_cicd._items._environment import publish_environments
+
+    sparkcompute = 'instance_pool_id: pool\ndriver_cores: 4\nspark_conf:\n  spark.foo: x\nruntime_version: "1.3"\n'
+    workspace, item_dir, environment_api = create_environment(
+        temp_workspace_dir, patched_fabric_workspace, valid_workspace_id, mocker, sparkcompute
+    )
+    workspace.environment_parameter = {
+        "spark_pool": [{"instance_pool_id": "pool", "replace_value": {"N/A": {"name": "Pool", "type": "Workspace"}}}]
+    }
+    # The API adds the id of the instance pool referenced by name
+    published_compute = {
+        "instancePool": {"name": "Pool", "type": "Workspace", "id": "pool-guid"},
+        "driverCores": 4,
+        "sparkProperties": {"spark.foo": "x"},
+        "runtimeVersion": "1.3",
+    }
+    environment_api.staged["compute"] = copy.deepcopy(published_compute)
+    environment_api.published["compute"] = copy.deepcopy(published_compute)
+
+    publish_environments(workspace)
+    assert environment_api.changes() == []
+    assert workspace.environment_publishes == {}
+
+    # Staged settings that differ are updated, the publish is still skipped as the published settings match
+    environment_api.staged["compute"] = {"driverCores": 8}
+    environment_api.calls.clear()
+    publish_environments(workspace)
+    expected_compute = {
+        "instancePool": {"name": "Pool", "type": "Workspace"},
+        "driverCores": 4,
+        "sparkProperties": {"spark.foo": "x"},
+        "runtimeVersion": "1.3",
+    }
+    assert environment_api.changes() == [("PATCH", "staging/sparkcompute", expected_compute)]
+    assert workspace.environment_publishes == {}
+
+    # A spark property removed from the repository is a change
+    sparkcompute = 'instance_pool_id: pool\ndriver_cores: 4\nspark_conf: {}\nruntime_version: "1.3"\n'
+    (item_dir / "Setting" / "Sparkcompute.yml").write_text(sparkcompute, encoding="utf-8")
+    environment_api.staged["compute"] = copy.deepcopy(published_compute)
+    environment_api.calls.clear()
+    publish_environments(workspace)
+    assert environment_api.changes() == [
+        ("PATCH", "staging/sparkcompute", {**expected_compute, "sparkProperties": {}}),
+        ("POST", "staging/publish", None),
+    ]
+
+    # Settings that differ from the published environment are published
+    (item_dir / "Setting" / "Sparkcompute.yml").write_text("driver_cores: 8\n", encoding="utf-8")
+    environment_api.calls.clear()
+    publish_environments(workspace)
+    assert environment_api.changes() == [
+        ("PATCH", "staging/sparkcompute", {"driverCores": 8}),
+        ("POST", "staging/publish", None),
+    ]
+
+
+def test_publish_lakehouses_single_sqlendpoint_watcher(
+    temp_workspace_dir, patched_fabric_workspace, valid_workspace_id, mocker
+):
+    """Test that all lakehouses are created before one watcher polls their SQL endpoints from the list call."""
+    from fabric_cicd._common._exceptions import FailedPublishedItemStatusError
+    from fabric_cicd._items._lakehouse import publish_lakehouses
+
+    for name in ["A", "B", "C"]:
+        item_dir = temp_workspace_dir / f"{name}.Lakehouse"
+        item_dir.mkdir(parents=True, exist_ok=True)
+        with (item_dir / ".platform").open("w", encoding="utf-8") as f:
+            json.dump({"metadata": {"type": "Lakehouse", "displayName": name}, "config": {"logicalId": name}}, f)
+
+    workspace = patched_fabric_workspace(
+        workspace_id=valid_workspace_id,
+        repository_directory=str(temp_workspace_dir),
+        item_type_in_scope=["Lakehouse"],
+    )
+    workspace._refresh_repository_items()
+    for name, item in workspace.repository_items["Lakehouse"].items():
+        item.guid = f"{name}-guid"
+    workspace.max_workers = 3
+    events = []
+    mocker.patch.object(workspace, "_publish_item", side_effect=lambda item_name, **_kwargs: events.append(item_name))
+    mocker.patch("fabric_cicd._items._lakehouse.handle_retry")
+
+    def lakehouse(guid, status):
+        return {"id": guid, "properties": {"sqlEndpointProperties": {"provisioningStatus": status}}}
+
+    listings = iter([
+        {"body": {"value": [lakehouse("A-guid", "Success")]}, "header": {"continuationUri": "page-2"}},
+        {"body": {"value": [lakehouse("B-guid", "InProgress")]}, "header": {}},
+        {"body": {"value": [lakehouse("B-guid", "Success"), lakehouse("C-guid", "Failed")]}, "header": {}},
+    ])
+
+    def invoke(method, url, **_kwargs):  # noqa: ARG001
+        events.append(url.rsplit("/", 1)[-1])
+        return next(listings)
+
+    workspace.endpoint.invoke.side_effect = invoke
+
+    with pytest.raises(FailedPublishedItemStatusError, match="Cannot resolve SQL endpoint for lakehouse C"):
+        publish_lakehouses(workspace)
+
+    assert sorted(events[:3]) == ["A", "B", "C"]
+    assert events[3:] == ["lakehouses", "page-2", "lakehouses"]
+
+
+def test_process_shortcuts_sends_only_changes(
+    temp_workspace_dir, patched_fabric_workspace, valid_workspace_id, monkeypatch
+):
+    """Test that only created, updated and deleted shortcuts are sent, and failures can be skipped."""
+    from fabric_cicd import constants
+    from fabric_cicd._common._exceptions import FailedPublishedItemStatusError
+    from fabric_cicd._items._lakehouse import process_shortcuts
+
+    def shortcut(name, item_id):
+        return {
+            "name": name,
+            "path": "/Tables",
+            "target": {"type": "OneLake", "oneLake": {"workspaceId": "ws", "itemId": item_id, "path": "Tables/x"}},
+        }
+
+    desired = {
+        "A": [shortcut("same", "1"), shortcut("changed", "2"), shortcut("trimmed", "6"), shortcut("new", "3")],
+        "B": [shortcut("failing", "4")],
+    }
+    # A field removed from the repository is a change
+    del desired["A"][2]["target"]["oneLake"]["path"]
+    for name, shortcuts in desired.items():
+        item_dir = temp_workspace_dir / f"{name}.Lakehouse"
+        item_dir.mkdir(parents=True, exist_ok=True)
+        with (item_dir / ".platform").open("w", encoding="utf-8") as f:
+            json.dump({"metadata": {"type": "Lakehouse", "displayName": name}, "config": {"logicalId": name}}, f)
+        (item_dir / "shortcuts.metadata.json").write_text(json.dumps(shortcuts), encoding="utf-8")
+
+    workspace = patched_fabric_workspace(
+        workspace_id=valid_workspace_id,
+        repository_directory=str(temp_workspace_dir),
+        item_type_in_scope=["Lakehouse"],
+    )
+    workspace._refresh_repository_items()
+    for name, item in workspace.repository_items["Lakehouse"].items():
+        item.guid = f"{name}-guid"
+    workspace.max_workers = 4
+
+    deployed_same = shortcut("same", "1")
+    deployed_same["target"]["oneLake"]["connectionId"] = None
+    deployed = {
+        "A-guid": [deployed_same, shortcut("changed", "old"), shortcut("trimmed", "6"), shortcut("extra", "5")],
+        "B-guid": [],
+    }
+    calls = []
+
+    def invoke(method, url, body=None, **_kwargs):
+        item_guid = url.split("/items/", 1)[1].split("/", 1)[0]
+        if method == "GET":
+            return {"body": {"value": deployed[item_guid]}, "header": {}}
+        calls.append((method, item_guid, body["name"] if method == "POST" else url.rsplit("/", 1)[-1]))
+        if body and body["name"] == "failing":
+            msg = "Source has no data"
+            raise ValueError(msg)
+        return {"body": {}, "header": {}}
+
+    workspace.endpoint.invoke.side_effect = invoke
+    items = list(workspace.repository_items["Lakehouse"].values())
+
+    monkeypatch.setattr(constants, "FEATURE_FLAG", {"continue_on_shortcut_failure"})
+    process_shortcuts(workspace, items)
+    assert sorted(calls) == [
+        ("DELETE", "A-guid", "extra"),
+        ("POST", "A-guid", "changed"),
+        ("POST", "A-guid", "new"),
+        ("POST", "A-guid", "trimmed"),
+        ("POST", "B-guid", "failing"),
+    ]
+
+    monkeypatch.setattr(constants, "FEATURE_FLAG", set())
+    with pytest.raises(FailedPublishedItemStatusError, match="Failed to publish 'failing' for lakehouse B"):
+        process_shortcuts(workspace, items)
@@ -717,3 +717,85 @@ def test_validate_invalid_parameters(
             result,
             constants.PARAMETER_MSGS[msg].format("is_regex", "string", "find_replace"),
         )
+
+
+def test_parameter_rule_index_matches_check_replacement(tmp_path):
+    """Test that the indexed rules of a file are the rules check_replacement accepts, in parameter file order."""
+    from fabric_cicd._parameter._rule_index import ParameterRuleIndex
+    from fabric_cicd._parameter._utils import check_replacement, process_input_path
+
+    notebook_path = tmp_path / "Hello World.Notebook" / "notebook-content.py"
+    pipeline_path = tmp_path / "Run.DataPipeline" / "pipeline-content.json"
+    rules = [
+        {"find_value": "a"},
+        {"find_value": "b", "item_type": "Notebook"},
+        {"find_value": "c", "item_name": ["Hello World", "Other"]},
+        {"find_value": "d", "file_path": "Hello World.Notebook/notebook-content.py"},
+        {"find_value": "e", "item_type": "DataPipeline", "item_name": "Hello World"},
+        {"find_value": "f", "item_type": ["Notebook", "DataPipeline"], "file_path": [str(pipeline_path)]},
+        {"find_value": "g", "item_type": "Notebook", "item_name": "Hello World"},
+    ]
+    index = ParameterRuleIndex(rules, tmp_path)
+
+    for item_type, item_name, file_path in (
+        ("Notebook", "Hello World", notebook_path),
+        ("DataPipeline", "Run", pipeline_path),
+        ("DataPipeline", "Hello World", pipeline_path),
+        ("Report", "Other", tmp_path / "Other.Report" / "report.json"),
+    ):
+        expected = [
+            rule
+            for rule in rules
+            if check_replacement(
+                rule.get("item_type"),
+                rule.get("item_name"),
+                process_input_path(tmp_path, rule.get("file_path")),
+                item_type,
+                item_name,
+                file_path,
+            )
+        ]
+        assert index.get_rules(item_type, item_name, file_path) == expected
+
+    assert [rule["find_value"] for rule in index.get_rules("Notebook", "Hello World", notebook_path)] == [
+        "a",
+        "b",
+        "c",
+        "d",
+        "g",
+    ]
+
+
+def test_replace_key_values_parses_once():
+    """Test that key_value_replace rules are applied to one parsed JSON with the same result as one at a time."""
+    import json
+    from unittest.mock import patch
+
+    from fabric_cicd._parameter import _utils
+    from fabric_cicd._parameter._utils import replace_key_value, replace_key_values
+
+    json_content = json.dumps({"server": "dev-server", "database": {"name": "dev-db"}, "tags": ["dev"]})
+    param_dicts = [
+        {"find_key": "$.server", "replace_value": {"PPE": "ppe-server"}},
+        {"find_key": "$.database.name", "replace_value": {"PPE": "ppe-db", "PROD": "prod-db"}},
+        {"find_key": "$.tags[0]", "replace_value": {"PROD": "prod"}},
+        {"find_key": "$.server", "replace_value": {"PPE": "ppe-server-2"}},
+    ]
+
+    expected = json_content
+    for param_dict in param_dicts:
+        expected = replace_key_value(param_dict, expected, "PPE")
+
+    _utils._parse_json_path.cache_clear()
+    loads_patch = patch.object(_utils.json, "loads", wraps=json.loads)
+    parse_patch = patch.object(_utils, "parse", wraps=_utils.parse)
+    with loads_patch as mock_loads, parse_patch as mock_parse:
+        assert replace_key_values(param_dicts, json_content, "PPE") == expected
+        assert replace_key_values(param_dicts, json_content, "PPE") == expected
+
+    assert mock_loads.call_count == 2
+    # $.server is used twice and $.tags[0] has no PPE value, so only two expressions are compiled, once
+    assert mock_parse.call_count == 2
+    # The compiled expressions are bounded, parameter files are not limited in their number of expressions
+    assert _utils._parse_json_path.cache_info().maxsize == _utils.constants.JSON_PATH_CACHE_SIZE
+    assert json.loads(expected) == {"server": "ppe-server-2", "database": {"name": "ppe-db"}, "tags": ["dev"]}
@@ -615,3 +615,59 @@ def test_large_number_of_folders_and_items(tmp_path, patched_fabric_workspace, v
         last_level_1_index = max(sorted_folders.index(f) for f in level_1_folders)
         first_level_2_index = min(sorted_folders.index(f) for f in level_2_folders)
         assert last_level_1_index < first_level_2_index, "Folder sorting is incorrect with large numbers"
+
+
+def test_repository_walked_once_for_folders_and_items(
+    repository_with_subfolders, patched_fabric_workspace, valid_workspace_id
+):
+    """Test that folders and items are refreshed from a single walk of the repository."""
+    import os
+    from pathlib import Path
+
+    create_platform_file(
+        repository_with_subfolders / "Folder3" / "Analytics.Eventhouse", item_type="Eventhouse", item_name="Analytics"
+    )
+    create_platform_file(
+        repository_with_subfolders / "Folder3" / "Analytics.Eventhouse" / ".children" / "Analytics.KQLDatabase",
+        item_type="KQLDatabase",
+        item_name="Analytics",
+    )
+
+    workspace = patched_fabric_workspace(
+        workspace_id=valid_workspace_id,
+        repository_directory=str(repository_with_subfolders),
+        item_type_in_scope=["Notebook", "DataPipeline", "Eventhouse", "KQLDatabase"],
+    )
+
+    item_os = patch("fabric_cicd._common._item.os")
+    with patch("fabric_cicd.fabric_workspace.os.walk", wraps=os.walk) as mock_walk, item_os as mock_item_os:
+        workspace._refresh_repository_folders()
+        workspace._refresh_repository_items()
+        # os.walk may recurse into itself, only count the walks started from the repository directory
+        walks = [call for call in mock_walk.call_args_list if call.args[0] == workspace.repository_directory]
+        assert len(walks) == 1
+        # The item files are collected from the same walk
+        mock_item_os.walk.assert_not_called()
+
+        # The shared walk is only used once, a later refresh sees the current repository
+        workspace._refresh_repository_items()
+        walks = [call for call in mock_walk.call_args_list if call.args[0] == workspace.repository_directory]
+        assert len(walks) == 2
+
+    assert workspace.repository_folders == {
+        "/Folder1": "",
+        "/Folder1/Subfolder1": "",
+        "/Folder2": "",
+        "/Folder2/Subfolder2": "",
+        "/Folder3": "",
+    }
+    assert workspace.repository_items["KQLDatabase"]["Analytics"].folder_id == ""
+    assert len(workspace.repository_items["Notebook"]) == 3
+
+    # Each item has the same files as a walk of its own directory, including those of nested items
+    for item in (
+        workspace.repository_items["Eventhouse"]["Analytics"],
+        workspace.repository_items["KQLDatabase"]["Analytics"],
+    ):
+        walked_files = [Path(root, file) for root, _dirs, files in os.walk(item.path) for file in files]
+        assert [file.file_path for file in item.item_files] == walked_files